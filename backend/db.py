@@ -4,6 +4,9 @@ from sqlalchemy.orm import sessionmaker, DeclarativeBase
 DB_URL = "sqlite:///./nexus.db"
 engine = create_engine(DB_URL, connect_args={"check_same_thread": False})
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Finance write routes return the rows they just committed; this factory keeps
+# their loaded state through the commit instead of reloading each one.
+FinanceSessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
 
 class Base(DeclarativeBase):
     pass
@@ -14,3 +17,10 @@ def get_db():
         yield db
     finally:
         db.close()
+
+def get_finance_db():
+    db = FinanceSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
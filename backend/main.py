@@ -12,6 +12,7 @@ from sqlalchemy.orm import Session
 from sqlalchemy import select, func, and_, case
 from .db import Base, engine, get_db
 from . import models, schemas, models_finance  # noqa: F401 - ensure models are registered
+from . import query_cache
 from .routes_funding import router as funding_router
 from .services import tags as tag_service
 from .routes_finance import router as finance_router
@@ -41,6 +42,7 @@ def quit_app(background_tasks: BackgroundTasks):
 # --- Create tables (dev) ---
 Base.metadata.create_all(bind=engine)
 ensure_views(engine)
+query_cache.register(engine)
 
 # --- Utility ---
 def get_or_404(db, model, obj_id: int):
@@ -128,7 +130,7 @@ def _prepare_journal_postings(db: Session, postings: List[schemas.JournalPosting
     rows = []
     total = Decimal('0')
     for posting in postings:
-        amount = Decimal(str(posting.amount))
+        amount = posting.amount
         if amount == 0:
             raise HTTPException(422, "posting amount cannot be zero")
         currency = (posting.currency or "USD").upper()
@@ -572,8 +574,8 @@ def journal_reallocate(payload: schemas.JournalReallocateIn, db: Session = Depen
     from_alloc = get_or_404(db, models.Allocation, payload.from_allocation_id)
     to_alloc = get_or_404(db, models.Allocation, payload.to_allocation_id)
     postings = [
-        schemas.JournalPostingIn(allocation_id=from_alloc.id, amount=float(-amount), currency="USD"),
-        schemas.JournalPostingIn(allocation_id=to_alloc.id, amount=float(amount), currency="USD"),
+        schemas.JournalPostingIn(allocation_id=from_alloc.id, amount=-amount, currency="USD"),
+        schemas.JournalPostingIn(allocation_id=to_alloc.id, amount=amount, currency="USD"),
     ]
     entry = _create_journal(
         db,
@@ -0,0 +1,66 @@
+"""Store transaction ids as 16-byte UUIDs
+
+Transaction ids used to be written as 36-char hyphenated text. The models now
+bind them as raw 16-byte BLOBs (``models_finance.UUIDBytes``), so every stored
+id and every column referencing one is rewritten in place. SQLite keeps the
+declared column types; BLOB values are stored as-is under any affinity.
+"""
+
+from __future__ import annotations
+
+import uuid
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261015_01"
+down_revision = "8346edc977fc"
+branch_labels = None
+depends_on = None
+
+
+# (table, column) pairs holding a transaction id; the primary key goes first.
+ID_COLUMNS = [
+    ("transactions", "id"),
+    ("transactions", "reverses_transaction_id"),
+    ("transactions", "reversed_by_transaction_id"),
+    ("payment_schedules", "paid_transaction_id"),
+    ("transaction_po_lines", "transaction_id"),
+    ("transaction_invoice_lines", "transaction_id"),
+    ("transaction_deliverables", "transaction_id"),
+]
+
+
+def _has_column(conn, table: str, column: str) -> bool:
+    rows = conn.exec_driver_sql(f"PRAGMA table_info({table})").fetchall()
+    return any(row[1] == column for row in rows)
+
+
+def rewrite_ids(conn, *, to_bytes: bool) -> None:
+    """Convert stored transaction ids between text and 16-byte form."""
+    source_type = "text" if to_bytes else "blob"
+    # Parent and child ids change in the same transaction, so any enforced
+    # foreign keys are only checked once every column agrees again.
+    conn.exec_driver_sql("PRAGMA defer_foreign_keys = ON")
+    for table, column in ID_COLUMNS:
+        if not _has_column(conn, table, column):
+            continue
+        values = conn.exec_driver_sql(
+            f"SELECT DISTINCT {column} FROM {table} WHERE typeof({column}) = '{source_type}'"
+        ).scalars().all()
+        if not values:
+            continue
+        if to_bytes:
+            mapping = [{"old": value, "new": uuid.UUID(value).bytes} for value in values]
+        else:
+            mapping = [{"old": value, "new": str(uuid.UUID(bytes=bytes(value)))} for value in values]
+        conn.execute(sa.text(f"UPDATE {table} SET {column} = :new WHERE {column} = :old"), mapping)
+
+
+def upgrade() -> None:
+    rewrite_ids(op.get_bind(), to_bytes=True)
+
+
+def downgrade() -> None:
+    rewrite_ids(op.get_bind(), to_bytes=False)
@@ -0,0 +1,72 @@
+"""Compute line amounts as stored generated columns
+
+``quote_lines``, ``po_lines`` and ``invoice_lines`` declare ``amount`` as
+``quantity * unit_cost`` / ``quantity * unit_price``. SQLite cannot add a
+STORED generated column in place, so each table is rebuilt; the rebuild fills
+``amount`` from the existing quantity and price. Views referencing the tables
+are dropped first (SQLite rejects the rename otherwise) and reapplied after.
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+from backend.sql.views import VIEW_DEFINITIONS, apply_views
+
+
+revision = "20261015_02"
+down_revision = "20261015_01"
+branch_labels = None
+depends_on = None
+
+
+LINE_TABLES = {
+    "quote_lines": "quantity * unit_cost",
+    "po_lines": "quantity * unit_price",
+    "invoice_lines": "quantity * unit_price",
+}
+
+
+def _has_table(table: str) -> bool:
+    return table in sa.inspect(op.get_bind()).get_table_names()
+
+
+def _amount_is_generated(table: str) -> bool:
+    # table_xinfo reports hidden = 3 for STORED generated columns.
+    rows = op.get_bind().exec_driver_sql(f"PRAGMA table_xinfo({table})").fetchall()
+    return any(row[1] == "amount" and row[6] == 3 for row in rows)
+
+
+def _drop_views() -> None:
+    for name in VIEW_DEFINITIONS:
+        op.execute(f"DROP VIEW IF EXISTS {name}")
+
+
+def _rebuild_amount(table: str, amount: sa.Column) -> None:
+    with op.batch_alter_table(table, recreate="always") as batch:
+        batch.drop_column("amount")
+        batch.add_column(amount)
+
+
+def upgrade() -> None:
+    pending = [t for t in LINE_TABLES if _has_table(t) and not _amount_is_generated(t)]
+    if not pending:
+        return
+    _drop_views()
+    for table in pending:
+        _rebuild_amount(
+            table, sa.Column("amount", sa.Numeric(18, 6), sa.Computed(LINE_TABLES[table], persisted=True))
+        )
+    apply_views(op.get_bind())
+
+
+def downgrade() -> None:
+    pending = [t for t in LINE_TABLES if _has_table(t) and _amount_is_generated(t)]
+    if not pending:
+        return
+    _drop_views()
+    for table in pending:
+        _rebuild_amount(table, sa.Column("amount", sa.Numeric(18, 6), nullable=True))
+        op.execute(f"UPDATE {table} SET amount = {LINE_TABLES[table]}")
+    apply_views(op.get_bind())
@@ -0,0 +1,85 @@
+"""One milestone per lot and checkpoint
+
+Adds ``uq_milestone_lot_checkpoint`` so template application can upsert
+milestones. Duplicate (lot, checkpoint) rows left by earlier reapplications
+are folded into the oldest one first; transaction links move with them.
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+from backend.sql.views import VIEW_DEFINITIONS, apply_views
+
+
+revision = "20261015_03"
+down_revision = "20261015_02"
+branch_labels = None
+depends_on = None
+
+
+CONSTRAINT = "uq_milestone_lot_checkpoint"
+
+
+def _has_table(table: str) -> bool:
+    return table in sa.inspect(op.get_bind()).get_table_names()
+
+
+def _has_constraint() -> bool:
+    constraints = sa.inspect(op.get_bind()).get_unique_constraints("milestone_instances")
+    return any(constraint["name"] == CONSTRAINT for constraint in constraints)
+
+
+def _drop_views() -> None:
+    for name in VIEW_DEFINITIONS:
+        op.execute(f"DROP VIEW IF EXISTS {name}")
+
+
+def _fold_duplicates() -> None:
+    op.execute(
+        """
+        CREATE TEMP TABLE _milestone_keep AS
+        SELECT mi.id AS id, keep.id AS keep_id
+        FROM milestone_instances mi
+        JOIN (
+            SELECT fulfillment_lot_id, checkpoint_type_id, MIN(id) AS id
+            FROM milestone_instances
+            GROUP BY fulfillment_lot_id, checkpoint_type_id
+            HAVING COUNT(*) > 1
+        ) keep
+          ON keep.fulfillment_lot_id = mi.fulfillment_lot_id
+         AND keep.checkpoint_type_id = mi.checkpoint_type_id
+         AND keep.id <> mi.id
+        """
+    )
+    if _has_table("transaction_deliverables"):
+        op.execute(
+            """
+            UPDATE OR IGNORE transaction_deliverables
+            SET deliverable_id = (SELECT keep_id FROM _milestone_keep WHERE id = deliverable_id)
+            WHERE deliverable_id IN (SELECT id FROM _milestone_keep)
+            """
+        )
+        op.execute("DELETE FROM transaction_deliverables WHERE deliverable_id IN (SELECT id FROM _milestone_keep)")
+    op.execute("DELETE FROM milestone_instances WHERE id IN (SELECT id FROM _milestone_keep)")
+    op.execute("DROP TABLE _milestone_keep")
+
+
+def upgrade() -> None:
+    if not _has_table("milestone_instances") or _has_constraint():
+        return
+    _fold_duplicates()
+    _drop_views()
+    with op.batch_alter_table("milestone_instances", recreate="always") as batch:
+        batch.create_unique_constraint(CONSTRAINT, ["fulfillment_lot_id", "checkpoint_type_id"])
+    apply_views(op.get_bind())
+
+
+def downgrade() -> None:
+    if not _has_table("milestone_instances") or not _has_constraint():
+        return
+    _drop_views()
+    with op.batch_alter_table("milestone_instances", recreate="always") as batch:
+        batch.drop_constraint(CONSTRAINT, type_="unique")
+    apply_views(op.get_bind())
@@ -0,0 +1,59 @@
+"""Payment schedule and FX rate lookup indexes
+
+Brings existing databases in line with the model indexes: the PO and invoice
+keys on payment_schedules, the (status, due_date) and (purchase_order_id,
+due_date) filters, and the FX validity lookup. The single-column
+purchase_order_id index is superseded by ix_payment_schedules_po_due.
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261015_04"
+down_revision = "20261015_03"
+branch_labels = None
+depends_on = None
+
+
+INDEXES = [
+    ("ix_payment_schedules_invoice_id", "payment_schedules", ["invoice_id"]),
+    ("ix_payment_schedules_status_due", "payment_schedules", ["status", "due_date"]),
+    ("ix_payment_schedules_po_due", "payment_schedules", ["purchase_order_id", "due_date"]),
+    ("ix_fx_rates_currency_validity", "fx_rates", ["quote_currency", "valid_from", "valid_to"]),
+]
+SUPERSEDED = ("ix_payment_schedules_purchase_order_id", "payment_schedules", ["purchase_order_id"])
+
+
+def _inspector():
+    return sa.inspect(op.get_bind())
+
+
+def _has_table(name: str) -> bool:
+    return name in _inspector().get_table_names()
+
+
+def _has_index(table: str, name: str) -> bool:
+    if not _has_table(table):
+        return False
+    return any(ix["name"] == name for ix in _inspector().get_indexes(table))
+
+
+def upgrade() -> None:
+    for name, table, columns in INDEXES:
+        if _has_table(table) and not _has_index(table, name):
+            op.create_index(name, table, columns)
+    name, table, _ = SUPERSEDED
+    if _has_index(table, name):
+        op.drop_index(name, table_name=table)
+
+
+def downgrade() -> None:
+    name, table, columns = SUPERSEDED
+    if _has_table(table) and not _has_index(table, name):
+        op.create_index(name, table, columns)
+    for name, table, _ in reversed(INDEXES):
+        if _has_index(table, name):
+            op.drop_index(name, table_name=table)
@@ -6,34 +6,95 @@ import uuid
 from decimal import Decimal
 from typing import Any, Iterable, Optional, Sequence
 
+import orjson
 from sqlalchemy import (
     Boolean,
     CheckConstraint,
     Column,
+    Computed,
     Date,
     DateTime,
     Enum,
     Float,
     ForeignKey,
+    Index,
     Integer,
     JSON,
+    LargeBinary,
     Numeric,
     String,
     Text,
     UniqueConstraint,
+    bindparam,
+    exists,
     func,
     text,
 )
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.orm import Mapped, column_property, mapped_column, relationship
+from sqlalchemy.sql.elements import Null
+from sqlalchemy.types import TypeDecorator
 
 from .db import Base
 
+
+class UUIDBytes(TypeDecorator):
+    """UUID stored as its 16 raw bytes (BLOB(16) on SQLite).
+
+    Accepts ``uuid.UUID`` or any string form ``uuid.UUID()`` parses; always
+    returns ``uuid.UUID``. Migration 20261015_01 converts legacy text ids.
+    """
+
+    impl = LargeBinary(16)
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        if not isinstance(value, uuid.UUID):
+            value = uuid.UUID(str(value))
+        return value.bytes
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        return uuid.UUID(bytes=bytes(value))
+
+
+class OrjsonJSON(TypeDecorator):
+    """JSON column encoded and decoded with orjson instead of the json module.
+
+    The processors replace JSON's own rather than wrapping them, so values are
+    encoded once. Non-str keys are stringified as ``json.dumps`` does.
+    """
+
+    impl = JSON
+    cache_ok = True
+    # As with JSON, an explicit None is stored as JSON null; unset stays NULL.
+    should_evaluate_none = True
+
+    def bind_processor(self, dialect):
+        def process(value):
+            if value is JSON.NULL:
+                value = None
+            elif isinstance(value, Null):
+                return None
+            return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode()
+
+        return process
+
+    def result_processor(self, dialect, coltype):
+        def process(value):
+            return None if value is None else orjson.loads(value)
+
+        return process
+
+
 FundingSourceType = Enum("CAR", "COST_CENTER", name="funding_source_type", create_constraint=False)
 TransactionState = Enum("FORECAST", "COMMITMENT", "ACCRUAL", "CASH", name="transaction_state", create_constraint=False)
 TransactionSourceType = Enum(
     "QUOTE", "PO", "INVOICE", "PAYMENT", "JOURNAL", name="transaction_source_type", create_constraint=False
 )
-PaymentDueRule = Enum("NET_N", "ON_EVENT", "NET_0", name="payment_due_rule", create_constraint=False)
+PaymentDueRule = Enum("NET_N", "ON_EVENT", "NET_0", "CUSTOM", name="payment_due_rule", create_constraint=False)
 PaymentScheduleStatus = Enum("PLANNED", "DUE", "PAID", "CANCELLED", name="payment_schedule_status", create_constraint=False)
 
 
@@ -91,6 +152,7 @@ class FxRate(Base):
     __tablename__ = "fx_rates"
     __table_args__ = (
         UniqueConstraint("quote_currency", "valid_from", name="uq_fx_quote_from"),
+        Index("ix_fx_rates_currency_validity", "quote_currency", "valid_from", "valid_to"),
     )
 
     id: Mapped[int] = mapped_column(primary_key=True)
@@ -120,6 +182,13 @@ class FxRate(Base):
             raise LookupError(f"FX rate for {currency} expired on {rate.valid_to}")
         return rate
 
+    @classmethod
+    def rate_to_usd(cls, session, target_date: dt.date, currency: str) -> Decimal:
+        """Rate for converting ``currency`` to USD; USD itself skips the query."""
+        if currency.upper() == "USD":
+            return Decimal("1")
+        return cls.lookup(session, target_date, currency).rate
+
 
 class Quote(Base):
     __tablename__ = "quotes"
@@ -151,7 +220,7 @@ class QuoteLine(Base):
     description: Mapped[str] = mapped_column(Text, nullable=False)
     quantity: Mapped[Decimal] = mapped_column(Numeric(18, 4), default=Decimal("0"))
     unit_cost: Mapped[Optional[Decimal]] = mapped_column(Numeric(18, 6))
-    amount: Mapped[Optional[Decimal]] = mapped_column(Numeric(18, 6))
+    amount: Mapped[Optional[Decimal]] = mapped_column(Numeric(18, 6), Computed("quantity * unit_cost", persisted=True))
     category_id: Mapped[Optional[int]] = mapped_column(ForeignKey("categories.id"))
     expected_date: Mapped[Optional[dt.date]] = mapped_column(Date)
 
@@ -181,6 +250,7 @@ class PurchaseOrder(Base):
     funding_source: Mapped[FundingSource] = relationship(back_populates="purchase_orders")
     lines: Mapped[list["POLine"]] = relationship(back_populates="purchase_order", cascade="all, delete-orphan")
     payment_schedules: Mapped[list["PaymentSchedule"]] = relationship(back_populates="purchase_order")
+    invoices: Mapped[list["Invoice"]] = relationship(back_populates="purchase_order")
 
     def __repr__(self) -> str:  # pragma: no cover
         return f"<PO number={self.po_number!r} total={self.total_amount}>"
@@ -195,7 +265,7 @@ class POLine(Base):
     description: Mapped[str] = mapped_column(Text, nullable=False)
     quantity: Mapped[Decimal] = mapped_column(Numeric(18, 4), default=Decimal("0"))
     unit_price: Mapped[Optional[Decimal]] = mapped_column(Numeric(18, 6))
-    amount: Mapped[Optional[Decimal]] = mapped_column(Numeric(18, 6))
+    amount: Mapped[Optional[Decimal]] = mapped_column(Numeric(18, 6), Computed("quantity * unit_price", persisted=True))
     category_id: Mapped[Optional[int]] = mapped_column(ForeignKey("categories.id"))
     deliverable_desc: Mapped[Optional[str]] = mapped_column(Text)
 
@@ -223,6 +293,7 @@ class Invoice(Base):
     status: Mapped[str] = mapped_column(String(30), default="OPEN", nullable=False)
     memo: Mapped[Optional[str]] = mapped_column(Text)
 
+    purchase_order: Mapped[Optional[PurchaseOrder]] = relationship(back_populates="invoices")
     lines: Mapped[list["InvoiceLine"]] = relationship(back_populates="invoice", cascade="all, delete-orphan")
     payment_schedules: Mapped[list["PaymentSchedule"]] = relationship(back_populates="invoice")
 
@@ -239,7 +310,7 @@ class InvoiceLine(Base):
     description: Mapped[str] = mapped_column(Text, nullable=False)
     quantity: Mapped[Decimal] = mapped_column(Numeric(18, 4), default=Decimal("0"))
     unit_price: Mapped[Optional[Decimal]] = mapped_column(Numeric(18, 6))
-    amount: Mapped[Optional[Decimal]] = mapped_column(Numeric(18, 6))
+    amount: Mapped[Optional[Decimal]] = mapped_column(Numeric(18, 6), Computed("quantity * unit_price", persisted=True))
     category_id: Mapped[Optional[int]] = mapped_column(ForeignKey("categories.id"))
 
     invoice: Mapped[Invoice] = relationship(back_populates="lines")
@@ -285,6 +356,9 @@ class FulfillmentLot(Base):
 
 class MilestoneInstance(Base):
     __tablename__ = "milestone_instances"
+    __table_args__ = (
+        UniqueConstraint("fulfillment_lot_id", "checkpoint_type_id", name="uq_milestone_lot_checkpoint"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     fulfillment_lot_id: Mapped[int] = mapped_column(ForeignKey("fulfillment_lots.id", ondelete="CASCADE"), nullable=False)
@@ -305,15 +379,29 @@ class MilestoneInstance(Base):
         return f"<MilestoneInstance id={self.id} status={self.status}>"
 
 
+# Computed in the lot's own SELECT so serialising lots never walks milestones
+# for lateness; mirrors the is_late rule in v_open_items. "Today" is the app's
+# local date, bound when each query runs (SQLite's CURRENT_DATE is UTC).
+FulfillmentLot.is_late = column_property(
+    exists().where(
+        MilestoneInstance.fulfillment_lot_id == FulfillmentLot.id,
+        MilestoneInstance.actual_date.is_(None),
+        MilestoneInstance.planned_date < bindparam("today", callable_=dt.date.today, type_=Date),
+    )
+)
+
+
 class PaymentSchedule(Base):
     __tablename__ = "payment_schedules"
     __table_args__ = (
         CheckConstraint("percent IS NULL OR percent >= 0", name="ck_payment_percent_positive"),
+        Index("ix_payment_schedules_status_due", "status", "due_date"),
+        Index("ix_payment_schedules_po_due", "purchase_order_id", "due_date"),
     )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     purchase_order_id: Mapped[Optional[int]] = mapped_column(ForeignKey("purchase_orders.id"))
-    invoice_id: Mapped[Optional[int]] = mapped_column(ForeignKey("invoices.id"))
+    invoice_id: Mapped[Optional[int]] = mapped_column(ForeignKey("invoices.id"), index=True)
     percent: Mapped[Optional[Decimal]] = mapped_column(Numeric(6, 3))
     amount: Mapped[Optional[Decimal]] = mapped_column(Numeric(18, 6))
     due_date_rule: Mapped[str] = mapped_column(PaymentDueRule, default="NET_N", nullable=False)
@@ -321,7 +409,7 @@ class PaymentSchedule(Base):
     event_type: Mapped[Optional[str]] = mapped_column(String(50))
     due_date: Mapped[Optional[dt.date]] = mapped_column(Date)
     status: Mapped[str] = mapped_column(PaymentScheduleStatus, default="PLANNED", nullable=False)
-    paid_transaction_id: Mapped[Optional[str]] = mapped_column(ForeignKey("transactions.id"))
+    paid_transaction_id: Mapped[Optional[uuid.UUID]] = mapped_column(ForeignKey("transactions.id"))
 
     purchase_order: Mapped[Optional[PurchaseOrder]] = relationship(back_populates="payment_schedules")
     invoice: Mapped[Optional[Invoice]] = relationship(back_populates="payment_schedules")
@@ -370,7 +458,7 @@ class Event(Base):
     event_type: Mapped[str] = mapped_column(String(50), nullable=False)
     at: Mapped[dt.datetime] = mapped_column(DateTime, default=lambda: dt.datetime.now(dt.timezone.utc), nullable=False)
     by: Mapped[Optional[str]] = mapped_column(String(100))
-    payload_json: Mapped[Optional[dict[str, Any]]] = mapped_column(JSON)
+    payload_json: Mapped[Optional[dict[str, Any]]] = mapped_column(OrjsonJSON)
 
     def __repr__(self) -> str:  # pragma: no cover
         return f"<Event {self.entity_type}:{self.event_type} at={self.at}>"
@@ -393,7 +481,7 @@ class ReportDefinition(Base):
 class Transaction(Base):
     __tablename__ = "transactions"
 
-    id: Mapped[str] = mapped_column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    id: Mapped[uuid.UUID] = mapped_column(UUIDBytes(), primary_key=True, default=uuid.uuid4)
     funding_source_id: Mapped[int] = mapped_column(ForeignKey("funding_sources.id"), nullable=False)
     project_id: Mapped[Optional[int]] = mapped_column(ForeignKey("projects.id"))
     category_id: Mapped[Optional[int]] = mapped_column(ForeignKey("categories.id"))
@@ -409,11 +497,15 @@ class Transaction(Base):
     memo: Mapped[Optional[str]] = mapped_column(Text)
     tags: Mapped[Optional[list[str]]] = mapped_column(JSON)
     created_at: Mapped[dt.datetime] = mapped_column(DateTime, default=lambda: dt.datetime.now(dt.timezone.utc), nullable=False)
-    reverses_transaction_id: Mapped[Optional[str]] = mapped_column(ForeignKey("transactions.id"))
-    reversed_by_transaction_id: Mapped[Optional[str]] = mapped_column(String(36), unique=True)
+    reverses_transaction_id: Mapped[Optional[uuid.UUID]] = mapped_column(ForeignKey("transactions.id"))
+    reversed_by_transaction_id: Mapped[Optional[uuid.UUID]] = mapped_column(UUIDBytes(), unique=True)
 
     funding_source: Mapped[FundingSource] = relationship(back_populates="transactions", foreign_keys=[funding_source_id])
-    reversed_transaction: Mapped[Optional["Transaction"]] = relationship("Transaction", remote_side=[id], foreign_keys=[reverses_transaction_id])
+    # Bulk paths should read reverses_transaction_id / reversed_by_transaction_id;
+    # callers needing the object must opt in with selectinload() at the query site.
+    reversed_transaction: Mapped[Optional["Transaction"]] = relationship(
+        "Transaction", remote_side=[id], foreign_keys=[reverses_transaction_id], lazy="raise"
+    )
     deliverables: Mapped[list[MilestoneInstance]] = relationship(
         "MilestoneInstance",
         secondary="transaction_deliverables",
@@ -451,8 +543,7 @@ class Transaction(Base):
     ) -> "Transaction":
         currency = currency.upper()
         if fx_rate_to_usd is None:
-            rate = FxRate.lookup(session, kwargs.get("txn_date", dt.date.today()), currency)
-            fx_rate_to_usd = rate.rate
+            fx_rate_to_usd = FxRate.rate_to_usd(session, kwargs.get("txn_date", dt.date.today()), currency)
         amount_usd = Decimal(amount_txn) * Decimal(fx_rate_to_usd)
         tx = cls(
             funding_source=funding_source,
@@ -482,7 +573,7 @@ class Transaction(Base):
             funding_source=original.funding_source,
             state=original.state,
             source_type="JOURNAL",
-            source_id=original.id,
+            source_id=str(original.id),
             amount_txn=-original.amount_txn,
             currency=original.currency,
             fx_rate_to_usd=original.fx_rate_to_usd,
@@ -516,10 +607,10 @@ class Transaction(Base):
         session.add(
             Event(
                 entity_type="transaction",
-                entity_id=original.id,
+                entity_id=str(original.id),
                 event_type="reversal",
                 by=by,
-                payload_json={"reason": reason, "replacement_id": replacement.id, "reverse_id": reverse.id},
+                payload_json={"reason": reason, "replacement_id": str(replacement.id), "reverse_id": str(reverse.id)},
             )
         )
         return reverse, replacement
@@ -527,17 +618,17 @@ class Transaction(Base):
 
 class TransactionPOLine(Base):
     __tablename__ = "transaction_po_lines"
-    transaction_id: Mapped[str] = mapped_column(ForeignKey("transactions.id", ondelete="CASCADE"), primary_key=True)
+    transaction_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("transactions.id", ondelete="CASCADE"), primary_key=True)
     po_line_id: Mapped[int] = mapped_column(ForeignKey("po_lines.id", ondelete="CASCADE"), primary_key=True)
 
 
 class TransactionInvoiceLine(Base):
     __tablename__ = "transaction_invoice_lines"
-    transaction_id: Mapped[str] = mapped_column(ForeignKey("transactions.id", ondelete="CASCADE"), primary_key=True)
+    transaction_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("transactions.id", ondelete="CASCADE"), primary_key=True)
     invoice_line_id: Mapped[int] = mapped_column(ForeignKey("invoice_lines.id", ondelete="CASCADE"), primary_key=True)
 
 
 class TransactionDeliverable(Base):
     __tablename__ = "transaction_deliverables"
-    transaction_id: Mapped[str] = mapped_column(ForeignKey("transactions.id", ondelete="CASCADE"), primary_key=True)
+    transaction_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("transactions.id", ondelete="CASCADE"), primary_key=True)
     deliverable_id: Mapped[int] = mapped_column(ForeignKey("milestone_instances.id", ondelete="CASCADE"), primary_key=True)
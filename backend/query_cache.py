@@ -0,0 +1,125 @@
+"""In-process cache for read-heavy query results.
+
+Only engines passed to :func:`register` are cached; the app registers its own
+engine at startup. Entries are tagged with their engine's write generation.
+Any connection on that engine that commits after executing a non-SELECT
+statement bumps the generation. Other processes (the backfill, seed and
+journal scripts) write the same SQLite file, so every lookup also polls
+``PRAGMA data_version`` on a dedicated connection to that file; it changes
+whenever any other connection commits, and a change counts as a bump. The
+app runs as a single process over SQLite, so an in-memory cache gives the
+same hit rate as an external store without another service.
+"""
+from __future__ import annotations
+
+import sqlite3
+import threading
+import weakref
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, TypeVar
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+T = TypeVar("T")
+
+MAX_ENTRIES_PER_ENGINE = 256
+
+_READ_PREFIXES = ("SELECT", "WITH", "PRAGMA", "EXPLAIN")
+_DIRTY_KEY = "query_cache_dirty"
+
+_lock = threading.Lock()
+_generations: "weakref.WeakKeyDictionary[Engine, int]" = weakref.WeakKeyDictionary()
+_caches: "weakref.WeakKeyDictionary[Engine, OrderedDict[Hashable, tuple[int, Any]]]" = weakref.WeakKeyDictionary()
+# Per file-backed engine: a connection used only for PRAGMA data_version, and
+# the last version it reported.
+_watchers: "weakref.WeakKeyDictionary[Engine, sqlite3.Connection]" = weakref.WeakKeyDictionary()
+_data_versions: "weakref.WeakKeyDictionary[Engine, int]" = weakref.WeakKeyDictionary()
+
+
+def register(engine: Engine) -> None:
+    """Enable caching for ``engine`` and track its writes."""
+    with _lock:
+        if engine in _generations:
+            return
+        _generations[engine] = 0
+        _caches[engine] = OrderedDict()
+        database = engine.url.database
+        if engine.dialect.name == "sqlite" and database and database != ":memory:":
+            watcher = sqlite3.connect(database, check_same_thread=False)
+            _watchers[engine] = watcher
+            _data_versions[engine] = _data_version(watcher)
+    event.listen(engine, "before_cursor_execute", _track_writes)
+    event.listen(engine, "commit", _bump_generation)
+    event.listen(engine, "rollback", _clear_dirty)
+
+
+def _data_version(watcher: sqlite3.Connection) -> int:
+    return watcher.execute("PRAGMA data_version").fetchone()[0]
+
+
+def _current_generation(engine: Engine) -> int:
+    """Return the engine's generation, first folding in commits made elsewhere."""
+    with _lock:
+        watcher = _watchers.get(engine)
+        if watcher is not None:
+            version = _data_version(watcher)
+            if version != _data_versions[engine]:
+                _data_versions[engine] = version
+                _generations[engine] += 1
+        return _generations[engine]
+
+
+def _has_pending_writes(db: Session) -> bool:
+    # Flushed-but-uncommitted rows are visible to this session only; a cached
+    # value would hide them, and a value computed here must not be shared.
+    if db.new or db.dirty or db.deleted:
+        return True
+    return db.in_transaction() and bool(db.connection().info.get(_DIRTY_KEY))
+
+
+def get_or_compute(db: Session, key: Hashable, compute: Callable[[], T]) -> T:
+    """Return the cached value for ``key`` or compute and store it."""
+    engine = db.get_bind()
+    if engine not in _generations or _has_pending_writes(db):
+        return compute()
+    generation = _current_generation(engine)
+    with _lock:
+        cache = _caches[engine]
+        entry = cache.get(key)
+        if entry is not None and entry[0] == generation:
+            cache.move_to_end(key)
+            return entry[1]
+
+    # Capture the generation before reading so a write committed mid-compute
+    # leaves this entry already stale.
+    value = compute()
+    with _lock:
+        cache[key] = (generation, value)
+        cache.move_to_end(key)
+        while len(cache) > MAX_ENTRIES_PER_ENGINE:
+            cache.popitem(last=False)
+    return value
+
+
+def invalidate(engine: Engine) -> None:
+    with _lock:
+        if engine in _generations:
+            _generations[engine] += 1
+
+
+def _track_writes(conn, cursor, statement, parameters, context, executemany) -> None:
+    # Watching the cursor catches every write path: unit-of-work flushes, bulk
+    # mappings, Core statements and raw text() SQL alike.
+    if not statement.lstrip()[:7].upper().startswith(_READ_PREFIXES):
+        conn.info[_DIRTY_KEY] = True
+
+
+def _bump_generation(conn) -> None:
+    if conn.info.pop(_DIRTY_KEY, False):
+        invalidate(conn.engine)
+
+
+def _clear_dirty(conn) -> None:
+    conn.info.pop(_DIRTY_KEY, None)
@@ -1,16 +1,25 @@
 from __future__ import annotations
 
 import datetime as dt
-from collections import defaultdict
+import uuid
 from decimal import Decimal
-from typing import Any, Iterable, Optional
+from functools import lru_cache
+from itertools import islice
+from typing import Any, Iterable, Iterator, Optional, Sequence
+
+import orjson
 
 from fastapi import APIRouter, Depends, HTTPException, Query
 from fastapi.params import Param
-from sqlalchemy import and_, or_, select, text
-from sqlalchemy.orm import Session, selectinload
-
-from .db import get_db
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
+from pydantic import TypeAdapter
+from sqlalchemy import Select, and_, delete, func, insert, or_, select, text
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.sql.elements import TextClause
+from sqlalchemy.orm import Session, aliased, contains_eager, joinedload, load_only, selectinload
+
+from .db import get_db, get_finance_db
+from . import query_cache
 from . import models_finance
 from .schemas_finance import (
     DeliverableTemplateApplyRequest,
@@ -21,7 +30,9 @@ from .schemas_finance import (
     FundingSourceIn,
     FundingSourceOut,
     InvoiceIn,
+    InvoiceListOut,
     InvoiceOut,
+    InvoiceUpdateIn,
     LotCreateIn,
     MilestoneUpdateIn,
     PaymentScheduleGenerateV2Request,
@@ -39,7 +50,7 @@ from .schemas_finance import (
     CheckpointTypeOut,
 )
 from .schemas_finance import MilestoneOut
-from .sql.views import ensure_views
+from .sql.views import VIEW_DEFINITIONS, ensure_views
 
 router = APIRouter(prefix="/api", tags=["finance"])
 
@@ -53,6 +64,7 @@ def _emit_event(
     by: str = "system",
     payload: Optional[dict[str, Any]] = None,
 ) -> None:
+    # Written by the caller's next flush or commit alongside the change it records.
     event = models_finance.Event(
         entity_type=entity_type,
         entity_id=str(entity_id),
@@ -62,95 +74,208 @@ def _emit_event(
         at=dt.datetime.now(dt.timezone.utc),
     )
     session.add(event)
-    session.flush()
+
+
+_ZERO = Decimal("0")
+_FX_RATE_MIN = Decimal("0.5")
+_FX_RATE_MAX = Decimal("2.0")
 
 
 def _to_decimal(value: Any) -> Decimal:
     if value is None:
-        return Decimal("0")
-    if isinstance(value, Decimal):
+        return _ZERO
+    cls = value.__class__
+    if cls is Decimal:
         return value
+    if cls is int:
+        return Decimal(value)
+    # Floats still go through str() so 0.1 stays 0.1 rather than its binary expansion.
     try:
         return Decimal(str(value))
     except (ValueError, TypeError):
-        return Decimal("0")
+        return _ZERO
 
 
-def _resolve_group_fields(group_by: Optional[str], mapping: dict[str, str], default: list[str]) -> list[str]:
+@lru_cache(maxsize=256)
+def _resolve_group_fields(view_name: str, group_by: Optional[str]) -> tuple[str, ...]:
+    mapping, default = _VIEW_GROUPS[view_name]
     if not group_by:
-        return list(default)
-    fields: list[str] = []
+        return default
+    fields: dict[str, None] = {}
     for token in group_by.split(","):
         token = token.strip()
         if not token:
             continue
         key = mapping.get(token, mapping.get(token.lower()))
-        if key and key not in fields:
-            fields.append(key)
-    return fields or list(default)
+        if key:
+            fields[key] = None
+    return tuple(fields) or default
 
 
-def _aggregate_numeric(
-    rows: Iterable[dict[str, Any]],
-    *,
-    group_fields: list[str],
-    numeric_mapping: dict[str, str],
-) -> list[dict[str, Any]]:
-    aggregated: dict[tuple[Any, ...], dict[str, Any]] = {}
-    order: list[tuple[Any, ...]] = []
-    for row in rows:
-        key = tuple(row.get(field) for field in group_fields)
-        if key not in aggregated:
-            aggregated[key] = {field: row.get(field) for field in group_fields}
-            for metric in numeric_mapping:
-                aggregated[key][metric] = Decimal("0")
-            order.append(key)
-        bucket = aggregated[key]
-        for metric, column in numeric_mapping.items():
-            bucket[metric] += _to_decimal(row.get(column))
-    return [aggregated[k] for k in order]
-
-
-def _paginate(data: list[dict[str, Any]], limit: int, offset: int) -> list[dict[str, Any]]:
-    start = max(offset, 0)
-    end = start + max(limit, 1)
-    return data[start:end]
-
-
-def _finalise_numeric(record: dict[str, Any]) -> dict[str, Any]:
-    result: dict[str, Any] = {}
-    for key, value in record.items():
-        if isinstance(value, Decimal):
-            result[key] = float(value)
-        else:
-            result[key] = value
-    return result
+_VIEW_METRIC_DEFAULTS: dict[str, Optional[float]] = {
+    "budget_usd": 0.0,
+    "commitment_usd": 0.0,
+    "accrual_usd": 0.0,
+    "cash_usd": 0.0,
+    "open_commitment_usd": 0.0,
+    "variance_usd": 0.0,
+    "variance_pct": None,
+}
+
+
+def _fill_metric_defaults(rows: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    return [{**_VIEW_METRIC_DEFAULTS, **record} for record in rows]
 
 
-def _fetch_view_rows(
+@lru_cache(maxsize=256)
+def _view_statement(
+    view_name: str,
+    group_fields: tuple[str, ...],
+    numeric_items: tuple[tuple[str, str], ...],
+    where_clauses: tuple[str, ...],
+    derived_items: tuple[tuple[str, str], ...],
+    computed_items: tuple[tuple[str, str], ...],
+) -> TextClause:
+    source = view_name
+    if computed_items:
+        extra = ", ".join(f"{expr} AS {name}" for name, expr in computed_items)
+        source = f"(SELECT *, {extra} FROM {view_name}) AS src"
+    columns = list(group_fields)
+    columns.extend(f"COALESCE(SUM({expr}), 0) AS {metric}" for metric, expr in numeric_items)
+    group_sql = ", ".join(group_fields)
+    sql = f"SELECT {', '.join(columns)} FROM {source}"
+    if where_clauses:
+        sql += " WHERE " + " AND ".join(where_clauses)
+    sql += f" GROUP BY {group_sql}"
+    if derived_items:
+        extra = ", ".join(f"{expr} AS {name}" for name, expr in derived_items)
+        sql = f"SELECT agg.*, {extra} FROM ({sql}) AS agg"
+    sql += f" ORDER BY {group_sql} LIMIT :page_limit OFFSET :page_offset"
+    return text(sql)
+
+
+def _aggregate_view_sql(
     db: Session,
     *,
     view_name: str,
+    group_fields: tuple[str, ...],
+    numeric_mapping: dict[str, str],
     where_clauses: list[str],
     params: dict[str, Any],
+    limit: int,
+    offset: int,
+    derived: Optional[dict[str, str]] = None,
+    computed: Optional[dict[str, str]] = None,
 ) -> list[dict[str, Any]]:
+    """Group, sum and paginate a reporting view inside the database.
+
+    Column names and expressions only ever come from the endpoint's own
+    ``group_mapping``/``numeric_mapping`` whitelists; request values are bound
+    as parameters. ``computed`` adds per-row columns to the view before
+    grouping and ``derived`` adds expressions over the summed metrics.
+    """
     ensure_views(db.bind)
-    sql = f"SELECT * FROM {view_name}"
-    if where_clauses:
-        sql += " WHERE " + " AND ".join(where_clauses)
-    rows = db.execute(text(sql), params).mappings().all()
-    return [dict(row) for row in rows]
+    statement = _view_statement(
+        view_name,
+        group_fields,
+        tuple(numeric_mapping.items()),
+        tuple(where_clauses),
+        tuple((derived or {}).items()),
+        tuple((computed or {}).items()),
+    )
+    bound = dict(params, page_limit=max(limit, 1), page_offset=max(offset, 0))
 
+    metrics = list(numeric_mapping) + list(derived or {})
+    results: list[dict[str, Any]] = []
+    for row in db.execute(statement, bound).mappings():
+        record = dict(row)
+        for metric in metrics:
+            if record[metric] is not None:
+                record[metric] = float(record[metric])
+        results.append(record)
+    return results
 
-def _parse_date(value: Any) -> Optional[dt.date]:
-    if isinstance(value, dt.date):
-        return value
-    if isinstance(value, str):
-        try:
-            return dt.date.fromisoformat(value)
-        except ValueError:
-            return None
-    return None
+
+_REPORT_VIEWS = frozenset(VIEW_DEFINITIONS)
+
+
+def _require_report_view(view_name: Any) -> str:
+    if not isinstance(view_name, str) or view_name not in _REPORT_VIEWS:
+        raise HTTPException(status_code=400, detail=f"Unknown report view: {view_name}")
+    return view_name
+
+
+@lru_cache(maxsize=None)
+def _view_rows_statement(view_name: str) -> TextClause:
+    # Only ever called with names from _REPORT_VIEWS, so the interpolation is safe
+    # and each view compiles to one reusable statement.
+    return text(f"SELECT * FROM {view_name}")
+
+
+def _iter_view_rows(db: Session, view_name: str) -> Iterator[dict[str, Any]]:
+    """Yield every row of a view without buffering the whole result in the driver."""
+    ensure_views(db.bind)
+    with db.execute(
+        _view_rows_statement(view_name),
+        execution_options={"stream_results": True, "yield_per": 1000},
+    ) as result:
+        for row in result.mappings():
+            yield dict(row)
+
+
+# Views up to this many rows are kept in the query cache; larger ones are
+# streamed from the cursor on every run.
+_REPORT_CACHE_MAX_ROWS = 5000
+
+
+def _small_view_rows(db: Session, view_name: str) -> Optional[tuple[dict[str, Any], ...]]:
+    rows = _iter_view_rows(db, view_name)
+    try:
+        head = tuple(islice(rows, _REPORT_CACHE_MAX_ROWS + 1))
+    finally:
+        rows.close()
+    return head if len(head) <= _REPORT_CACHE_MAX_ROWS else None
+
+
+def _cached_view_rows(db: Session, view_name: str) -> Optional[Sequence[dict[str, Any]]]:
+    """Return a view's rows from the query cache, or None when it is too large to keep."""
+    # Views bucket against date('now'), so the day is part of the key.
+    return query_cache.get_or_compute(
+        db,
+        ("view_rows", view_name, dt.date.today()),
+        lambda: _small_view_rows(db, view_name),
+    )
+
+
+def _stream_view_rows(engine: Any, view_name: str) -> Iterator[dict[str, Any]]:
+    # The request's session is closed before a streaming body is sent, so the
+    # response reads through a session of its own.
+    with Session(bind=engine) as session:
+        yield from _iter_view_rows(session, view_name)
+
+
+_REPORT_BATCH_SIZE = 1000
+
+
+def _iter_report_json(rows: Iterable[dict[str, Any]], generated_at: dt.datetime) -> Iterator[bytes]:
+    """Encode a ``SavedReportResult`` body in row batches, skipping model validation."""
+    yield b'{"generated_at":' + orjson.dumps(generated_at) + b',"rows":['
+    rows = iter(rows)
+    first = True
+    while batch := list(islice(rows, _REPORT_BATCH_SIZE)):
+        if not first:
+            yield b","
+        yield orjson.dumps(batch, default=str)[1:-1]
+        first = False
+    yield b"]}"
+
+
+def _report_response(db: Session, view_name: str) -> StreamingResponse:
+    rows = _cached_view_rows(db, view_name)
+    if rows is None:
+        rows = _stream_view_rows(db.get_bind(), view_name)
+    generated_at = dt.datetime.now(dt.timezone.utc)
+    return StreamingResponse(_iter_report_json(rows, generated_at), media_type="application/json")
 
 
 def _jsonify(payload: dict[str, Any]) -> dict[str, Any]:
@@ -160,6 +285,8 @@ def _jsonify(payload: dict[str, Any]) -> dict[str, Any]:
             result[key] = value.isoformat()
         elif isinstance(value, Decimal):
             result[key] = float(value)
+        elif isinstance(value, uuid.UUID):
+            result[key] = str(value)
         else:
             result[key] = value
     return result
@@ -172,6 +299,34 @@ def _param_value(value: Any) -> Any:
     return value
 
 
+def _keyset_page(
+    db: Session,
+    stmt: Select,
+    id_column: Any,
+    after_id: Optional[int],
+    limit: Optional[int],
+    response: Optional[Response],
+) -> list[Any]:
+    """Return rows with ids above ``after_id``, in id order.
+
+    Without a ``limit`` every remaining row is returned. With one, at most
+    ``limit`` rows come back and, when more follow, the last returned id is
+    sent as ``X-Next-Cursor``; clients pass it back as ``after_id``.
+    """
+    if after_id is not None:
+        stmt = stmt.where(id_column > after_id)
+    stmt = stmt.order_by(id_column)
+    if limit is None:
+        return db.execute(stmt).scalars().all()
+    rows = db.execute(stmt.limit(limit + 1)).scalars().all()
+    if len(rows) <= limit:
+        return rows
+    rows = rows[:limit]
+    if response is not None:
+        response.headers["X-Next-Cursor"] = str(rows[-1].id)
+    return rows
+
+
 def _document_total_amount(invoice: Optional[models_finance.Invoice], purchase_order: Optional[models_finance.PurchaseOrder]) -> Decimal:
     if invoice and invoice.total_amount is not None:
         return _to_decimal(invoice.total_amount)
@@ -236,6 +391,8 @@ def _generate_payment_schedule_records(
     if not splits:
         raise HTTPException(status_code=400, detail="splits required for CUSTOM generation")
 
+    default_due_date = base_date + dt.timedelta(days=payload.net_days or 0)
+    event_payloads: list[dict[str, Any]] = []
     for idx, split in enumerate(splits):
         percent_value = split.percent
         amount_value = split.amount
@@ -252,11 +409,7 @@ def _generate_payment_schedule_records(
         if amount_value is None and percent_value is not None and total_amount:
             amount_value = total_amount * percent_value
 
-        due_date = split.due_date or (
-            base_date + dt.timedelta(days=payload.net_days or 0)
-            if payload.net_days is not None
-            else base_date
-        )
+        due_date = split.due_date or default_due_date
 
         schedule = models_finance.PaymentSchedule(
             **doc_kwargs,
@@ -267,33 +420,100 @@ def _generate_payment_schedule_records(
             due_date=due_date,
             status="PLANNED",
         )
-        db.add(schedule)
-        db.flush()
+        created.append(schedule)
+        event_payloads.append(
+            {
+                "rule": rule,
+                "split_index": idx,
+                "percent": float(percent_value) if percent_value is not None else None,
+                "amount": float(amount_value) if amount_value is not None else None,
+            }
+        )
+
+    # One flush assigns every schedule id; the events go out with the commit.
+    db.add_all(created)
+    db.flush()
+    for schedule, event_payload in zip(created, event_payloads):
         _emit_event(
             db,
             entity_type="payment_schedule",
             entity_id=schedule.id,
             event_type="payment_schedule_generated",
             by=payload.by,
-            payload={
-                "rule": rule,
-                "split_index": idx,
-                "percent": float(percent_value) if percent_value is not None else None,
-                "amount": float(amount_value) if amount_value is not None else None,
-            },
+            payload=event_payload,
         )
-        created.append(schedule)
 
     return created
 
 
+def _insert_lines(db: Session, model: type, parent_key: str, parent_id: int, lines: list[Any]) -> None:
+    if lines:
+        db.execute(insert(model), [{parent_key: parent_id, **line.model_dump(exclude={"id"})} for line in lines])
+
+
+def _sync_lines(
+    db: Session,
+    existing: list[Any],
+    incoming: list[Any],
+    model: type,
+    parent_key: str,
+    parent_id: int,
+) -> list[int]:
+    """Update kept lines in place and insert new ones; return the ids of lines to remove.
+
+    Incoming lines are matched to existing ones by id. Lines without an id,
+    or with an id belonging to another document, are inserted as new.
+    """
+    by_id = {line.id: line for line in existing}
+    new_lines = []
+    for line in incoming:
+        current = by_id.pop(line.id, None) if line.id is not None else None
+        if current is None:
+            new_lines.append(line)
+            continue
+        for key, value in line.model_dump(exclude={"id"}).items():
+            if getattr(current, key) != value:
+                setattr(current, key, value)
+    _insert_lines(db, model, parent_key, parent_id, new_lines)
+    return list(by_id)
+
+
+def _delete_po_lines(db: Session, line_ids: list[int]) -> None:
+    # Mirrors the ORM delete-orphan cascade (lines -> lots -> milestones) in
+    # three set-based statements; SQLite does not enforce ON DELETE CASCADE.
+    if not line_ids:
+        return
+    lot_ids = select(models_finance.FulfillmentLot.id).where(models_finance.FulfillmentLot.po_line_id.in_(line_ids))
+    db.execute(
+        delete(models_finance.MilestoneInstance).where(models_finance.MilestoneInstance.fulfillment_lot_id.in_(lot_ids))
+    )
+    db.execute(delete(models_finance.FulfillmentLot).where(models_finance.FulfillmentLot.po_line_id.in_(line_ids)))
+    db.execute(delete(models_finance.POLine).where(models_finance.POLine.id.in_(line_ids)))
+
+
+def _replace_invoice_lines(db: Session, invoice: models_finance.Invoice, lines: list[Any]) -> None:
+    removed = _sync_lines(db, invoice.lines, lines, models_finance.InvoiceLine, "invoice_id", invoice.id)
+    if removed:
+        db.execute(delete(models_finance.InvoiceLine).where(models_finance.InvoiceLine.id.in_(removed)))
+
+
+def _lot_select() -> Select:
+    # _serialize_lot reads only the PO id and number through the joined parents.
+    return select(models_finance.FulfillmentLot).options(
+        selectinload(models_finance.FulfillmentLot.milestones),
+        joinedload(models_finance.FulfillmentLot.po_line)
+        .load_only(models_finance.POLine.purchase_order_id)
+        .joinedload(models_finance.POLine.purchase_order)
+        .load_only(models_finance.PurchaseOrder.po_number),
+    )
+
+
+_DELIVERABLE_LOTS = TypeAdapter(list[DeliverableLotOut])
+
+
 def _serialize_lot(lot: models_finance.FulfillmentLot) -> DeliverableLotOut:
     purchase_order = lot.po_line.purchase_order if lot.po_line else None
     milestones = [MilestoneOut.model_validate(m) for m in lot.milestones]
-    is_late = any(
-        m.planned_date and not m.actual_date and m.planned_date < dt.date.today()
-        for m in lot.milestones
-    )
     return DeliverableLotOut(
         id=lot.id,
         po_line_id=lot.po_line_id,
@@ -302,34 +522,39 @@ def _serialize_lot(lot: models_finance.FulfillmentLot) -> DeliverableLotOut:
         lot_qty=lot.lot_qty,
         lot_identifier=lot.lot_identifier,
         notes=lot.notes,
-        is_late=is_late,
+        is_late=bool(lot.is_late),
         milestones=milestones,
     )
 
 
 @router.get("/funding-sources", response_model=list[FundingSourceOut])
 def list_funding_sources(db: Session = Depends(get_db)):
-    return db.execute(select(models_finance.FundingSource)).scalars().all()
+    return query_cache.get_or_compute(
+        db,
+        ("funding_sources",),
+        lambda: [
+            FundingSourceOut.model_validate(fs)
+            for fs in db.execute(select(models_finance.FundingSource)).scalars()
+        ],
+    )
 
 
 @router.post("/funding-sources", response_model=FundingSourceOut)
-def create_funding_source(payload: FundingSourceIn, db: Session = Depends(get_db)):
+def create_funding_source(payload: FundingSourceIn, db: Session = Depends(get_finance_db)):
     fs = models_finance.FundingSource(**payload.model_dump())
     db.add(fs)
     db.commit()
-    db.refresh(fs)
     return fs
 
 
 @router.put("/funding-sources/{fs_id}", response_model=FundingSourceOut)
-def update_funding_source(fs_id: int, payload: FundingSourceIn, db: Session = Depends(get_db)):
+def update_funding_source(fs_id: int, payload: FundingSourceIn, db: Session = Depends(get_finance_db)):
     fs = db.get(models_finance.FundingSource, fs_id)
     if not fs:
         raise HTTPException(status_code=404, detail="Funding source not found")
     for key, value in payload.model_dump().items():
         setattr(fs, key, value)
     db.commit()
-    db.refresh(fs)
     return fs
 
 
@@ -343,7 +568,32 @@ def delete_funding_source(fs_id: int, db: Session = Depends(get_db)):
     return {"ok": True}
 
 
-@router.get("/views/budget-commit-actual")
+_BCA_GROUP_MAPPING = {
+    "funding_source": "funding_source_id",
+    "funding_source_id": "funding_source_id",
+    "project": "project_id",
+    "project_id": "project_id",
+    "category": "category_id",
+    "category_id": "category_id",
+    "currency": "currency",
+}
+_BCA_DEFAULT_GROUP = ("funding_source_id", "project_id", "category_id", "currency")
+_BCA_ACTUAL = "(accrual_usd + cash_usd)"
+_BCA_OPEN_COMMITMENT = f"commitment_usd - {_BCA_ACTUAL}"
+_BCA_NUMERIC_MAPPING = {
+    "budget_usd": "forecast_amount_usd",
+    "commitment_usd": "commitment_amount_usd",
+    "accrual_usd": "accrual_amount_usd",
+    "cash_usd": "cash_amount_usd",
+}
+_BCA_DERIVED = {
+    "open_commitment_usd": f"CASE WHEN {_BCA_OPEN_COMMITMENT} > 0 THEN {_BCA_OPEN_COMMITMENT} ELSE 0 END",
+    "variance_usd": f"{_BCA_ACTUAL} - budget_usd",
+    "variance_pct": f"CASE WHEN budget_usd <> 0 THEN ({_BCA_ACTUAL} - budget_usd) * 100.0 / budget_usd END",
+}
+
+
+@router.get("/views/budget-commit-actual", response_class=ORJSONResponse)
 def get_budget_commit_actual(
     funding_source_id: Optional[int] = Query(default=None),
     project_id: Optional[int] = Query(default=None),
@@ -376,53 +626,42 @@ def get_budget_commit_actual(
         where_clauses.append("category_id = :category_id")
         params["category_id"] = category_id
 
-    rows = _fetch_view_rows(
+    group_fields = _resolve_group_fields("v_budget_commit_actual", group_by)
+
+    return _aggregate_view_sql(
         db,
         view_name="v_budget_commit_actual",
+        group_fields=group_fields,
+        numeric_mapping=_BCA_NUMERIC_MAPPING,
         where_clauses=where_clauses,
         params=params,
+        limit=limit,
+        offset=offset,
+        derived=_BCA_DERIVED,
     )
 
-    group_mapping = {
-        "funding_source": "funding_source_id",
-        "funding_source_id": "funding_source_id",
-        "project": "project_id",
-        "project_id": "project_id",
-        "category": "category_id",
-        "category_id": "category_id",
-        "currency": "currency",
-    }
-    group_fields = _resolve_group_fields(
-        group_by,
-        mapping=group_mapping,
-        default=["funding_source_id", "project_id", "category_id", "currency"],
-    )
-
-    numeric_mapping = {
-        "budget_usd": "forecast_amount_usd",
-        "commitment_usd": "commitment_amount_usd",
-        "accrual_usd": "accrual_amount_usd",
-        "cash_usd": "cash_amount_usd",
-    }
-    aggregated = _aggregate_numeric(rows, group_fields=group_fields, numeric_mapping=numeric_mapping)
 
-    results: list[dict[str, Any]] = []
-    for record in aggregated:
-        budget_val = record.get("budget_usd", Decimal("0"))
-        commitment_val = record.get("commitment_usd", Decimal("0"))
-        accrual_val = record.get("accrual_usd", Decimal("0"))
-        cash_val = record.get("cash_usd", Decimal("0"))
-        open_commitment = max(commitment_val - (accrual_val + cash_val), Decimal("0"))
-        variance = (accrual_val + cash_val) - budget_val
-        record["open_commitment_usd"] = open_commitment
-        record["variance_usd"] = variance
-        record["variance_pct"] = float(variance / budget_val * 100) if budget_val else None
-        results.append(_finalise_numeric(record))
-
-    return _paginate(results, limit=limit, offset=offset)
-
-
-@router.get("/views/open-commitments")
+_OPEN_COMMITMENTS_GROUP_MAPPING = {
+    "funding_source": "funding_source_id",
+    "funding_source_id": "funding_source_id",
+    "project": "project_id",
+    "project_id": "project_id",
+    "vendor": "vendor_id",
+    "vendor_id": "vendor_id",
+    "purchase_order": "purchase_order_id",
+    "po": "purchase_order_id",
+    "po_number": "po_number",
+}
+_OPEN_COMMITMENTS_DEFAULT_GROUP = ("funding_source_id", "purchase_order_id", "vendor_id")
+_OPEN_COMMITMENTS_FX_RATIO = "(CASE WHEN total_amount <> 0 AND amount_usd <> 0 THEN amount_usd * 1.0 / total_amount ELSE 1 END)"
+_OPEN_COMMITMENTS_NUMERIC_MAPPING = {
+    "budget_usd": "amount_usd",
+    "commitment_usd": f"line_amount * {_OPEN_COMMITMENTS_FX_RATIO}",
+    "open_commitment_usd": f"open_amount * {_OPEN_COMMITMENTS_FX_RATIO}",
+}
+
+
+@router.get("/views/open-commitments", response_class=ORJSONResponse)
 def get_open_commitments(
     funding_source_id: Optional[int] = Query(default=None),
     project_id: Optional[int] = Query(default=None),
@@ -451,59 +690,36 @@ def get_open_commitments(
         where_clauses.append("vendor_id = :vendor_id")
         params["vendor_id"] = vendor_id
 
-    rows = _fetch_view_rows(
+    group_fields = _resolve_group_fields("v_open_commitments", group_by)
+
+    rows = _aggregate_view_sql(
         db,
         view_name="v_open_commitments",
+        group_fields=group_fields,
+        numeric_mapping=_OPEN_COMMITMENTS_NUMERIC_MAPPING,
         where_clauses=where_clauses,
         params=params,
+        limit=limit,
+        offset=offset,
     )
+    return _fill_metric_defaults(rows)
 
-    for row in rows:
-        total_amount = _to_decimal(row.get("total_amount"))
-        amount_usd = _to_decimal(row.get("amount_usd"))
-        fx_ratio = Decimal("1")
-        if total_amount:
-            fx_ratio = amount_usd / total_amount if amount_usd else Decimal("1")
-        row["budget_usd_calc"] = amount_usd
-        row["commitment_usd_calc"] = _to_decimal(row.get("line_amount")) * fx_ratio
-        row["open_commitment_usd_calc"] = _to_decimal(row.get("open_amount")) * fx_ratio
-
-    group_mapping = {
-        "funding_source": "funding_source_id",
-        "funding_source_id": "funding_source_id",
-        "project": "project_id",
-        "project_id": "project_id",
-        "vendor": "vendor_id",
-        "vendor_id": "vendor_id",
-        "purchase_order": "purchase_order_id",
-        "po": "purchase_order_id",
-        "po_number": "po_number",
-    }
-    group_fields = _resolve_group_fields(
-        group_by,
-        mapping=group_mapping,
-        default=["funding_source_id", "purchase_order_id", "vendor_id"],
-    )
-
-    numeric_mapping = {
-        "budget_usd": "budget_usd_calc",
-        "commitment_usd": "commitment_usd_calc",
-        "open_commitment_usd": "open_commitment_usd_calc",
-    }
-    aggregated = _aggregate_numeric(rows, group_fields=group_fields, numeric_mapping=numeric_mapping)
-
-    results: list[dict[str, Any]] = []
-    for record in aggregated:
-        record.setdefault("accrual_usd", Decimal("0"))
-        record.setdefault("cash_usd", Decimal("0"))
-        record.setdefault("variance_usd", Decimal("0"))
-        record.setdefault("variance_pct", None)
-        results.append(_finalise_numeric(record))
 
-    return _paginate(results, limit=limit, offset=offset)
+_VENDOR_AGING_GROUP_MAPPING = {
+    "vendor": "vendor_id",
+    "vendor_id": "vendor_id",
+    "currency": "currency",
+}
+_VENDOR_AGING_DEFAULT_GROUP = ("vendor_id", "currency")
+_VENDOR_AGING_NUMERIC_MAPPING = {
+    "bucket_0_30": "bucket_0_30",
+    "bucket_31_60": "bucket_31_60",
+    "bucket_61_90": "bucket_61_90",
+    "bucket_90_plus": "bucket_90_plus",
+}
 
 
-@router.get("/views/vendor-spend-aging")
+@router.get("/views/vendor-spend-aging", response_class=ORJSONResponse)
 def get_vendor_spend_aging(
     vendor_id: Optional[int] = Query(default=None),
     group_by: Optional[str] = Query(default=None),
@@ -522,47 +738,39 @@ def get_vendor_spend_aging(
         where_clauses.append("vendor_id = :vendor_id")
         params["vendor_id"] = vendor_id
 
-    rows = _fetch_view_rows(
+    group_fields = _resolve_group_fields("v_vendor_spend_aging", group_by)
+
+    rows = _aggregate_view_sql(
         db,
         view_name="v_vendor_spend_aging",
+        group_fields=group_fields,
+        numeric_mapping=_VENDOR_AGING_NUMERIC_MAPPING,
         where_clauses=where_clauses,
         params=params,
+        limit=limit,
+        offset=offset,
     )
-
-    group_mapping = {
-        "vendor": "vendor_id",
-        "vendor_id": "vendor_id",
-        "currency": "currency",
-    }
-    group_fields = _resolve_group_fields(
-        group_by,
-        mapping=group_mapping,
-        default=["vendor_id", "currency"],
-    )
-
-    numeric_mapping = {
-        "bucket_0_30": "bucket_0_30",
-        "bucket_31_60": "bucket_31_60",
-        "bucket_61_90": "bucket_61_90",
-        "bucket_90_plus": "bucket_90_plus",
-    }
-    aggregated = _aggregate_numeric(rows, group_fields=group_fields, numeric_mapping=numeric_mapping)
-
-    results: list[dict[str, Any]] = []
-    for record in aggregated:
-        record.setdefault("budget_usd", Decimal("0"))
-        record.setdefault("commitment_usd", Decimal("0"))
-        record.setdefault("accrual_usd", Decimal("0"))
-        record.setdefault("cash_usd", Decimal("0"))
-        record.setdefault("open_commitment_usd", Decimal("0"))
-        record.setdefault("variance_usd", Decimal("0"))
-        record.setdefault("variance_pct", None)
-        results.append(_finalise_numeric(record))
-
-    return _paginate(results, limit=limit, offset=offset)
-
-
-@router.get("/views/open-items")
+    return _fill_metric_defaults(rows)
+
+
+_OPEN_ITEMS_GROUP_MAPPING = {
+    "funding_source": "funding_source_id",
+    "funding_source_id": "funding_source_id",
+    "project": "project_id",
+    "project_id": "project_id",
+    "vendor": "vendor_id",
+    "vendor_id": "vendor_id",
+    "purchase_order": "purchase_order_id",
+    "milestone": "milestone_instance_id",
+    "status": "status",
+    "planned_date": "planned_date",
+    "actual_date": "actual_date",
+    "is_late": "is_late",
+}
+_OPEN_ITEMS_DEFAULT_GROUP = ("purchase_order_id", "milestone_instance_id", "status", "planned_date", "actual_date", "is_late")
+
+
+@router.get("/views/open-items", response_class=ORJSONResponse)
 def get_open_items(
     funding_source_id: Optional[int] = Query(default=None),
    project_id: Optional[int] = Query(default=None),
@@ -595,66 +803,55 @@ def get_open_items(
         where_clauses.append("vendor_id = :vendor_id")
         params["vendor_id"] = vendor_id
 
-    rows = _fetch_view_rows(
+    if date_from is not None:
+        where_clauses.append("(planned_date IS NULL OR planned_date >= :date_from)")
+        params["date_from"] = date_from.isoformat()
+    if date_to is not None:
+        where_clauses.append("(planned_date IS NULL OR planned_date <= :date_to)")
+        params["date_to"] = date_to.isoformat()
+
+    group_fields = _resolve_group_fields("v_open_items", group_by)
+
+    rows = _aggregate_view_sql(
         db,
         view_name="v_open_items",
+        group_fields=group_fields,
+        numeric_mapping={},
         where_clauses=where_clauses,
         params=params,
+        limit=limit,
+        offset=offset,
     )
 
-    filtered_rows: list[dict[str, Any]] = []
-    for row in rows:
-        planned_date = _parse_date(row.get("planned_date"))
-        actual_date = _parse_date(row.get("actual_date"))
-        include = True
-        if date_from and planned_date and planned_date < date_from:
-            include = False
-        if date_to and planned_date and planned_date > date_to:
-            include = False
-        if include:
-            row["planned_date"] = planned_date.isoformat() if planned_date else None
-            row["actual_date"] = actual_date.isoformat() if actual_date else None
-            row["is_late"] = bool(row.get("is_late"))
-            filtered_rows.append(row)
-
-    group_mapping = {
-        "funding_source": "funding_source_id",
-        "funding_source_id": "funding_source_id",
-        "project": "project_id",
-        "project_id": "project_id",
-        "vendor": "vendor_id",
-        "vendor_id": "vendor_id",
-        "purchase_order": "purchase_order_id",
-        "milestone": "milestone_instance_id",
-        "status": "status",
-        "planned_date": "planned_date",
-        "actual_date": "actual_date",
-        "is_late": "is_late",
-    }
-    group_fields = _resolve_group_fields(
-        group_by,
-        mapping=group_mapping,
-        default=["purchase_order_id", "milestone_instance_id", "status", "planned_date", "actual_date", "is_late"],
-    )
-
-    numeric_mapping: dict[str, str] = {}
-    aggregated = _aggregate_numeric(filtered_rows, group_fields=group_fields, numeric_mapping=numeric_mapping)
-
-    results: list[dict[str, Any]] = []
-    for record in aggregated:
-        record.setdefault("budget_usd", Decimal("0"))
-        record.setdefault("commitment_usd", Decimal("0"))
-        record.setdefault("accrual_usd", Decimal("0"))
-        record.setdefault("cash_usd", Decimal("0"))
-        record.setdefault("open_commitment_usd", Decimal("0"))
-        record.setdefault("variance_usd", Decimal("0"))
-        record.setdefault("variance_pct", None)
-        results.append(_finalise_numeric(record))
-
-    return _paginate(results, limit=limit, offset=offset)
-
-
-@router.get("/views/future-plan")
+    for record in rows:
+        if "is_late" in record:
+            record["is_late"] = bool(record["is_late"])
+    return _fill_metric_defaults(rows)
+
+
+_FUTURE_PLAN_GROUP_MAPPING = {
+    "funding_source": "funding_source_id",
+    "funding_source_id": "funding_source_id",
+    "project": "project_id",
+    "project_id": "project_id",
+    "category": "category_id",
+    "category_id": "category_id",
+    "state": "state",
+    "month": "txn_month",
+}
+_FUTURE_PLAN_DEFAULT_GROUP = ("funding_source_id", "project_id", "category_id", "state")
+_FUTURE_PLAN_NUMERIC_MAPPING = {
+    "budget_usd": "CASE WHEN COALESCE(state, 'FORECAST') = 'FORECAST' THEN amount_usd ELSE 0 END",
+    "commitment_usd": "CASE WHEN state = 'COMMITMENT' THEN amount_usd ELSE 0 END",
+}
+_FUTURE_PLAN_DERIVED = {
+    "variance_usd": "commitment_usd - budget_usd",
+    "variance_pct": "CASE WHEN budget_usd <> 0 THEN (commitment_usd - budget_usd) * 100.0 / budget_usd END",
+}
+_FUTURE_PLAN_COMPUTED = {"txn_month": "strftime('%Y-%m', txn_date)"}
+
+
+@router.get("/views/future-plan", response_class=ORJSONResponse)
 def get_future_plan(
     funding_source_id: Optional[int] = Query(default=None),
     project_id: Optional[int] = Query(default=None),
@@ -687,65 +884,54 @@ def get_future_plan(
         where_clauses.append("category_id = :category_id")
         params["category_id"] = category_id
 
-    rows = _fetch_view_rows(
+    if date_from is not None:
+        where_clauses.append("(txn_date IS NULL OR txn_date >= :date_from)")
+        params["date_from"] = date_from.isoformat()
+    if date_to is not None:
+        where_clauses.append("(txn_date IS NULL OR txn_date <= :date_to)")
+        params["date_to"] = date_to.isoformat()
+
+    group_fields = _resolve_group_fields("v_future_plan", group_by)
+
+    rows = _aggregate_view_sql(
         db,
         view_name="v_future_plan",
+        group_fields=group_fields,
+        numeric_mapping=_FUTURE_PLAN_NUMERIC_MAPPING,
         where_clauses=where_clauses,
         params=params,
+        limit=limit,
+        offset=offset,
+        derived=_FUTURE_PLAN_DERIVED,
+        computed=_FUTURE_PLAN_COMPUTED,
     )
+    return _fill_metric_defaults(rows)
 
-    filtered_rows: list[dict[str, Any]] = []
-    for row in rows:
-        txn_date = _parse_date(row.get("txn_date"))
-        if date_from and txn_date and txn_date < date_from:
-            continue
-        if date_to and txn_date and txn_date > date_to:
-            continue
-        amount_usd = _to_decimal(row.get("amount_usd"))
-        state = row.get("state") or "FORECAST"
-        row["txn_date"] = txn_date.isoformat() if txn_date else None
-        row["txn_month"] = txn_date.strftime("%Y-%m") if txn_date else None
-        row["budget_usd_calc"] = amount_usd if state == "FORECAST" else Decimal("0")
-        row["commitment_usd_calc"] = amount_usd if state == "COMMITMENT" else Decimal("0")
-        filtered_rows.append(row)
-
-    group_mapping = {
-        "funding_source": "funding_source_id",
-        "funding_source_id": "funding_source_id",
-        "project": "project_id",
-        "project_id": "project_id",
-        "category": "category_id",
-        "category_id": "category_id",
-        "state": "state",
-        "month": "txn_month",
-    }
-    group_fields = _resolve_group_fields(
-        group_by,
-        mapping=group_mapping,
-        default=["funding_source_id", "project_id", "category_id", "state"],
-    )
 
-    numeric_mapping = {
-        "budget_usd": "budget_usd_calc",
-        "commitment_usd": "commitment_usd_calc",
-    }
-    aggregated = _aggregate_numeric(filtered_rows, group_fields=group_fields, numeric_mapping=numeric_mapping)
+_TO_CAR_GROUP_MAPPING = {
+    "funding_source": "funding_source_id",
+    "funding_source_id": "funding_source_id",
+    "temporary": "is_temporary",
+    "is_temporary": "is_temporary",
+    "closure_date": "closure_date",
+}
+_TO_CAR_DEFAULT_GROUP = ("funding_source_id", "closure_date", "is_temporary")
+_TO_CAR_NUMERIC_MAPPING = {
+    "budget_usd": "burn_down_usd",
+}
 
-    results: list[dict[str, Any]] = []
-    for record in aggregated:
-        record.setdefault("accrual_usd", Decimal("0"))
-        record.setdefault("cash_usd", Decimal("0"))
-        record.setdefault("open_commitment_usd", Decimal("0"))
-        variance = record.get("commitment_usd", Decimal("0")) - record.get("budget_usd", Decimal("0"))
-        record["variance_usd"] = variance
-        budget_val = record.get("budget_usd", Decimal("0"))
-        record["variance_pct"] = float(variance / budget_val * 100) if budget_val else None
-        results.append(_finalise_numeric(record))
 
-    return _paginate(results, limit=limit, offset=offset)
+_VIEW_GROUPS: dict[str, tuple[dict[str, str], tuple[str, ...]]] = {
+    "v_budget_commit_actual": (_BCA_GROUP_MAPPING, _BCA_DEFAULT_GROUP),
+    "v_open_commitments": (_OPEN_COMMITMENTS_GROUP_MAPPING, _OPEN_COMMITMENTS_DEFAULT_GROUP),
+    "v_vendor_spend_aging": (_VENDOR_AGING_GROUP_MAPPING, _VENDOR_AGING_DEFAULT_GROUP),
+    "v_open_items": (_OPEN_ITEMS_GROUP_MAPPING, _OPEN_ITEMS_DEFAULT_GROUP),
+    "v_future_plan": (_FUTURE_PLAN_GROUP_MAPPING, _FUTURE_PLAN_DEFAULT_GROUP),
+    "v_to_car_closure": (_TO_CAR_GROUP_MAPPING, _TO_CAR_DEFAULT_GROUP),
+}
 
 
-@router.get("/views/to-car-closure")
+@router.get("/views/to-car-closure", response_class=ORJSONResponse)
 def get_to_car_closure(
     funding_source_id: Optional[int] = Query(default=None),
     group_by: Optional[str] = Query(default=None),
@@ -764,58 +950,39 @@ def get_to_car_closure(
         where_clauses.append("funding_source_id = :funding_source_id")
         params["funding_source_id"] = funding_source_id
 
-    rows = _fetch_view_rows(
+    group_fields = _resolve_group_fields("v_to_car_closure", group_by)
+
+    rows = _aggregate_view_sql(
         db,
         view_name="v_to_car_closure",
+        group_fields=group_fields,
+        numeric_mapping=_TO_CAR_NUMERIC_MAPPING,
         where_clauses=where_clauses,
         params=params,
+        limit=limit,
+        offset=offset,
     )
-
-    group_mapping = {
-        "funding_source": "funding_source_id",
-        "funding_source_id": "funding_source_id",
-        "temporary": "is_temporary",
-        "is_temporary": "is_temporary",
-        "closure_date": "closure_date",
-    }
-    group_fields = _resolve_group_fields(
-        group_by,
-        mapping=group_mapping,
-        default=["funding_source_id", "closure_date", "is_temporary"],
-    )
-
-    numeric_mapping = {
-        "budget_usd": "burn_down_usd",
-    }
-    aggregated = _aggregate_numeric(rows, group_fields=group_fields, numeric_mapping=numeric_mapping)
-
-    results: list[dict[str, Any]] = []
-    for record in aggregated:
-        record.setdefault("commitment_usd", Decimal("0"))
-        record.setdefault("accrual_usd", Decimal("0"))
-        record.setdefault("cash_usd", Decimal("0"))
-        record.setdefault("open_commitment_usd", Decimal("0"))
-        record.setdefault("variance_usd", Decimal("0"))
-        record.setdefault("variance_pct", None)
-        results.append(_finalise_numeric(record))
-
-    return _paginate(results, limit=limit, offset=offset)
+    return _fill_metric_defaults(rows)
 
 
 @router.get("/purchase-orders", response_model=list[PurchaseOrderOut])
-def list_purchase_orders(db: Session = Depends(get_db)):
-    return db.execute(select(models_finance.PurchaseOrder)).scalars().all()
+def list_purchase_orders(
+    response: Response = None,
+    after_id: Optional[int] = Query(default=None),
+    limit: Optional[int] = Query(default=None, ge=1, le=1000),
+    db: Session = Depends(get_db),
+):
+    stmt = select(models_finance.PurchaseOrder).options(selectinload(models_finance.PurchaseOrder.lines))
+    return _keyset_page(db, stmt, models_finance.PurchaseOrder.id, _param_value(after_id), _param_value(limit), response)
 
 
 @router.post("/purchase-orders", response_model=PurchaseOrderOut)
-def create_purchase_order(payload: PurchaseOrderIn, db: Session = Depends(get_db)):
+def create_purchase_order(payload: PurchaseOrderIn, db: Session = Depends(get_finance_db)):
     po = models_finance.PurchaseOrder(**payload.model_dump(exclude={"lines"}))
     db.add(po)
     db.flush()
-    for line in payload.lines:
-        db.add(models_finance.POLine(purchase_order=po, **line.model_dump()))
+    _insert_lines(db, models_finance.POLine, "purchase_order_id", po.id, payload.lines)
     db.commit()
-    db.refresh(po)
     return po
 
 
@@ -828,18 +995,17 @@ def get_purchase_order(po_id: int, db: Session = Depends(get_db)):
 
 
 @router.put("/purchase-orders/{po_id}", response_model=PurchaseOrderOut)
-def update_purchase_order(po_id: int, payload: PurchaseOrderIn, db: Session = Depends(get_db)):
+def update_purchase_order(po_id: int, payload: PurchaseOrderIn, db: Session = Depends(get_finance_db)):
     po = db.get(models_finance.PurchaseOrder, po_id)
     if not po:
         raise HTTPException(status_code=404, detail="PO not found")
     for key, value in payload.model_dump(exclude={"lines"}).items():
         setattr(po, key, value)
-    po.lines.clear()
-    db.flush()
-    for line in payload.lines:
-        db.add(models_finance.POLine(purchase_order=po, **line.model_dump()))
+    removed = _sync_lines(db, po.lines, payload.lines, models_finance.POLine, "purchase_order_id", po.id)
+    _delete_po_lines(db, removed)
     db.commit()
-    db.refresh(po)
+    # The collection was loaded for the diff; reload it with the inserted lines.
+    db.expire(po, ["lines"])
     return po
 
 
@@ -853,36 +1019,65 @@ def delete_purchase_order(po_id: int, db: Session = Depends(get_db)):
     return {"ok": True}
 
 
-@router.get("/invoices", response_model=list[InvoiceOut])
-def list_invoices(db: Session = Depends(get_db)):
-    return db.execute(select(models_finance.Invoice)).scalars().all()
+@router.get("/invoices", response_model=list[InvoiceListOut])
+def list_invoices(
+    response: Response = None,
+    after_id: Optional[int] = Query(default=None),
+    limit: Optional[int] = Query(default=None, ge=1, le=1000),
+    db: Session = Depends(get_db),
+):
+    stmt = select(models_finance.Invoice).options(
+        load_only(
+            models_finance.Invoice.id,
+            models_finance.Invoice.purchase_order_id,
+            models_finance.Invoice.vendor_id,
+            models_finance.Invoice.invoice_number,
+            models_finance.Invoice.invoice_date,
+            models_finance.Invoice.currency,
+            models_finance.Invoice.total_amount,
+            models_finance.Invoice.amount_usd,
+            models_finance.Invoice.status,
+        )
+    )
+    return _keyset_page(db, stmt, models_finance.Invoice.id, _param_value(after_id), _param_value(limit), response)
 
 
 @router.post("/invoices", response_model=InvoiceOut)
-def create_invoice(payload: InvoiceIn, db: Session = Depends(get_db)):
+def create_invoice(payload: InvoiceIn, db: Session = Depends(get_finance_db)):
     invoice = models_finance.Invoice(**payload.model_dump(exclude={"lines"}))
     db.add(invoice)
     db.flush()
-    for line in payload.lines:
-        db.add(models_finance.InvoiceLine(invoice=invoice, **line.model_dump()))
+    _insert_lines(db, models_finance.InvoiceLine, "invoice_id", invoice.id, payload.lines)
     db.commit()
-    db.refresh(invoice)
     return invoice
 
 
 @router.put("/invoices/{invoice_id}", response_model=InvoiceOut)
-def update_invoice(invoice_id: int, payload: InvoiceIn, db: Session = Depends(get_db)):
+def update_invoice(invoice_id: int, payload: InvoiceIn, db: Session = Depends(get_finance_db)):
     invoice = db.get(models_finance.Invoice, invoice_id)
     if not invoice:
         raise HTTPException(status_code=404, detail="Invoice not found")
     for key, value in payload.model_dump(exclude={"lines"}).items():
         setattr(invoice, key, value)
-    invoice.lines.clear()
-    db.flush()
-    for line in payload.lines:
-        db.add(models_finance.InvoiceLine(invoice=invoice, **line.model_dump()))
+    _replace_invoice_lines(db, invoice, payload.lines)
     db.commit()
-    db.refresh(invoice)
+    db.expire(invoice, ["lines"])
+    return invoice
+
+
+@router.patch("/invoices/{invoice_id}", response_model=InvoiceOut)
+def patch_invoice(invoice_id: int, payload: InvoiceUpdateIn, db: Session = Depends(get_finance_db)):
+    invoice = db.get(models_finance.Invoice, invoice_id)
+    if not invoice:
+        raise HTTPException(status_code=404, detail="Invoice not found")
+    # Only the fields sent are changed, so echoing back an InvoiceListOut row
+    # (no lines, memo or fx rate) leaves the rest of the invoice alone.
+    for key, value in payload.model_dump(exclude={"lines"}, exclude_unset=True).items():
+        setattr(invoice, key, value)
+    if payload.lines is not None:
+        _replace_invoice_lines(db, invoice, payload.lines)
+    db.commit()
+    db.expire(invoice, ["lines"])
     return invoice
 
 
@@ -898,6 +1093,7 @@ def list_payment_schedules(
     status: Optional[str] = Query(default=None),
     limit: int = Query(default=200, ge=1, le=1000),
     offset: int = Query(default=0, ge=0),
+    after_id: Optional[int] = Query(default=None),
     db: Session = Depends(get_db),
 ):
     funding_source_id = _param_value(funding_source_id)
@@ -910,11 +1106,9 @@ def list_payment_schedules(
     status = _param_value(status)
     limit = _param_value(limit)
     offset = _param_value(offset)
+    after_id = _param_value(after_id)
 
-    stmt = select(models_finance.PaymentSchedule).options(
-        selectinload(models_finance.PaymentSchedule.purchase_order),
-        selectinload(models_finance.PaymentSchedule.invoice),
-    )
+    stmt = select(models_finance.PaymentSchedule)
     if po_id is not None:
         stmt = stmt.where(models_finance.PaymentSchedule.purchase_order_id == po_id)
     if invoice_id is not None:
@@ -926,38 +1120,46 @@ def list_payment_schedules(
     if due_to is not None:
         stmt = stmt.where(models_finance.PaymentSchedule.due_date <= due_to)
 
-    schedules = db.execute(stmt).scalars().all()
-
-    filtered: list[models_finance.PaymentSchedule] = []
-    for schedule in schedules:
-        fs_id = None
-        proj_id = None
-        vend_id = None
-        if schedule.purchase_order:
-            fs_id = schedule.purchase_order.funding_source_id
-            proj_id = schedule.purchase_order.project_id
-            vend_id = schedule.purchase_order.vendor_id
-        if schedule.invoice:
-            vend_id = schedule.invoice.vendor_id or vend_id
-            if schedule.invoice.purchase_order:
-                po_ref = schedule.invoice.purchase_order
-                fs_id = fs_id or po_ref.funding_source_id
-                proj_id = proj_id or po_ref.project_id
-                vend_id = vend_id or po_ref.vendor_id
-        if funding_source_id is not None and fs_id != funding_source_id:
-            continue
-        if project_id is not None and proj_id != project_id:
-            continue
-        if vendor_id is not None and vend_id != vendor_id:
-            continue
-        filtered.append(schedule)
+    if funding_source_id is not None or project_id is not None or vendor_id is not None:
+        # A schedule inherits its dimensions from its own PO first, then from
+        # the invoice and the invoice's PO.
+        po = aliased(models_finance.PurchaseOrder)
+        invoice = aliased(models_finance.Invoice)
+        invoice_po = aliased(models_finance.PurchaseOrder)
+        stmt = (
+            stmt.outerjoin(po, models_finance.PaymentSchedule.purchase_order_id == po.id)
+            .outerjoin(invoice, models_finance.PaymentSchedule.invoice_id == invoice.id)
+            .outerjoin(invoice_po, invoice.purchase_order_id == invoice_po.id)
+        )
+        if funding_source_id is not None:
+            stmt = stmt.where(func.coalesce(po.funding_source_id, invoice_po.funding_source_id) == funding_source_id)
+        if project_id is not None:
+            stmt = stmt.where(func.coalesce(po.project_id, invoice_po.project_id) == project_id)
+        if vendor_id is not None:
+            stmt = stmt.where(func.coalesce(invoice.vendor_id, po.vendor_id, invoice_po.vendor_id) == vendor_id)
+        # Populate the relationships from the filter joins instead of joining again.
+        stmt = stmt.options(
+            contains_eager(models_finance.PaymentSchedule.purchase_order.of_type(po)),
+            contains_eager(models_finance.PaymentSchedule.invoice.of_type(invoice)).contains_eager(
+                invoice.purchase_order.of_type(invoice_po)
+            ),
+        )
+    else:
+        stmt = stmt.options(
+            joinedload(models_finance.PaymentSchedule.purchase_order),
+            joinedload(models_finance.PaymentSchedule.invoice).joinedload(models_finance.Invoice.purchase_order),
+        )
 
-    return filtered[offset : offset + limit]
+    if after_id is not None:
+        stmt = stmt.where(models_finance.PaymentSchedule.id > after_id)
+    stmt = stmt.order_by(models_finance.PaymentSchedule.id).limit(limit).offset(offset)
+    return db.execute(stmt).scalars().all()
 
 
 @router.post("/payment-schedules", response_model=PaymentScheduleOut)
-def create_payment_schedule(payload: PaymentScheduleIn, db: Session = Depends(get_db)):
-    schedule = models_finance.PaymentSchedule(**payload.model_dump())
+def create_payment_schedule(payload: PaymentScheduleIn, db: Session = Depends(get_finance_db)):
+    body = payload.model_dump()
+    schedule = models_finance.PaymentSchedule(**body)
     db.add(schedule)
     db.flush()
     _emit_event(
@@ -965,24 +1167,21 @@ def create_payment_schedule(payload: PaymentScheduleIn, db: Session = Depends(ge
         entity_type="payment_schedule",
         entity_id=schedule.id,
         event_type="payment_schedule_created",
-        payload=_jsonify(payload.model_dump()),
+        payload=_jsonify(body),
     )
     db.commit()
-    db.refresh(schedule)
     return schedule
 
 
 @router.post("/payment-schedules/generate", response_model=list[PaymentScheduleOut])
-def payment_schedule_generate(payload: PaymentScheduleGenerateV2Request, db: Session = Depends(get_db)):
+def payment_schedule_generate(payload: PaymentScheduleGenerateV2Request, db: Session = Depends(get_finance_db)):
     schedules = _generate_payment_schedule_records(db, payload)
     db.commit()
-    for schedule in schedules:
-        db.refresh(schedule)
     return schedules
 
 
 @router.post("/payment-schedule/generate", response_model=list[PaymentScheduleOut])
-def payment_schedule_generate_legacy(payload: PaymentScheduleGenerateRequest, db: Session = Depends(get_db)):
+def payment_schedule_generate_legacy(payload: PaymentScheduleGenerateRequest, db: Session = Depends(get_finance_db)):
     modern_payload = PaymentScheduleGenerateV2Request.model_validate(
         {
             "invoice_id": payload.invoice_id,
@@ -995,8 +1194,6 @@ def payment_schedule_generate_legacy(payload: PaymentScheduleGenerateRequest, db
     )
     schedules = _generate_payment_schedule_records(db, modern_payload)
     db.commit()
-    for schedule in schedules:
-        db.refresh(schedule)
     return schedules
 
 
@@ -1004,7 +1201,7 @@ def payment_schedule_generate_legacy(payload: PaymentScheduleGenerateRequest, db
 def update_payment_schedule(
     schedule_id: int,
     payload: PaymentScheduleUpdateIn,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_finance_db),
 ):
     schedule = db.get(models_finance.PaymentSchedule, schedule_id)
     if not schedule:
@@ -1017,8 +1214,6 @@ def update_payment_schedule(
     for key, value in updates.items():
         setattr(schedule, key, value)
 
-    db.commit()
-    db.refresh(schedule)
     _emit_event(
         db,
         entity_type="payment_schedule",
@@ -1026,6 +1221,7 @@ def update_payment_schedule(
         event_type="payment_schedule_updated",
         payload=_jsonify(updates),
     )
+    db.commit()
     return schedule
 
 
@@ -1037,7 +1233,6 @@ def delete_payment_schedule(schedule_id: int, db: Session = Depends(get_db)):
     if schedule.paid_transaction_id:
         raise HTTPException(status_code=400, detail="Cannot delete a paid schedule")
     db.delete(schedule)
-    db.flush()
     _emit_event(
         db,
         entity_type="payment_schedule",
@@ -1056,6 +1251,7 @@ def list_fx_rates(
     active_on: Optional[dt.date] = Query(default=None),
     limit: int = Query(default=200, ge=1, le=1000),
     offset: int = Query(default=0, ge=0),
+    after_id: Optional[int] = Query(default=None),
     db: Session = Depends(get_db),
 ):
     quote_currency = _param_value(quote_currency)
@@ -1064,6 +1260,7 @@ def list_fx_rates(
     active_on = _param_value(active_on)
     limit = _param_value(limit)
     offset = _param_value(offset)
+    after_id = _param_value(after_id)
 
     stmt = select(models_finance.FxRate)
     if quote_currency:
@@ -1078,22 +1275,29 @@ def list_fx_rates(
             )
         )
 
-    rates = db.execute(stmt).scalars().all()
     if active_on:
-        active_rates = []
-        for rate in rates:
-            if rate.valid_from and rate.valid_from > active_on:
-                continue
-            if rate.valid_to and rate.valid_to < active_on:
-                continue
-            active_rates.append(rate)
-        rates = active_rates
-    return rates[offset : offset + limit]
+        stmt = stmt.where(
+            models_finance.FxRate.valid_from <= active_on,
+            or_(
+                models_finance.FxRate.valid_to.is_(None),
+                models_finance.FxRate.valid_to >= active_on,
+            ),
+        )
+
+    if after_id is not None:
+        stmt = stmt.where(models_finance.FxRate.id > after_id)
+    stmt = stmt.order_by(models_finance.FxRate.id).limit(limit).offset(offset)
+    key = ("fx_rates", quote_currency, valid_from, valid_to, active_on, limit, offset, after_id)
+    return query_cache.get_or_compute(
+        db,
+        key,
+        lambda: [FxRateOut.model_validate(rate) for rate in db.execute(stmt).scalars()],
+    )
 
 
 @router.post("/fx-rates", response_model=FxRateOut)
-def create_fx_rate(payload: FxRateIn, db: Session = Depends(get_db)):
-    if not (Decimal("0.5") <= payload.rate <= Decimal("2.0")) and not payload.manual_override:
+def create_fx_rate(payload: FxRateIn, db: Session = Depends(get_finance_db)):
+    if not payload.manual_override and not (_FX_RATE_MIN <= payload.rate <= _FX_RATE_MAX):
         raise HTTPException(status_code=400, detail="FX rate out of safety bounds")
     body = payload.model_dump()
     body["quote_currency"] = body["quote_currency"].upper()
@@ -1108,12 +1312,11 @@ def create_fx_rate(payload: FxRateIn, db: Session = Depends(get_db)):
         payload=_jsonify(body),
     )
     db.commit()
-    db.refresh(rate)
     return rate
 
 
 @router.put("/fx-rates/{rate_id}", response_model=FxRateOut)
-def update_fx_rate(rate_id: int, payload: FxRateUpdateIn, db: Session = Depends(get_db)):
+def update_fx_rate(rate_id: int, payload: FxRateUpdateIn, db: Session = Depends(get_finance_db)):
     rate = db.get(models_finance.FxRate, rate_id)
     if not rate:
         raise HTTPException(status_code=404, detail="FX rate not found")
@@ -1123,14 +1326,12 @@ def update_fx_rate(rate_id: int, payload: FxRateUpdateIn, db: Session = Depends(
         updates["quote_currency"] = updates["quote_currency"].upper()
     if "rate" in updates and updates["rate"] is not None:
         rate_value = _to_decimal(updates["rate"])
-        if not (Decimal("0.5") <= rate_value <= Decimal("2.0")) and not (payload.manual_override or rate.manual_override):
+        if not (payload.manual_override or rate.manual_override) and not (_FX_RATE_MIN <= rate_value <= _FX_RATE_MAX):
             raise HTTPException(status_code=400, detail="FX rate out of safety bounds")
         updates["rate"] = rate_value
     for key, value in updates.items():
         setattr(rate, key, value)
 
-    db.commit()
-    db.refresh(rate)
     _emit_event(
         db,
         entity_type="fx_rate",
@@ -1138,6 +1339,7 @@ def update_fx_rate(rate_id: int, payload: FxRateUpdateIn, db: Session = Depends(
         event_type="fx_rate_updated",
         payload=_jsonify(updates),
     )
+    db.commit()
     return rate
 
 
@@ -1152,12 +1354,11 @@ def delete_fx_rate(rate_id: int, db: Session = Depends(get_db)):
     ).where(models_finance.Transaction.txn_date >= rate.valid_from)
     if rate.valid_to:
         txn_query = txn_query.where(models_finance.Transaction.txn_date <= rate.valid_to)
-    txn_used = db.execute(txn_query.limit(1)).scalar_one_or_none()
+    txn_used = db.execute(select(txn_query.exists())).scalar()
     if txn_used:
         raise HTTPException(status_code=400, detail="FX rate currently referenced by transactions")
 
     db.delete(rate)
-    db.flush()
     _emit_event(
         db,
         entity_type="fx_rate",
@@ -1170,11 +1371,21 @@ def delete_fx_rate(rate_id: int, db: Session = Depends(get_db)):
 
 @router.post("/reallocate")
 def reallocate(req: ReallocateRequest, db: Session = Depends(get_db)):
-    txn = db.get(models_finance.Transaction, req.transaction_id)
-    if not txn:
+    # One round trip for the transaction, its own funding source (copied by the
+    # reversal pair) and the reallocation target.
+    row = db.execute(
+        select(models_finance.Transaction, models_finance.FundingSource)
+        .options(joinedload(models_finance.Transaction.funding_source))
+        .outerjoin(
+            models_finance.FundingSource,
+            models_finance.FundingSource.id == req.target_funding_source_id,
+        )
+        .where(models_finance.Transaction.id == req.transaction_id)
+    ).first()
+    if row is None:
         raise HTTPException(status_code=404, detail="Transaction not found")
-    target_fs = db.get(models_finance.FundingSource, req.target_funding_source_id)
-    if not target_fs:
+    txn, target_fs = row
+    if target_fs is None:
         raise HTTPException(status_code=404, detail="Funding source not found")
     reverse, replacement = models_finance.Transaction.create_reversal_pair(
         db,
@@ -1198,6 +1409,7 @@ def list_deliverables(
     late_only: bool = Query(default=False),
     limit: int = Query(default=200, ge=1, le=1000),
     offset: int = Query(default=0, ge=0),
+    after_id: Optional[int] = Query(default=None),
     db: Session = Depends(get_db),
 ):
     po_id = _param_value(po_id)
@@ -1206,46 +1418,54 @@ def list_deliverables(
     late_only = bool(_param_value(late_only))
     limit = _param_value(limit)
     offset = _param_value(offset)
+    after_id = _param_value(after_id)
 
-    stmt = select(models_finance.FulfillmentLot).options(
-        selectinload(models_finance.FulfillmentLot.milestones),
-        selectinload(models_finance.FulfillmentLot.po_line).selectinload(models_finance.POLine.purchase_order),
-    )
-    lots = db.execute(stmt).scalars().all()
-    results: list[DeliverableLotOut] = []
-    for lot in lots:
-        purchase_order = lot.po_line.purchase_order if lot.po_line else None
-        if po_id is not None and (not purchase_order or purchase_order.id != po_id):
-            continue
-        if po_line_id is not None and lot.po_line_id != po_line_id:
-            continue
-        if status is not None and not any(m.status == status for m in lot.milestones):
-            continue
-        late_flag = any(
-            m.planned_date and not m.actual_date and m.planned_date < dt.date.today()
-            for m in lot.milestones
-        )
-        if late_only and not late_flag:
-            continue
-        results.append(_serialize_lot(lot))
-    return results[offset : offset + limit]
+    stmt = _lot_select()
+    if po_id is not None:
+        stmt = stmt.where(models_finance.FulfillmentLot.po_line.has(models_finance.POLine.purchase_order_id == po_id))
+    if po_line_id is not None:
+        stmt = stmt.where(models_finance.FulfillmentLot.po_line_id == po_line_id)
+    if status is not None:
+        stmt = stmt.where(models_finance.FulfillmentLot.milestones.any(models_finance.MilestoneInstance.status == status))
+    if late_only:
+        stmt = stmt.where(models_finance.FulfillmentLot.is_late)
+
+    if after_id is not None:
+        stmt = stmt.where(models_finance.FulfillmentLot.id > after_id)
+    stmt = stmt.order_by(models_finance.FulfillmentLot.id).limit(limit).offset(offset)
+    lots = [_serialize_lot(lot) for lot in db.execute(stmt).scalars()]
+    # Encode once in pydantic-core; returning the models would make FastAPI
+    # revalidate the list and run it through jsonable_encoder again.
+    return Response(_DELIVERABLE_LOTS.dump_json(lots), media_type="application/json")
 
 
 @router.get("/deliverables/checkpoints", response_model=list[CheckpointTypeOut])
 def list_checkpoint_types(db: Session = Depends(get_db)):
-    return db.execute(select(models_finance.CheckpointType)).scalars().all()
+    return query_cache.get_or_compute(
+        db,
+        ("checkpoint_types",),
+        lambda: [
+            CheckpointTypeOut.model_validate(cp)
+            for cp in db.execute(select(models_finance.CheckpointType)).scalars()
+        ],
+    )
 
 
 @router.post("/deliverables/template/apply", response_model=list[DeliverableLotOut])
 def apply_deliverable_template(payload: DeliverableTemplateApplyRequest, db: Session = Depends(get_db)):
-    po = db.get(models_finance.PurchaseOrder, payload.purchase_order_id)
+    po = db.execute(
+        select(models_finance.PurchaseOrder)
+        .options(selectinload(models_finance.PurchaseOrder.lines).selectinload(models_finance.POLine.lots))
+        .where(models_finance.PurchaseOrder.id == payload.purchase_order_id)
+    ).scalar_one_or_none()
     if not po:
         raise HTTPException(status_code=404, detail="PO not found")
     if not payload.checkpoint_type_ids:
         raise HTTPException(status_code=400, detail="checkpoint_type_ids required")
 
+    wanted_line_ids = set(payload.po_line_ids or [])
     target_lines = (
-        [line for line in po.lines if line.id in set(payload.po_line_ids or [])]
+        [line for line in po.lines if line.id in wanted_line_ids]
         if payload.po_line_ids
         else list(po.lines)
     )
@@ -1253,42 +1473,70 @@ def apply_deliverable_template(payload: DeliverableTemplateApplyRequest, db: Ses
         raise HTTPException(status_code=400, detail="No matching PO lines for template")
 
     quantities = payload.lot_quantities or [line.quantity for line in target_lines if line.quantity] or [Decimal("0")]
-
-    lots_created: list[models_finance.FulfillmentLot] = []
+    lot_quantities = [_to_decimal(qty) for qty in quantities]
+    checkpoint_ids = list(dict.fromkeys(payload.checkpoint_type_ids))
+    today = dt.date.today()
+
+    # Reapplying a template is idempotent: each requested quantity reuses an
+    # unclaimed lot of that quantity on the line, and milestones are keyed by
+    # (lot, checkpoint) via uq_milestone_lot_checkpoint. Lots given an
+    # identifier or notes were entered by hand and never fill a template slot.
+    lots: list[models_finance.FulfillmentLot] = []
+    new_lots: list[models_finance.FulfillmentLot] = []
     for line in target_lines:
-        for qty in quantities:
-            lot = models_finance.FulfillmentLot(
-                po_line=line,
-                lot_qty=_to_decimal(qty),
-            )
-            db.add(lot)
-            db.flush()
-            _emit_event(
-                db,
-                entity_type="fulfillment_lot",
-                entity_id=lot.id,
-                event_type="lot_created",
-                by=payload.by,
-                payload={"po_line_id": line.id, "qty": float(_to_decimal(qty))},
-            )
-            for checkpoint_id in payload.checkpoint_type_ids:
-                milestone = models_finance.MilestoneInstance(
-                    lot=lot,
-                    checkpoint_type_id=checkpoint_id,
-                    planned_date=dt.date.today(),
-                    status="PENDING",
-                )
-                db.add(milestone)
-                db.flush()
-                _emit_event(
-                    db,
-                    entity_type="milestone",
-                    entity_id=milestone.id,
-                    event_type="milestone_created",
-                    by=payload.by,
-                    payload={"checkpoint_type_id": checkpoint_id},
-                )
-            lots_created.append(lot)
+        reusable = sorted(
+            (lot for lot in line.lots if lot.lot_identifier is None and lot.notes is None),
+            key=lambda lot: lot.id,
+        )
+        for qty in lot_quantities:
+            match = next((lot for lot in reusable if lot.lot_qty == qty), None)
+            if match is not None:
+                reusable.remove(match)
+                lots.append(match)
+                continue
+            lot = models_finance.FulfillmentLot(po_line=line, lot_qty=qty)
+            lots.append(lot)
+            new_lots.append(lot)
+    db.add_all(new_lots)
+    db.flush()
+
+    # executemany lets SQLAlchemy split the rows into batches that stay within
+    # SQLite's bind-parameter limit; rows the lot already carries are skipped.
+    created = db.execute(
+        sqlite_insert(models_finance.MilestoneInstance)
+        .on_conflict_do_nothing(index_elements=["fulfillment_lot_id", "checkpoint_type_id"])
+        .returning(models_finance.MilestoneInstance.id, models_finance.MilestoneInstance.checkpoint_type_id),
+        [
+            {
+                "fulfillment_lot_id": lot.id,
+                "checkpoint_type_id": checkpoint_id,
+                "planned_date": today,
+                "status": "PENDING",
+            }
+            for lot in lots
+            for checkpoint_id in checkpoint_ids
+        ],
+    ).all()
+
+    for lot in new_lots:
+        _emit_event(
+            db,
+            entity_type="fulfillment_lot",
+            entity_id=lot.id,
+            event_type="lot_created",
+            by=payload.by,
+            payload={"po_line_id": lot.po_line_id, "qty": float(lot.lot_qty)},
+        )
+    for milestone_id, checkpoint_id in created:
+        _emit_event(
+            db,
+            entity_type="milestone",
+            entity_id=milestone_id,
+            event_type="milestone_created",
+            by=payload.by,
+            payload={"checkpoint_type_id": checkpoint_id},
+        )
+    lots_created = [lot.id for lot in lots]
 
     _emit_event(
         db,
@@ -1300,9 +1548,14 @@ def apply_deliverable_template(payload: DeliverableTemplateApplyRequest, db: Ses
     )
 
     db.commit()
-    for lot in lots_created:
-        db.refresh(lot)
-    return [_serialize_lot(lot) for lot in lots_created]
+    # Reused lots may hold a milestones collection from before the insert.
+    lots = db.execute(
+        _lot_select()
+        .where(models_finance.FulfillmentLot.id.in_(lots_created))
+        .execution_options(populate_existing=True)
+    ).scalars()
+    lots_by_id = {lot.id: lot for lot in lots}
+    return [_serialize_lot(lots_by_id[lot_id]) for lot_id in lots_created]
 
 
 @router.post("/po-lines/{po_line_id}/lots", response_model=DeliverableLotOut)
@@ -1310,28 +1563,30 @@ def create_fulfillment_lot(po_line_id: int, payload: LotCreateIn, db: Session =
     po_line = db.get(models_finance.POLine, po_line_id)
     if not po_line:
         raise HTTPException(status_code=404, detail="PO line not found")
+    lot_qty = _to_decimal(payload.lot_qty)
     lot = models_finance.FulfillmentLot(
         po_line=po_line,
-        lot_qty=_to_decimal(payload.lot_qty),
+        lot_qty=lot_qty,
         lot_identifier=payload.lot_identifier,
         notes=payload.notes,
     )
     db.add(lot)
     db.flush()
+    lot_id = lot.id
     _emit_event(
         db,
         entity_type="fulfillment_lot",
-        entity_id=lot.id,
+        entity_id=lot_id,
         event_type="lot_created",
-        payload={"po_line_id": po_line_id, "qty": float(_to_decimal(payload.lot_qty))},
+        payload={"po_line_id": po_line_id, "qty": float(lot_qty)},
     )
     db.commit()
-    db.refresh(lot)
+    lot = db.execute(_lot_select().where(models_finance.FulfillmentLot.id == lot_id)).scalar_one()
     return _serialize_lot(lot)
 
 
 @router.put("/milestones/{milestone_id}", response_model=MilestoneOut)
-def update_milestone(milestone_id: int, payload: MilestoneUpdateIn, db: Session = Depends(get_db)):
+def update_milestone(milestone_id: int, payload: MilestoneUpdateIn, db: Session = Depends(get_finance_db)):
     milestone = db.get(models_finance.MilestoneInstance, milestone_id)
     if not milestone:
         raise HTTPException(status_code=404, detail="Milestone not found")
@@ -1345,8 +1600,6 @@ def update_milestone(milestone_id: int, payload: MilestoneUpdateIn, db: Session
     if payload.actual_date and payload.status is None:
         milestone.status = "COMPLETED"
 
-    db.commit()
-    db.refresh(milestone)
     event_payload = {
         key: (value.isoformat() if isinstance(value, dt.date) else value)
         for key, value in updates.items()
@@ -1358,29 +1611,35 @@ def update_milestone(milestone_id: int, payload: MilestoneUpdateIn, db: Session
         event_type="milestone_marked",
         payload=event_payload,
     )
+    db.commit()
     return MilestoneOut.model_validate(milestone)
 
 
 @router.post("/reports", response_model=ReportDefinitionOut)
-def create_report(payload: ReportDefinitionIn, db: Session = Depends(get_db)):
+def create_report(payload: ReportDefinitionIn, db: Session = Depends(get_finance_db)):
     report = models_finance.ReportDefinition(**payload.model_dump())
     db.add(report)
     db.commit()
-    db.refresh(report)
     return report
 
 
 @router.get("/reports", response_model=list[ReportDefinitionOut])
 def list_reports(db: Session = Depends(get_db)):
-    return db.execute(select(models_finance.ReportDefinition)).scalars().all()
+    return query_cache.get_or_compute(
+        db,
+        ("reports",),
+        lambda: [
+            ReportDefinitionOut.model_validate(report)
+            for report in db.execute(select(models_finance.ReportDefinition)).scalars()
+        ],
+    )
 
 
 @router.post("/report/save", response_model=ReportDefinitionOut)
-def save_report(payload: ReportDefinitionIn, db: Session = Depends(get_db)):
+def save_report(payload: ReportDefinitionIn, db: Session = Depends(get_finance_db)):
     report = models_finance.ReportDefinition(**payload.model_dump())
     db.add(report)
     db.commit()
-    db.refresh(report)
     return report
 
 
@@ -1392,9 +1651,7 @@ def run_report(report_id: int, db: Session = Depends(get_db)):
     view_name = report.json_config.get("view")
     if not view_name:
         raise HTTPException(status_code=400, detail="Report missing view name in json_config")
-    ensure_views(db.bind)
-    rows = [dict(r._mapping) for r in db.execute(text(f"SELECT * FROM {view_name}"))]
-    return SavedReportResult(rows=rows, generated_at=dt.datetime.now(dt.timezone.utc))
+    return _report_response(db, _require_report_view(view_name))
 
 
 @router.post("/report/run", response_model=SavedReportResult)
@@ -1402,6 +1659,4 @@ def run_report_adhoc(payload: ReportRunIn, db: Session = Depends(get_db)):
     view_name = payload.json_config.get("view")
     if not view_name:
         raise HTTPException(status_code=400, detail="json_config.view is required")
-    ensure_views(db.bind)
-    rows = [dict(r._mapping) for r in db.execute(text(f"SELECT * FROM {view_name}"))]
-    return SavedReportResult(rows=rows, generated_at=dt.datetime.now(dt.timezone.utc))
+    return _report_response(db, _require_report_view(view_name))
@@ -2,13 +2,18 @@
 
 from __future__ import annotations
 
-import json
-from typing import Iterable, List, Optional, Set, Union
+from functools import lru_cache
+import hashlib
+from typing import Any, Callable, FrozenSet, List, Optional, Union
 
-from fastapi import APIRouter, Body, Depends, HTTPException, Query
+import orjson
+
+from fastapi import APIRouter, Body, Depends, Header, HTTPException, Query
+from fastapi.responses import ORJSONResponse, Response
 from sqlalchemy.orm import Session
 
 from .db import get_db
+from . import query_cache
 from .services import funding, tags as tag_service
 from . import models, schemas
 
@@ -26,151 +31,242 @@ _ERROR_STATUS_MAP = {
     "has_children": 422,
 }
 
+_VALID_INCLUDES = frozenset({"assets", "paths", "stats", "tags"})
+
 
-def _parse_include(value: Optional[str]) -> Set[str]:
+def _parse_include(value: Optional[str]) -> FrozenSet[str]:
     if not value:
-        return set()
-    parts: Iterable[str]
+        return frozenset()
     if isinstance(value, list):  # pragma: no cover - interface guard
-        parts = value
-    else:
-        parts = [value]
-    include: Set[str] = set()
-    for part in parts:
-        for item in part.split(","):
-            item = item.strip()
-            if item:
-                include.add(item)
-    return include
+        value = ",".join(value)
+    items = _parse_include_items(value)
+    unknown = items - _VALID_INCLUDES
+    if unknown:
+        raise HTTPException(
+            status_code=422,
+            detail={"code": "invalid_include", "message": f"unknown include: {', '.join(sorted(unknown))}"},
+        )
+    return items
+
+
+@lru_cache(maxsize=256)
+def _parse_include_items(value: str) -> FrozenSet[str]:
+    # The same few include strings recur on every request.
+    return frozenset(item for item in (part.strip() for part in value.split(",")) if item)
 
 
 def _dt(value):
     return value.isoformat() if value else None
 
 
-def _date(value):
-    return value.isoformat() if value else None
+# The dict builders hand dates and datetimes to orjson untouched; it encodes
+# them natively with the same output as ``isoformat()``. Only the pydantic
+# schemas, which declare these fields as strings, need them converted.
+_TEMPORAL_FIELDS = ("closure_date", "created_at", "updated_at")
+
+
+def _isoformat_fields(data: dict) -> dict:
+    for key in _TEMPORAL_FIELDS:
+        value = data.get(key)
+        if value is not None and not isinstance(value, str):
+            data[key] = value.isoformat()
+    return data
 
 
 def _arr(value: Optional[Union[str, List]]) -> Optional[List]:
-    if value is None:
-        return None
-    if isinstance(value, list):
+    # JSON columns come back already decoded, so lists are the common case;
+    # strings only show up for legacy rows that stored the encoded text.
+    if value is None or type(value) is list:
         return value
     if isinstance(value, str):
         text = value.strip()
         if not text:
             return []
         try:
-            parsed = json.loads(text)
+            parsed = orjson.loads(text)
             return parsed if isinstance(parsed, list) else [parsed]
-        except json.JSONDecodeError:
+        except orjson.JSONDecodeError:
             return [text]
     return list(value)
 
 
-def _tag_bundle_schema(bundle: Optional[dict]) -> Optional[schemas.TagBundleOut]:
+# Response builders turn the dicts produced by services/funding.py into
+# JSON-ready dicts shaped exactly like the response schemas. Read routes encode
+# them straight to JSON without building Pydantic models (the hot ones through
+# the query cache); write routes validate them into their schema.
+
+
+def _tag_bundle_dict(bundle: Optional[dict]) -> Optional[dict]:
     if not bundle:
         return None
-    return schemas.TagBundleOut(
-        direct=[schemas.TagRef(**ref) for ref in bundle.get("direct", [])],
-        inherited=[schemas.TagRef(**ref) for ref in bundle.get("inherited", [])],
-        effective=[schemas.TagRef(**ref) for ref in bundle.get("effective", [])],
-    )
+    # Refs come from tags._tag_ref and already match schemas.TagRef.
+    return {
+        "direct": bundle.get("direct", []),
+        "inherited": bundle.get("inherited", []),
+        "effective": bundle.get("effective", []),
+    }
 
 
-def _asset_list_schema(asset_data: Optional[dict]) -> Optional[schemas.AssetListOut]:
+def _asset_list_dict(asset_data: Optional[dict]) -> Optional[dict]:
     if not asset_data:
         return None
-    items = [schemas.LineAssetSummary(**item) for item in asset_data.get("items", [])]
-    return schemas.AssetListOut(count=asset_data.get("count", len(items)), items=items)
+    items = [{"id": item["id"], "name": item["name"]} for item in asset_data.get("items", [])]
+    return {"count": asset_data.get("count", len(items)), "items": items}
 
 
-def _budget_to_schema(data: dict) -> schemas.BudgetOut:
+def _budget_to_dict(data: dict) -> dict:
     stats = data.get("stats")
-    tags = _tag_bundle_schema(data.get("tags"))
-    stats_schema = schemas.BudgetStatsOut(**stats) if stats else None
-    return schemas.BudgetOut(
-        id=data["id"],
-        name=data["name"],
-        owner=data.get("owner"),
-        is_cost_center=data["is_cost_center"],
-        closure_date=_date(data.get("closure_date")),
-        description=data.get("description"),
-        budget_amount_cache=data.get("budget_amount_cache"),
-        created_at=_dt(data.get("created_at")),
-        updated_at=_dt(data.get("updated_at")),
-        stats=stats_schema,
-        tags=tags,
-    )
+    return {
+        "id": data["id"],
+        "name": data["name"],
+        "owner": data.get("owner"),
+        "is_cost_center": data["is_cost_center"],
+        "closure_date": data.get("closure_date"),
+        "description": data.get("description"),
+        "budget_amount_cache": data.get("budget_amount_cache"),
+        "created_at": data.get("created_at"),
+        "updated_at": data.get("updated_at"),
+        "stats": {
+            "category_count": stats["category_count"],
+            "leaf_count": stats["leaf_count"],
+            "entry_count": stats["entry_count"],
+            "allocation_count": stats["allocation_count"],
+        }
+        if stats
+        else None,
+        "tags": _tag_bundle_dict(data.get("tags")),
+    }
+
+
+def _item_project_to_dict(data: dict) -> dict:
+    return {
+        "id": data["id"],
+        "name": data["name"],
+        "budget_id": data["budget_id"],
+        "description": data.get("description"),
+        "legacy_portfolio_id": data.get("legacy_portfolio_id"),
+        "created_at": data.get("created_at"),
+        "updated_at": data.get("updated_at"),
+        "rollup_amount": data.get("rollup_amount", 0.0),
+        "tags": _tag_bundle_dict(data.get("tags")),
+        "assets": _asset_list_dict(data.get("assets")),
+    }
+
+
+def _category_to_dict(data: dict) -> dict:
+    return {
+        "id": data["id"],
+        "name": data["name"],
+        "parent_id": data.get("parent_id"),
+        "project_id": data["project_id"],
+        "budget_id": data["budget_id"],
+        "is_leaf": data["is_leaf"],
+        "amount_leaf": data.get("amount_leaf"),
+        "rollup_amount": data.get("rollup_amount"),
+        "path_depth": data.get("path_depth"),
+        "path_ids": _arr(data.get("path_ids")),
+        "path_names": _arr(data.get("path_names")),
+        "created_at": data.get("created_at"),
+        "updated_at": data.get("updated_at"),
+        "tags": _tag_bundle_dict(data.get("tags")),
+    }
+
+
+def _tree_node_to_dict(data: dict) -> dict:
+    return {
+        "id": data["id"],
+        "type": data["type"],
+        "name": data["name"],
+        "depth": data["depth"],
+        "is_leaf": data["is_leaf"],
+        "amount_leaf": data.get("amount_leaf"),
+        "rollup_amount": data.get("rollup_amount"),
+        "project_id": data.get("project_id"),
+        "budget_id": data.get("budget_id"),
+        "parent_id": data.get("parent_id"),
+        "path_ids": _arr(data.get("path_ids")),
+        "path_names": _arr(data.get("path_names")),
+        "tags": _tag_bundle_dict(data.get("tags")),
+        "assets": _asset_list_dict(data.get("assets")),
+        "created_at": data.get("created_at"),
+        "updated_at": data.get("updated_at"),
+    }
+
+
+def _line_asset_to_dict(data: dict) -> dict:
+    return {
+        "id": data["id"],
+        "name": data["name"],
+        "created_at": data.get("created_at"),
+        "updated_at": data.get("updated_at"),
+    }
+
+
+def _tag_usage_to_dict(item: dict) -> dict:
+    tag_data = item["tag"]
+    return {
+        "tag": {
+            "id": tag_data["id"],
+            "name": tag_data["name"],
+            "color": tag_data.get("color"),
+            "description": tag_data.get("description"),
+            "is_deprecated": tag_data.get("is_deprecated", False),
+            "created_at": tag_data.get("created_at"),
+            "updated_at": tag_data.get("updated_at"),
+        },
+        "assignments": item["assignments"],
+    }
+
+
+# Write routes return Pydantic schemas. Their inputs are the same trusted
+# service dicts, so the schemas are assembled with model_construct (nested
+# models included) rather than validated field by field.
 
 
-def _item_project_to_schema(data: dict) -> schemas.ItemProjectOut:
-    return schemas.ItemProjectOut(
-        id=data["id"],
-        name=data["name"],
-        budget_id=data["budget_id"],
-        description=data.get("description"),
-        legacy_portfolio_id=data.get("legacy_portfolio_id"),
-        created_at=_dt(data.get("created_at")),
-        updated_at=_dt(data.get("updated_at")),
-        rollup_amount=data.get("rollup_amount", 0.0),
-        tags=_tag_bundle_schema(data.get("tags")),
-        assets=_asset_list_schema(data.get("assets")),
+def _tag_bundle_schema(bundle: Optional[dict]) -> Optional[schemas.TagBundleOut]:
+    if bundle is None:
+        return None
+    return schemas.TagBundleOut.model_construct(
+        **{key: [schemas.TagRef.model_construct(**ref) for ref in refs] for key, refs in bundle.items()}
     )
 
 
-def _category_to_schema(data: dict) -> schemas.CategoryOut:
-    return schemas.CategoryOut(
-        id=data["id"],
-        name=data["name"],
-        parent_id=data.get("parent_id"),
-        project_id=data["project_id"],
-        budget_id=data["budget_id"],
-        is_leaf=data["is_leaf"],
-        amount_leaf=data.get("amount_leaf"),
-        rollup_amount=data.get("rollup_amount"),
-        path_depth=data.get("path_depth"),
-        path_ids=_arr(data.get("path_ids")),
-        path_names=_arr(data.get("path_names")),
-        created_at=_dt(data.get("created_at")),
-        updated_at=_dt(data.get("updated_at")),
-        tags=_tag_bundle_schema(data.get("tags")),
+def _asset_list_schema(assets: Optional[dict]) -> Optional[schemas.AssetListOut]:
+    if assets is None:
+        return None
+    return schemas.AssetListOut.model_construct(
+        count=assets["count"],
+        items=[schemas.LineAssetSummary.model_construct(**item) for item in assets["items"]],
     )
 
 
-def _tree_node_to_schema(data: dict) -> schemas.FundingTreeNode:
-    return schemas.FundingTreeNode(
-        id=data["id"],
-        type=data["type"],
-        name=data["name"],
-        depth=data["depth"],
-        is_leaf=data["is_leaf"],
-        amount_leaf=data.get("amount_leaf"),
-        rollup_amount=data.get("rollup_amount"),
-        project_id=data.get("project_id"),
-        budget_id=data.get("budget_id"),
-        parent_id=data.get("parent_id"),
-        path_ids=_arr(data.get("path_ids")),
-        path_names=_arr(data.get("path_names")),
-        tags=_tag_bundle_schema(data.get("tags")),
-        assets=_asset_list_schema(data.get("assets")),
-        created_at=_dt(data.get("created_at")),
-        updated_at=_dt(data.get("updated_at")),
-    )
+def _budget_to_schema(data: dict) -> schemas.BudgetOut:
+    fields = _isoformat_fields(_budget_to_dict(data))
+    stats = fields["stats"]
+    fields["stats"] = schemas.BudgetStatsOut.model_construct(**stats) if stats else None
+    fields["tags"] = _tag_bundle_schema(fields["tags"])
+    return schemas.BudgetOut.model_construct(**fields)
+
+
+def _item_project_to_schema(data: dict) -> schemas.ItemProjectOut:
+    fields = _isoformat_fields(_item_project_to_dict(data))
+    fields["tags"] = _tag_bundle_schema(fields["tags"])
+    fields["assets"] = _asset_list_schema(fields["assets"])
+    return schemas.ItemProjectOut.model_construct(**fields)
+
+
+def _category_to_schema(data: dict) -> schemas.CategoryOut:
+    fields = _isoformat_fields(_category_to_dict(data))
+    fields["tags"] = _tag_bundle_schema(fields["tags"])
+    return schemas.CategoryOut.model_construct(**fields)
 
 
 def _line_asset_to_schema(data: dict) -> schemas.LineAssetOut:
-    return schemas.LineAssetOut(
-        id=data["id"],
-        name=data["name"],
-        created_at=_dt(data.get("created_at")),
-        updated_at=_dt(data.get("updated_at")),
-    )
+    return schemas.LineAssetOut.model_construct(**_isoformat_fields(_line_asset_to_dict(data)))
 
 
 def _job_to_schema(job: models.BackgroundJob) -> schemas.BackgroundJobOut:
-    return schemas.BackgroundJobOut(
+    return schemas.BackgroundJobOut.model_construct(
         id=job.id,
         kind=job.kind,
         status=job.status,
@@ -183,6 +279,40 @@ def _job_to_schema(job: models.BackgroundJob) -> schemas.BackgroundJobOut:
     )
 
 
+def _encode_with_etag(payload: Any) -> tuple[bytes, str]:
+    body = orjson.dumps(payload)
+    return body, '"%s"' % hashlib.blake2b(body, digest_size=16).hexdigest()
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not isinstance(if_none_match, str):  # Header default when called directly
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+def _cached_json(
+    db: Session,
+    key: tuple,
+    build: Callable[[], Any],
+    if_none_match: Optional[str] = None,
+) -> Response:
+    """Serve ``build()`` as JSON, reusing the encoded body while the query cache holds it.
+
+    The body carries an ETag; a matching ``If-None-Match`` gets an empty 304.
+    The ETag is derived from the cached bytes, so it is only as fresh as the
+    cache: see :mod:`backend.query_cache` for what invalidates an entry.
+    """
+    body, etag = query_cache.get_or_compute(db, key, lambda: _encode_with_etag(build()))
+    headers = {"ETag": etag}
+    if _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
 def _raise_service_error(exc: funding.FundingServiceError) -> None:
     status = _ERROR_STATUS_MAP.get(exc.code, 400)
     raise HTTPException(status_code=status, detail={"code": exc.code, "message": str(exc)})
@@ -195,10 +325,12 @@ def api_list_budgets(
     owner: Optional[str] = Query(default=None),
     ids: Optional[List[int]] = Query(default=None),
     include: Optional[str] = Query(default=None),
+    if_none_match: Optional[str] = Header(default=None),
     db: Session = Depends(get_db),
 ):
     include_set = _parse_include(include)
-    try:
+
+    def build() -> list:
         records = funding.list_budgets(
             db,
             q=q,
@@ -207,23 +339,32 @@ def api_list_budgets(
             ids=ids,
             include=include_set,
         )
+        return [_budget_to_dict(record) for record in records]
+
+    key = ("budgets", q, is_cost_center, owner, tuple(ids or ()), include_set)
+    try:
+        return _cached_json(db, key, build, if_none_match)
     except funding.FundingServiceError as exc:
         _raise_service_error(exc)
-    return [_budget_to_schema(record) for record in records]
 
 
 @router.get("/budgets/{budget_id}", response_model=schemas.BudgetOut)
 def api_get_budget(
     budget_id: int,
     include: Optional[str] = Query(default=None),
+    if_none_match: Optional[str] = Header(default=None),
     db: Session = Depends(get_db),
 ):
     include_set = _parse_include(include)
     try:
-        record = funding.get_budget(db, budget_id, include=include_set)
+        return _cached_json(
+            db,
+            ("budget", budget_id, include_set),
+            lambda: _budget_to_dict(funding.get_budget(db, budget_id, include=include_set)),
+            if_none_match,
+        )
     except funding.FundingServiceError as exc:
         _raise_service_error(exc)
-    return _budget_to_schema(record)
 
 
 @router.post("/budgets", response_model=schemas.BudgetOut, status_code=201)
@@ -236,8 +377,7 @@ def api_create_budget(payload: schemas.BudgetCreate, db: Session = Depends(get_d
         closure_date=payload.closure_date,
         description=payload.description,
     )
-    record = funding.get_budget(db, budget.id, include=set())
-    return _budget_to_schema(record)
+    return _budget_to_schema(funding.budget_record(budget))
 
 
 @router.patch("/budgets/{budget_id}", response_model=schemas.BudgetOut)
@@ -247,7 +387,7 @@ def api_update_budget(
     db: Session = Depends(get_db),
 ):
     try:
-        funding.update_budget(
+        budget = funding.update_budget(
             db,
             budget_id,
             name=payload.name,
@@ -256,8 +396,7 @@ def api_update_budget(
             closure_date=payload.closure_date,
             description=payload.description,
         )
-        record = funding.get_budget(db, budget_id, include=set())
-        return _budget_to_schema(record)
+        return _budget_to_schema(funding.budget_record(budget))
     except funding.FundingServiceError as exc:
         _raise_service_error(exc)
 
@@ -277,10 +416,12 @@ def api_list_item_projects(
     q: Optional[str] = Query(default=None),
     ids: Optional[List[int]] = Query(default=None),
     include: Optional[str] = Query(default=None),
+    if_none_match: Optional[str] = Header(default=None),
     db: Session = Depends(get_db),
 ):
     include_set = _parse_include(include)
-    try:
+
+    def build() -> list:
         records = funding.list_item_projects(
             db,
             budget_id=budget_id,
@@ -288,23 +429,32 @@ def api_list_item_projects(
             ids=ids,
             include=include_set,
         )
+        return [_item_project_to_dict(record) for record in records]
+
+    key = ("item_projects", budget_id, q, tuple(ids or ()), include_set)
+    try:
+        return _cached_json(db, key, build, if_none_match)
     except funding.FundingServiceError as exc:
         _raise_service_error(exc)
-    return [_item_project_to_schema(record) for record in records]
 
 
 @router.get("/item-projects/{project_id}", response_model=schemas.ItemProjectOut)
 def api_get_item_project(
     project_id: int,
     include: Optional[str] = Query(default=None),
+    if_none_match: Optional[str] = Header(default=None),
     db: Session = Depends(get_db),
 ):
     include_set = _parse_include(include)
     try:
-        record = funding.get_item_project(db, project_id, include=include_set)
+        return _cached_json(
+            db,
+            ("item_project", project_id, include_set),
+            lambda: _item_project_to_dict(funding.get_item_project(db, project_id, include=include_set)),
+            if_none_match,
+        )
     except funding.FundingServiceError as exc:
         _raise_service_error(exc)
-    return _item_project_to_schema(record)
 
 
 @router.post("/item-projects", response_model=schemas.ItemProjectOut, status_code=201)
@@ -315,8 +465,7 @@ def api_create_item_project(payload: schemas.ItemProjectCreate, db: Session = De
         name=payload.name,
         description=payload.description,
     )
-    record = funding.get_item_project(db, project.id, include=set())
-    return _item_project_to_schema(record)
+    return _item_project_to_schema(funding.item_project_record(db, project))
 
 
 @router.patch("/item-projects/{project_id}", response_model=schemas.ItemProjectOut)
@@ -334,8 +483,7 @@ def api_update_item_project(
         )
     except funding.FundingServiceError as exc:
         _raise_service_error(exc)
-    record = funding.get_item_project(db, project.id, include=set())
-    return _item_project_to_schema(record)
+    return _item_project_to_schema(funding.item_project_record(db, project))
 
 
 @router.delete("/item-projects/{project_id}")
@@ -361,14 +509,7 @@ def api_attach_line_asset(
         asset = funding.add_line_asset_to_item_project(db, project_id, payload.line_asset_id)
     except funding.FundingServiceError as exc:
         _raise_service_error(exc)
-    return _line_asset_to_schema(
-        {
-            "id": asset.id,
-            "name": asset.name,
-            "created_at": asset.created_at,
-            "updated_at": asset.updated_at,
-        }
-    )
+    return _line_asset_to_schema(funding.line_asset_record(asset))
 
 
 @router.delete("/item-projects/{project_id}/line-assets/{line_asset_id}")
@@ -388,10 +529,12 @@ def api_list_categories(
     q: Optional[str] = Query(default=None),
     ids: Optional[List[int]] = Query(default=None),
     include: Optional[str] = Query(default=None),
+    if_none_match: Optional[str] = Header(default=None),
     db: Session = Depends(get_db),
 ):
     include_set = _parse_include(include)
-    try:
+
+    def build() -> list:
         records = funding.list_categories(
             db,
             budget_id=budget_id,
@@ -401,23 +544,32 @@ def api_list_categories(
             ids=ids,
             include=include_set,
         )
+        return [_category_to_dict(record) for record in records]
+
+    key = ("categories", budget_id, project_id, parent_id, q, tuple(ids or ()), include_set)
+    try:
+        return _cached_json(db, key, build, if_none_match)
     except funding.FundingServiceError as exc:
         _raise_service_error(exc)
-    return [_category_to_schema(record) for record in records]
 
 
 @router.get("/categories/{category_id}", response_model=schemas.CategoryOut)
 def api_get_category(
     category_id: int,
     include: Optional[str] = Query(default=None),
+    if_none_match: Optional[str] = Header(default=None),
     db: Session = Depends(get_db),
 ):
     include_set = _parse_include(include)
     try:
-        record = funding.get_category(db, category_id, include=include_set)
+        return _cached_json(
+            db,
+            ("category", category_id, include_set),
+            lambda: _category_to_dict(funding.get_category(db, category_id, include=include_set)),
+            if_none_match,
+        )
     except funding.FundingServiceError as exc:
         _raise_service_error(exc)
-    return _category_to_schema(record)
 
 
 @router.post("/categories", response_model=schemas.CategoryOut, status_code=201)
@@ -435,8 +587,7 @@ def api_create_category(payload: schemas.CategoryCreate, db: Session = Depends(g
         )
     except funding.FundingServiceError as exc:
         _raise_service_error(exc)
-    record = funding.get_category(db, category.id, include=set())
-    return _category_to_schema(record)
+    return _category_to_schema(funding.category_record(category))
 
 
 @router.patch("/categories/{category_id}", response_model=schemas.CategoryOut)
@@ -450,8 +601,7 @@ def api_update_category(
         category = funding.update_category(db, category_id, **updates)
     except funding.FundingServiceError as exc:
         _raise_service_error(exc)
-    record = funding.get_category(db, category.id, include=set())
-    return _category_to_schema(record)
+    return _category_to_schema(funding.category_record(category))
 
 
 @router.delete("/categories/{category_id}")
@@ -481,14 +631,19 @@ def api_budget_tree(
     budget_id: int,
     project_id: Optional[int] = Query(default=None),
     include: Optional[str] = Query(default=None),
+    if_none_match: Optional[str] = Header(default=None),
     db: Session = Depends(get_db),
 ):
     include_set = _parse_include(include)
-    try:
+
+    def build() -> list:
         nodes = funding.budget_tree(db, budget_id, project_id=project_id, include=include_set)
+        return [_tree_node_to_dict(node) for node in nodes]
+
+    try:
+        return _cached_json(db, ("budget_tree", budget_id, project_id, include_set), build, if_none_match)
     except funding.FundingServiceError as exc:
         _raise_service_error(exc)
-    return [_tree_node_to_schema(node) for node in nodes]
 
 
 @router.get("/line-assets", response_model=List[schemas.LineAssetOut])
@@ -509,18 +664,13 @@ def api_list_line_assets(
         )
     except funding.FundingServiceError as exc:
         _raise_service_error(exc)
-    return [_line_asset_to_schema(asset) for asset in assets]
+    return ORJSONResponse([_line_asset_to_dict(asset) for asset in assets])
 
 
 @router.post("/line-assets", response_model=schemas.LineAssetOut, status_code=201)
 def api_create_line_asset(payload: schemas.LineAssetCreate, db: Session = Depends(get_db)):
     asset = funding.create_line_asset(db, name=payload.name)
-    return _line_asset_to_schema({
-        "id": asset.id,
-        "name": asset.name,
-        "created_at": asset.created_at,
-        "updated_at": asset.updated_at,
-    })
+    return _line_asset_to_schema(funding.line_asset_record(asset))
 
 
 @router.patch("/line-assets/{line_asset_id}", response_model=schemas.LineAssetOut)
@@ -529,12 +679,7 @@ def api_update_line_asset(line_asset_id: int, payload: schemas.LineAssetUpdate,
         asset = funding.update_line_asset(db, line_asset_id, name=payload.name)
     except funding.FundingServiceError as exc:
         _raise_service_error(exc)
-    return _line_asset_to_schema({
-        "id": asset.id,
-        "name": asset.name,
-        "created_at": asset.created_at,
-        "updated_at": asset.updated_at,
-    })
+    return _line_asset_to_schema(funding.line_asset_record(asset))
 
 
 @router.delete("/line-assets/{line_asset_id}")
@@ -547,22 +692,16 @@ def api_delete_line_asset(line_asset_id: int, db: Session = Depends(get_db)):
 
 
 @router.get("/tags/usage", response_model=List[schemas.TagUsageOut])
-def api_tag_usage(db: Session = Depends(get_db)):
-    usages = tag_service.get_usage(db)
-    results: List[schemas.TagUsageOut] = []
-    for item in usages:
-        tag_data = item["tag"]
-        tag_schema = schemas.TagOut(
-            id=tag_data["id"],
-            name=tag_data["name"],
-            color=tag_data.get("color"),
-            description=tag_data.get("description"),
-            is_deprecated=tag_data.get("is_deprecated", False),
-            created_at=tag_data.get("created_at"),
-            updated_at=tag_data.get("updated_at"),
-        )
-        results.append(schemas.TagUsageOut(tag=tag_schema, assignments=item["assignments"]))
-    return results
+def api_tag_usage(
+    if_none_match: Optional[str] = Header(default=None),
+    db: Session = Depends(get_db),
+):
+    return _cached_json(
+        db,
+        ("tag_usage",),
+        lambda: [_tag_usage_to_dict(item) for item in tag_service.get_usage(db)],
+        if_none_match,
+    )
 
 
 @router.post("/admin/rebuild-effective-tags", response_model=schemas.BackgroundJobOut)
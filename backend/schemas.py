@@ -1,5 +1,11 @@
+from decimal import Decimal
 from typing import Optional, List, Dict
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field
+
+NAME_MAX_LENGTH = 200
+
+# Models with defer_build=True are not used by any route, script or other
+# used model; pydantic builds their schema on first use instead of at import.
 
 # ---- Portfolios ----
 class PortfolioIn(BaseModel):
@@ -14,7 +20,7 @@ class PortfolioIn(BaseModel):
 
 class PortfolioOut(PortfolioIn):
     id: int
-    model_config = ConfigDict(from_attributes=True)
+    model_config = ConfigDict(from_attributes=True, defer_build=True)
 
 # ---- Projects ----
 class ProjectIn(BaseModel):
@@ -29,7 +35,7 @@ class ProjectIn(BaseModel):
 
 class ProjectOut(ProjectIn):
     id: int
-    model_config = ConfigDict(from_attributes=True)
+    model_config = ConfigDict(from_attributes=True, defer_build=True)
 
 # ---- Categories (n-level) ----
 class CategoryIn(BaseModel):
@@ -41,10 +47,7 @@ class CategoryIn(BaseModel):
     description: Optional[str] = None
     amount_leaf: Optional[float] = None
     is_leaf: Optional[bool] = None
-
-class CategoryOut(CategoryIn):
-    id: int
-    model_config = ConfigDict(from_attributes=True)
+    model_config = ConfigDict(defer_build=True)
 
 # ---- Vendors ----
 class VendorIn(BaseModel):
@@ -52,7 +55,7 @@ class VendorIn(BaseModel):
 
 class VendorOut(VendorIn):
     id: int
-    model_config = ConfigDict(from_attributes=True)
+    model_config = ConfigDict(from_attributes=True, defer_build=True)
 
 # ---- Allocations ----
 class AllocationIn(BaseModel):
@@ -184,7 +187,7 @@ class BudgetOut(BaseModel):
 
 
 class BudgetCreate(BaseModel):
-    name: str
+    name: str = Field(min_length=1, max_length=NAME_MAX_LENGTH)
     owner: Optional[str] = None
     is_cost_center: bool = False
     closure_date: Optional[str] = None
@@ -192,7 +195,7 @@ class BudgetCreate(BaseModel):
 
 
 class BudgetUpdate(BaseModel):
-    name: Optional[str] = None
+    name: Optional[str] = Field(default=None, min_length=1, max_length=NAME_MAX_LENGTH)
     owner: Optional[str] = None
     is_cost_center: Optional[bool] = None
     closure_date: Optional[str] = None
@@ -226,12 +229,12 @@ class ItemProjectOut(BaseModel):
 
 class ItemProjectCreate(BaseModel):
     budget_id: int
-    name: str
+    name: str = Field(min_length=1, max_length=NAME_MAX_LENGTH)
     description: Optional[str] = None
 
 
 class ItemProjectUpdate(BaseModel):
-    name: Optional[str] = None
+    name: Optional[str] = Field(default=None, min_length=1, max_length=NAME_MAX_LENGTH)
     description: Optional[str] = None
 
 
@@ -254,7 +257,7 @@ class CategoryOut(BaseModel):
 
 
 class CategoryCreate(BaseModel):
-    name: str
+    name: str = Field(min_length=1, max_length=NAME_MAX_LENGTH)
     project_id: int
     budget_id: int
     parent_id: Optional[int] = None
@@ -264,7 +267,7 @@ class CategoryCreate(BaseModel):
 
 
 class CategoryUpdate(BaseModel):
-    name: Optional[str] = None
+    name: Optional[str] = Field(default=None, min_length=1, max_length=NAME_MAX_LENGTH)
     description: Optional[str] = None
     parent_id: Optional[int] = None
     project_id: Optional[int] = None
@@ -288,11 +291,11 @@ class LineAssetOut(BaseModel):
 
 
 class LineAssetCreate(BaseModel):
-    name: str
+    name: str = Field(min_length=1, max_length=NAME_MAX_LENGTH)
 
 
 class LineAssetUpdate(BaseModel):
-    name: str
+    name: str = Field(min_length=1, max_length=NAME_MAX_LENGTH)
 
 
 class ItemProjectAssetLink(BaseModel):
@@ -325,7 +328,7 @@ class JournalPostingIn(BaseModel):
     budget_id: Optional[int] = None
     item_project_id: Optional[int] = None
     category_id: Optional[int] = None
-    amount: float
+    amount: Decimal
     currency: Optional[str] = "USD"
 
 
@@ -339,6 +342,7 @@ class JournalEntryIn(BaseModel):
 class JournalPostingOut(JournalPostingIn):
     id: int
     journal_id: int
+    amount: float
     created_at: Optional[str] = None
     model_config = ConfigDict(from_attributes=True)
 
@@ -392,7 +396,7 @@ class EntryIn(BaseModel):
 
 class EntryOut(EntryIn):
     id: int
-    model_config = ConfigDict(from_attributes=True)
+    model_config = ConfigDict(from_attributes=True, defer_build=True)
 
 # ---- Comments ----
 class CommentIn(BaseModel):
@@ -403,4 +407,4 @@ class CommentIn(BaseModel):
 
 class CommentOut(CommentIn):
     id: int
-    model_config = ConfigDict(from_attributes=True)
+    model_config = ConfigDict(from_attributes=True, defer_build=True)
@@ -3,9 +3,27 @@ from __future__ import annotations
 
 from datetime import date, datetime
 from decimal import Decimal
-from typing import List, Optional, Literal
+from typing import Annotated, Any, List, Optional, Literal
+from uuid import UUID
 
-from pydantic import BaseModel, ConfigDict, Field, field_validator
+from pydantic import AfterValidator, BaseModel, ConfigDict, Field, field_validator
+
+# The quote and fulfillment-lot models set defer_build=True: no route or
+# script uses them, so their schemas are built lazily rather than at import.
+
+
+def _scaled(scale: int) -> Any:
+    quantum = Decimal(1).scaleb(-scale)
+    return Annotated[Decimal, AfterValidator(lambda value: value.quantize(quantum))]
+
+
+# Finance writes return rows without reloading them, so Out models give
+# Numeric fields their column scale: a submitted 1.0 serializes as the
+# "1.00000000" a fresh read of the row would return.
+_Numeric3 = _scaled(3)
+_Numeric4 = _scaled(4)
+_Numeric6 = _scaled(6)
+_Numeric8 = _scaled(8)
 
 
 class FundingSourceIn(BaseModel):
@@ -29,9 +47,15 @@ class QuoteLineIn(BaseModel):
     description: str
     quantity: Decimal = Decimal("0")
     unit_cost: Optional[Decimal] = None
-    amount: Optional[Decimal] = None
     category_id: Optional[int] = None
     expected_date: Optional[date] = None
+    model_config = ConfigDict(defer_build=True)
+
+
+class QuoteLineOut(QuoteLineIn):
+    id: int
+    amount: Optional[Decimal] = None
+    model_config = ConfigDict(from_attributes=True, defer_build=True)
 
 
 class QuoteIn(BaseModel):
@@ -46,21 +70,34 @@ class QuoteIn(BaseModel):
     amount_usd: Optional[Decimal] = None
     memo: Optional[str] = None
     lines: List[QuoteLineIn] = Field(default_factory=list)
+    model_config = ConfigDict(defer_build=True)
 
 
 class QuoteOut(QuoteIn):
     id: int
-    model_config = ConfigDict(from_attributes=True)
+    lines: List[QuoteLineOut] = Field(default_factory=list)
+    model_config = ConfigDict(from_attributes=True, defer_build=True)
 
 
 class POLineIn(BaseModel):
+    id: Optional[int] = None
     description: str
     quantity: Decimal = Decimal("0")
     unit_price: Optional[Decimal] = None
-    amount: Optional[Decimal] = None
     category_id: Optional[int] = None
     deliverable_desc: Optional[str] = None
     quote_line_id: Optional[int] = None
+    # amount is computed by the database from quantity * unit_price; a
+    # client-sent amount (e.g. a lump-sum line) is rejected, not dropped.
+    model_config = ConfigDict(extra="forbid")
+
+
+class POLineOut(POLineIn):
+    id: int
+    quantity: _Numeric4 = Decimal("0")
+    unit_price: Optional[_Numeric6] = None
+    amount: Optional[_Numeric6] = None
+    model_config = ConfigDict(from_attributes=True, extra="ignore")
 
 
 class PurchaseOrderIn(BaseModel):
@@ -80,16 +117,29 @@ class PurchaseOrderIn(BaseModel):
 
 class PurchaseOrderOut(PurchaseOrderIn):
     id: int
+    fx_rate_to_usd: _Numeric8 = Decimal("1.0")
+    total_amount: Optional[_Numeric6] = None
+    amount_usd: Optional[_Numeric6] = None
+    lines: List[POLineOut] = Field(default_factory=list)
     model_config = ConfigDict(from_attributes=True)
 
 
 class InvoiceLineIn(BaseModel):
+    id: Optional[int] = None
     description: str
     quantity: Decimal = Decimal("0")
     unit_price: Optional[Decimal] = None
-    amount: Optional[Decimal] = None
     category_id: Optional[int] = None
     po_line_id: Optional[int] = None
+    model_config = ConfigDict(extra="forbid")
+
+
+class InvoiceLineOut(InvoiceLineIn):
+    id: int
+    quantity: _Numeric4 = Decimal("0")
+    unit_price: Optional[_Numeric6] = None
+    amount: Optional[_Numeric6] = None
+    model_config = ConfigDict(from_attributes=True, extra="ignore")
 
 
 class InvoiceIn(BaseModel):
@@ -106,8 +156,39 @@ class InvoiceIn(BaseModel):
     lines: List[InvoiceLineIn] = Field(default_factory=list)
 
 
+class InvoiceUpdateIn(BaseModel):
+    purchase_order_id: Optional[int] = None
+    vendor_id: Optional[int] = None
+    invoice_number: Optional[str] = None
+    invoice_date: Optional[date] = None
+    currency: Optional[str] = None
+    fx_rate_to_usd: Optional[Decimal] = None
+    total_amount: Optional[Decimal] = None
+    amount_usd: Optional[Decimal] = None
+    status: Optional[str] = None
+    memo: Optional[str] = None
+    lines: Optional[List[InvoiceLineIn]] = None
+
+
 class InvoiceOut(InvoiceIn):
     id: int
+    fx_rate_to_usd: _Numeric8 = Decimal("1.0")
+    total_amount: Optional[_Numeric6] = None
+    amount_usd: Optional[_Numeric6] = None
+    lines: List[InvoiceLineOut] = Field(default_factory=list)
+    model_config = ConfigDict(from_attributes=True)
+
+
+class InvoiceListOut(BaseModel):
+    id: int
+    purchase_order_id: Optional[int] = None
+    vendor_id: Optional[int] = None
+    invoice_number: str
+    invoice_date: Optional[date] = None
+    currency: str
+    total_amount: Optional[Decimal] = None
+    amount_usd: Optional[Decimal] = None
+    status: str
     model_config = ConfigDict(from_attributes=True)
 
 
@@ -124,6 +205,7 @@ class FulfillmentLotIn(BaseModel):
     lot_identifier: Optional[str] = None
     notes: Optional[str] = None
     milestones: List[MilestoneIn] = Field(default_factory=list)
+    model_config = ConfigDict(defer_build=True)
 
 
 class MilestoneOut(MilestoneIn):
@@ -134,7 +216,7 @@ class MilestoneOut(MilestoneIn):
 class FulfillmentLotOut(FulfillmentLotIn):
     id: int
     milestones: List[MilestoneOut]
-    model_config = ConfigDict(from_attributes=True)
+    model_config = ConfigDict(from_attributes=True, defer_build=True)
 
 
 class PaymentScheduleIn(BaseModel):
@@ -147,11 +229,13 @@ class PaymentScheduleIn(BaseModel):
     event_type: Optional[str] = None
     due_date: Optional[date] = None
     status: str = "PLANNED"
-    paid_transaction_id: Optional[str] = None
+    paid_transaction_id: Optional[UUID] = None
 
 
 class PaymentScheduleOut(PaymentScheduleIn):
     id: int
+    percent: Optional[_Numeric3] = None
+    amount: Optional[_Numeric6] = None
     model_config = ConfigDict(from_attributes=True)
 
 
@@ -208,6 +292,7 @@ class FxRateIn(BaseModel):
 
 class FxRateOut(FxRateIn):
     id: int
+    rate: _Numeric8
     base_currency: str
     model_config = ConfigDict(from_attributes=True)
 
@@ -266,7 +351,7 @@ class ReportRunIn(BaseModel):
 
 
 class ReallocateRequest(BaseModel):
-    transaction_id: str
+    transaction_id: UUID
     target_funding_source_id: int
     amount: Decimal
     memo: str
@@ -9,6 +9,7 @@ from __future__ import annotations
 
 import argparse
 import datetime as dt
+import uuid
 from collections import defaultdict
 from decimal import Decimal
 from typing import Iterable
@@ -20,15 +21,27 @@ from backend.db import SessionLocal
 from backend import models, models_finance
 from backend.sql.views import apply_views
 
-KIND_TO_STATE = {
+_DEFAULT_STATE = ("ACCRUAL", "JOURNAL")
+
+
+class _KindMap(dict):
+    """Kind lookup that falls back to ``_DEFAULT_STATE`` for unknown kinds."""
+
+    def __missing__(self, kind):
+        return _DEFAULT_STATE
+
+
+KIND_TO_STATE = _KindMap({
     "budget": ("FORECAST", "QUOTE"),
     "quote": ("FORECAST", "QUOTE"),
     "po": ("COMMITMENT", "PO"),
     "unplanned": ("ACCRUAL", "INVOICE"),
     "adjustment": ("JOURNAL", "JOURNAL"),
-}
+})
 
 DEFAULT_CURRENCY = "USD"
+BATCH_SIZE = 1000
+_QUANT_USD = Decimal("0.000001")
 
 
 def ensure_fx_rate(session: Session, currency: str, txn_date: dt.date) -> models_finance.FxRate:
@@ -47,7 +60,16 @@ def ensure_fx_rate(session: Session, currency: str, txn_date: dt.date) -> models
 
 
 def compute_amount_usd(rate: models_finance.FxRate, amount: Decimal) -> Decimal:
-    return (Decimal(amount) * Decimal(rate.rate)).quantize(Decimal("0.000001"))
+    # rate.rate is a Numeric column, so it is already a Decimal.
+    return (amount * rate.rate).quantize(_QUANT_USD)
+
+
+def _insert_batch(session: Session, txn_rows: list[dict], event_rows: list[dict]) -> None:
+    if txn_rows:
+        session.bulk_insert_mappings(models_finance.Transaction, txn_rows)
+        session.bulk_insert_mappings(models_finance.Event, event_rows)
+    txn_rows.clear()
+    event_rows.clear()
 
 
 def backfill_transactions(session: Session, *, dry_run: bool = False) -> dict[str, int]:
@@ -73,8 +95,43 @@ def backfill_transactions(session: Session, *, dry_run: bool = False) -> dict[st
             legacy_to_fs[portfolio.id] = fs
             summary["funding_sources_created"] += 1
 
-    for entry in session.execute(select(models.Entry)).scalars():
-        state, source_type = KIND_TO_STATE.get(entry.kind, ("ACCRUAL", "JOURNAL"))
+    tags_by_entry: dict[int, list[str]] = defaultdict(list)
+    for entry_id, tag_name in session.execute(
+        select(models.EntryTag.entry_id, models.Tag.name)
+        .join(models.Tag, models.Tag.id == models.EntryTag.tag_id)
+        .order_by(models.EntryTag.entry_id, models.EntryTag.tag_id)
+    ):
+        tags_by_entry[entry_id].append(tag_name)
+
+    existing_sources = set(
+        session.execute(
+            select(models_finance.Transaction.source_type, models_finance.Transaction.source_id)
+        ).tuples()
+    )
+
+    entries = session.execute(
+        select(
+            models.Entry.id,
+            models.Entry.kind,
+            models.Entry.date,
+            models.Entry.amount,
+            models.Entry.description,
+            models.Entry.portfolio_id,
+            models.Entry.project_id,
+            models.Entry.category_id,
+            models.Entry.vendor_id,
+        ).execution_options(yield_per=BATCH_SIZE)
+    )
+    now = dt.datetime.now(dt.timezone.utc)
+    rate_cache: dict[tuple[str, dt.date], models_finance.FxRate] = {}
+    txn_rows: list[dict] = []
+    event_rows: list[dict] = []
+    created = skipped = 0
+    for entry in entries:
+        state, source_type = KIND_TO_STATE[entry.kind]
+        if (source_type, str(entry.id)) in existing_sources:
+            skipped += 1
+            continue
         funding_source = legacy_to_fs.get(entry.portfolio_id)
         if not funding_source:
             funding_source = models_finance.FundingSource.ensure(
@@ -84,51 +141,53 @@ def backfill_transactions(session: Session, *, dry_run: bool = False) -> dict[st
                 is_temporary=True,
                 legacy_portfolio_id=entry.portfolio_id,
             )
+            legacy_to_fs[entry.portfolio_id] = funding_source
         txn_date = entry.date or dt.date.today()
-        rate = ensure_fx_rate(session, DEFAULT_CURRENCY, txn_date)
-        usd_amount = compute_amount_usd(rate, Decimal(entry.amount))
-        existing = session.execute(
-            select(models_finance.Transaction).where(
-                models_finance.Transaction.source_type == source_type,
-                models_finance.Transaction.source_id == str(entry.id),
-            )
-        ).scalar_one_or_none()
-        if existing:
-            summary["transactions_skipped"] += 1
-            continue
-        txn = models_finance.Transaction(
-            funding_source=funding_source,
-            project_id=entry.project_id,
-            category_id=entry.category_id,
-            vendor_id=entry.vendor_id,
-            state=state,
-            source_type=source_type,
-            source_id=str(entry.id),
-            amount_txn=Decimal(entry.amount),
-            currency=DEFAULT_CURRENCY,
-            fx_rate_to_usd=rate.rate,
-            amount_usd=usd_amount,
-            txn_date=txn_date,
-            memo=entry.description,
-            tags=[tag.name for tag in session.execute(
-                select(models.Tag).join(models.EntryTag, models.EntryTag.tag_id == models.Tag.id).where(
-                    models.EntryTag.entry_id == entry.id
-                )
-            ).scalars()],
-        )
-        session.add(txn)
-        summary["transactions_created"] += 1
-
-        event = models_finance.Event(
-            entity_type="transaction",
-            entity_id=txn.id,
-            event_type="backfill_created",
-            at=dt.datetime.now(dt.timezone.utc),
-            by="system",
-            payload_json={"entry_id": entry.id, "kind": entry.kind},
-        )
-        session.add(event)
-        summary["events_created"] += 1
+        rate_key = (DEFAULT_CURRENCY, txn_date)
+        rate = rate_cache.get(rate_key)
+        if rate is None:
+            rate = rate_cache[rate_key] = ensure_fx_rate(session, DEFAULT_CURRENCY, txn_date)
+        amount = Decimal(entry.amount)
+        usd_amount = compute_amount_usd(rate, amount)
+        # Transaction ids are client-side UUIDs, so the event can reference
+        # the row before it is inserted.
+        txn_id = uuid.uuid4()
+        txn_rows.append({
+            "id": txn_id,
+            "funding_source_id": funding_source.id,
+            "project_id": entry.project_id,
+            "category_id": entry.category_id,
+            "vendor_id": entry.vendor_id,
+            "state": state,
+            "source_type": source_type,
+            "source_id": str(entry.id),
+            "amount_txn": amount,
+            "currency": DEFAULT_CURRENCY,
+            "fx_rate_to_usd": rate.rate,
+            "amount_usd": usd_amount,
+            "txn_date": txn_date,
+            "memo": entry.description,
+            "tags": tags_by_entry.get(entry.id, []),
+        })
+        event_rows.append({
+            "entity_type": "transaction",
+            "entity_id": str(txn_id),
+            "event_type": "backfill_created",
+            "at": now,
+            "by": "system",
+            "payload_json": {"entry_id": entry.id, "kind": entry.kind},
+        })
+        created += 1
+        if len(txn_rows) >= BATCH_SIZE:
+            _insert_batch(session, txn_rows, event_rows)
+    _insert_batch(session, txn_rows, event_rows)
+    # Every created transaction gets exactly one event. Zero counts stay out
+    # of the summary, matching the defaultdict it reports through.
+    if created:
+        summary["transactions_created"] += created
+        summary["events_created"] += created
+    if skipped:
+        summary["transactions_skipped"] += skipped
 
     if dry_run:
         session.rollback()
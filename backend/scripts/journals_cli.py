@@ -1,31 +1,46 @@
 from __future__ import annotations
 
 import argparse
-from decimal import Decimal
-from typing import List
+from decimal import ROUND_HALF_EVEN, Decimal, InvalidOperation
 
 from backend.db import SessionLocal
 from backend import schemas
 from backend.main import _create_journal, _serialize_journal
 
 
-def _print_journal(journal: schemas.JournalEntryOut) -> None:
-    data = journal.model_dump()
-    postings: List[dict] = data.pop("postings", [])
+def _cents(value: str) -> int:
+    # Postings are stored as Numeric(18, 2), so whole cents are exact.
+    try:
+        return int((Decimal(value) * 100).to_integral_value(ROUND_HALF_EVEN))
+    except (InvalidOperation, ValueError, OverflowError):
+        raise argparse.ArgumentTypeError(f"invalid amount: {value!r}") from None
+
+
+def _from_cents(cents: int) -> Decimal:
+    # Postings are built with model_construct, so the exact Decimal reaches
+    # _create_journal without a float hop.
+    return Decimal(cents).scaleb(-2)
+
+
+def _print_journal(journal: schemas.JournalEntryOut, *, as_json: bool = False) -> None:
+    if as_json:
+        print(journal.model_dump_json(indent=2))
+        return
     print("Journal:")
-    for key, value in data.items():
-        print(f"  {key}: {value}")
-    if postings:
+    for name in schemas.JournalEntryOut.model_fields:
+        if name != "postings":
+            print(f"  {name}: {getattr(journal, name)}")
+    if journal.postings:
         print("  postings:")
-        for posting in postings:
-            print("    -", posting)
+        for posting in journal.postings:
+            print("    -", posting.model_dump())
 
 
 def cmd_reallocate(args: argparse.Namespace) -> None:
-    amount = Decimal(str(args.amount))
+    # argparse has already typed every field, so postings skip validation.
     postings = [
-        schemas.JournalPostingIn(allocation_id=args.from_allocation_id, amount=float(-amount), currency=args.currency),
-        schemas.JournalPostingIn(allocation_id=args.to_allocation_id, amount=float(amount), currency=args.currency),
+        schemas.JournalPostingIn.model_construct(allocation_id=args.from_allocation_id, amount=_from_cents(-args.amount), currency=args.currency),
+        schemas.JournalPostingIn.model_construct(allocation_id=args.to_allocation_id, amount=_from_cents(args.amount), currency=args.currency),
     ]
     with SessionLocal() as db:
         journal = _create_journal(
@@ -35,19 +50,21 @@ def cmd_reallocate(args: argparse.Namespace) -> None:
             created_by=args.actor,
             postings=postings,
         )
-        _print_journal(_serialize_journal(journal))
+        _print_journal(_serialize_journal(journal), as_json=args.json)
 
 
 def cmd_adjust(args: argparse.Namespace) -> None:
+    if sum(args.amount) != 0:
+        raise SystemExit("adjustment amounts must net to zero")
     postings = []
     for amount in args.amount:
         postings.append(
-            schemas.JournalPostingIn(
+            schemas.JournalPostingIn.model_construct(
                 allocation_id=None,
                 budget_id=args.budget_id,
                 item_project_id=args.item_project_id,
                 category_id=args.category_id,
-                amount=float(amount),
+                amount=_from_cents(amount),
                 currency=args.currency,
             )
         )
@@ -59,17 +76,18 @@ def cmd_adjust(args: argparse.Namespace) -> None:
             created_by=args.actor,
             postings=postings,
         )
-        _print_journal(_serialize_journal(journal))
+        _print_journal(_serialize_journal(journal), as_json=args.json)
 
 
 def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(description="Journal utilities")
+    parser.add_argument("--json", action="store_true", help="Print the journal as JSON")
     sub = parser.add_subparsers(dest="cmd", required=True)
 
     realloc = sub.add_parser("realloc", help="Reallocate amount between allocations")
     realloc.add_argument("from_allocation_id", type=int)
     realloc.add_argument("to_allocation_id", type=int)
-    realloc.add_argument("amount", type=float)
+    realloc.add_argument("amount", type=_cents)
     realloc.add_argument("--currency", default="USD")
     realloc.add_argument("--note", default=None)
     realloc.add_argument("--actor", default="cli")
@@ -79,7 +97,7 @@ def build_parser() -> argparse.ArgumentParser:
     adjust.add_argument("budget_id", type=int)
     adjust.add_argument("item_project_id", type=int)
     adjust.add_argument("category_id", type=int)
-    adjust.add_argument("amount", type=float, nargs='+', help="One or more signed amounts that must net to zero")
+    adjust.add_argument("amount", type=_cents, nargs='+', help="One or more signed amounts that must net to zero")
     adjust.add_argument("--currency", default="USD")
     adjust.add_argument("--note", default=None)
     adjust.add_argument("--actor", default="cli")
@@ -9,7 +9,7 @@ import json
 import datetime as dt
 from collections import defaultdict
 from decimal import Decimal
-from typing import Dict, Iterable, List
+from typing import Dict, Iterable, Iterator, List, Tuple
 
 from sqlalchemy import select
 from sqlalchemy.orm import Session
@@ -18,41 +18,77 @@ from backend.db import SessionLocal
 from backend import models, models_finance  # noqa: F401 - ensure metadata is loaded
 
 
+_ZERO = Decimal("0")
+
+
+def _dec(value) -> Decimal:
+    """Coerce a stored amount to Decimal.
+
+    ``amount_leaf`` is a Numeric column, so loaded rows are already Decimal;
+    only pending in-session values can still be floats or ints.
+    """
+    if value is None:
+        return _ZERO
+    if isinstance(value, Decimal):
+        return value
+    return Decimal(str(value))
+
+
 def _walk_paths(
-    node: models.Category,
+    root: models.Category,
     children: Dict[int, List[models.Category]],
-    ancestors_ids: List[int],
-    ancestors_names: List[str],
-) -> Iterable[models.Category]:
-    path_ids = ancestors_ids + [node.id]
-    path_names = ancestors_names + [node.name]
-    node.path_ids = json.dumps(path_ids)
-    node.path_names = json.dumps(path_names)
-    node.path_depth = len(path_ids) - 1
-
-    for child in children.get(node.id, []):
-        yield from _walk_paths(child, children, path_ids, path_names)
-    yield node
+) -> List[models.Category]:
+    """Set path columns depth-first from ``root``; return the subtree in post-order.
+
+    Iterative so deep trees cannot hit the recursion limit; the current path is
+    one shared list grown and shrunk as the walk descends and backtracks.
+    """
+    path_ids: List[int] = []
+    path_names: List[str] = []
+    order: List[models.Category] = []
+    stack: List[Tuple[models.Category, Iterator[models.Category]]] = []
+
+    def enter(node: models.Category) -> None:
+        path_ids.append(node.id)
+        path_names.append(node.name)
+        # The columns are JSON, so store list copies and let the type encode
+        # them; pre-encoding would double-encode into a JSON string.
+        node.path_ids = list(path_ids)
+        node.path_names = list(path_names)
+        node.path_depth = len(path_ids) - 1
+        stack.append((node, iter(children.get(node.id, ()))))
+
+    enter(root)
+    while stack:
+        node, kids = stack[-1]
+        child = next(kids, None)
+        if child is not None:
+            enter(child)
+            continue
+        stack.pop()
+        path_ids.pop()
+        path_names.pop()
+        order.append(node)
+    return order
 
 
 def _compute_totals(
-    node: models.Category,
+    post_order: Iterable[models.Category],
     children: Dict[int, List[models.Category]],
-) -> Decimal:
-    kids = children.get(node.id, [])
-    node.is_leaf = len(kids) == 0
-    if node.is_leaf:
-        amount = Decimal(str(node.amount_leaf or 0))
+    rollups: Dict[int, Decimal],
+) -> None:
+    """Roll amounts up a post-ordered subtree, recording each node in ``rollups``."""
+    for node in post_order:
+        kids = children.get(node.id)
+        node.is_leaf = not kids
+        if node.is_leaf:
+            amount = _dec(node.amount_leaf)
+        else:
+            # parent node; ensure amount stored only on leaves
+            node.amount_leaf = None
+            amount = sum((rollups[child.id] for child in kids), _ZERO)
         node.rollup_amount = amount
-        return amount
-
-    # parent node; ensure amount stored only on leaves
-    node.amount_leaf = None
-    subtotal = Decimal("0")
-    for child in kids:
-        subtotal += _compute_totals(child, children)
-    node.rollup_amount = subtotal
-    return subtotal
+        rollups[node.id] = amount
 
 
 def reconcile_ledgers(session: Session) -> dict:
@@ -64,24 +100,27 @@ def reconcile_ledgers(session: Session) -> dict:
         if cat.parent_id:
             children[cat.parent_id].append(cat)
 
+    budgets = {
+        budget.id: budget
+        for budget in session.execute(
+            select(models_finance.FundingSource).where(models_finance.FundingSource.id.in_(list(by_budget)))
+        ).scalars()
+    }
     updated_budgets: Dict[int, Decimal] = {}
 
     for budget_id, cats in by_budget.items():
-        roots = [c for c in cats if c.parent_id is None]
-        # Rebuild ordering for deterministic traversal
-        for root in roots:
-            for node in _walk_paths(root, children, [], []):
-                # generator already mutates node paths
-                pass
-        for root in roots:
-            _compute_totals(root, children)
+        rollups: Dict[int, Decimal] = {}
+        for root in cats:
+            if root.parent_id is None:
+                _compute_totals(_walk_paths(root, children), children, rollups)
 
+        # Leaves outside any rooted subtree keep their stored amount.
         total = sum(
-            Decimal(str(cat.amount_leaf or 0))
+            (rollups[cat.id] if cat.id in rollups else _dec(cat.amount_leaf))
             for cat in cats
             if cat.is_leaf
         )
-        budget = session.get(models_finance.FundingSource, budget_id)
+        budget = budgets.get(budget_id)
         if budget:
             if budget.is_cost_center:
                 budget.budget_amount_cache = None
@@ -4,63 +4,89 @@ from __future__ import annotations
 import datetime as dt
 from decimal import Decimal
 
-from sqlalchemy import select
+from sqlalchemy import insert, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 
 from backend.db import SessionLocal
 from backend import models, models_finance
 
 
 def seed():
-    session = SessionLocal()
-    try:
+    # One transaction for the whole seed: committed on success, rolled back
+    # on any error.
+    with SessionLocal.begin() as session:
+        today = dt.date.today()
         car = models_finance.FundingSource.ensure(session, name="CAR-Alpha", type="CAR", is_temporary=False)
         cc = models_finance.FundingSource.ensure(session, name="CC-Temp", type="COST_CENTER", is_temporary=True)
 
-        vendor = session.execute(select(models.Vendor)).scalar_one_or_none()
-        if not vendor:
-            vendor = models.Vendor(name="Default Vendor")
-            session.add(vendor)
-            session.flush()
+        # Insert-or-ignore on the unique name: one round trip on an empty
+        # database, with a lookup only when the vendor already exists.
+        vendor_id = session.execute(
+            sqlite_insert(models.Vendor)
+            .values(name="Default Vendor")
+            .on_conflict_do_nothing(index_elements=["name"])
+            .returning(models.Vendor.id)
+        ).scalar()
+        if vendor_id is None:
+            vendor_id = session.execute(
+                select(models.Vendor.id).where(models.Vendor.name == "Default Vendor")
+            ).scalar_one()
 
         po = models_finance.PurchaseOrder(
             funding_source=car,
-            vendor_id=vendor.id,
+            vendor_id=vendor_id,
             po_number="PO-1001",
-            ordered_date=dt.date.today(),
+            ordered_date=today,
             currency="USD",
             fx_rate_to_usd=Decimal("1.0"),
             status="OPEN",
         )
         po.lines = [
-            models_finance.POLine(description="Line 1", quantity=Decimal("10"), unit_price=Decimal("100"), amount=Decimal("1000")),
+            models_finance.POLine(description="Line 1", quantity=Decimal("10"), unit_price=Decimal("100")),
         ]
         session.add(po)
-
-        lot1 = models_finance.FulfillmentLot(po_line=po.lines[0], lot_qty=Decimal("5"), lot_identifier="Lot-A")
-        lot2 = models_finance.FulfillmentLot(po_line=po.lines[0], lot_qty=Decimal("5"), lot_identifier="Lot-B")
-        session.add_all([lot1, lot2])
-        ct_ship = models_finance.CheckpointType(code="oem_ship", name="OEM Ship")
-        ct_arrive = models_finance.CheckpointType(code="arrive_plant", name="Arrive Plant")
-        session.add_all([ct_ship, ct_arrive])
         session.flush()
-        for lot in (lot1, lot2):
-            for ct in (ct_ship, ct_arrive):
-                session.add(models_finance.MilestoneInstance(lot=lot, checkpoint_type_id=ct.id, planned_date=dt.date.today()))
+
+        # Lots, checkpoint types and their milestone grid go in as one
+        # multi-row INSERT per table; RETURNING hands back the ids the
+        # milestones need. Id order is irrelevant since every lot gets
+        # every checkpoint.
+        lot_ids = session.scalars(
+            insert(models_finance.FulfillmentLot).returning(models_finance.FulfillmentLot.id),
+            [
+                {"po_line_id": po.lines[0].id, "lot_qty": Decimal("5"), "lot_identifier": "Lot-A"},
+                {"po_line_id": po.lines[0].id, "lot_qty": Decimal("5"), "lot_identifier": "Lot-B"},
+            ],
+        ).all()
+        checkpoint_ids = session.scalars(
+            insert(models_finance.CheckpointType).returning(models_finance.CheckpointType.id),
+            [
+                {"code": "oem_ship", "name": "OEM Ship"},
+                {"code": "arrive_plant", "name": "Arrive Plant"},
+            ],
+        ).all()
+        session.execute(
+            insert(models_finance.MilestoneInstance),
+            [
+                {"fulfillment_lot_id": lot_id, "checkpoint_type_id": ct_id, "planned_date": today}
+                for lot_id in lot_ids
+                for ct_id in checkpoint_ids
+            ],
+        )
 
         invoice = models_finance.Invoice(
             purchase_order=po,
-            vendor_id=vendor.id,
+            vendor_id=vendor_id,
             invoice_number="INV-5001",
-            invoice_date=dt.date.today(),
+            invoice_date=today,
             currency="USD",
             fx_rate_to_usd=Decimal("1.0"),
             status="OPEN",
         )
         invoice.lines = [
-            models_finance.InvoiceLine(description="First shipment", quantity=Decimal("5"), unit_price=Decimal("100"), amount=Decimal("500")),
+            models_finance.InvoiceLine(description="First shipment", quantity=Decimal("5"), unit_price=Decimal("100")),
         ]
         session.add(invoice)
-        session.flush()
 
         models_finance.PaymentSchedule.generate_default(session=session, invoice=invoice, net_days=60)
 
@@ -73,23 +99,20 @@ def seed():
             currency="USD",
             fx_rate_to_usd=Decimal("1.0"),
             amount_usd=Decimal("1000"),
-            txn_date=dt.date.today(),
+            txn_date=today,
         )
         session.add(txn)
-        session.flush()
-        models_finance.Event(
-            entity_type="purchase_order",
-            entity_id=str(po.id),
-            event_type="po_issued",
-            at=dt.datetime.now(dt.timezone.utc),
-            by="seed",
-            payload_json={"po_number": po.po_number},
+        session.execute(
+            insert(models_finance.Event).values(
+                entity_type="purchase_order",
+                entity_id=str(po.id),
+                event_type="po_issued",
+                at=dt.datetime.now(dt.timezone.utc),
+                by="seed",
+                payload_json={"po_number": po.po_number},
+            )
         )
 
-        session.commit()
-    finally:
-        session.close()
-
 
 if __name__ == "__main__":
     seed()
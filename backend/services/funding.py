@@ -4,7 +4,7 @@ from __future__ import annotations
 
 from datetime import date as DateType, datetime as DateTimeType
 from decimal import Decimal
-from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from typing import AbstractSet, Any, Dict, Iterable, List, Optional, Set, Tuple
 
 from sqlalchemy import distinct, func, select, text
 from sqlalchemy.orm import Session
@@ -22,7 +22,7 @@ class FundingServiceError(ValueError):
 
 
 TagBundle = Dict[str, List[Dict[str, Any]]]
-IncludeSet = Set[str]
+IncludeSet = AbstractSet[str]
 _UNSET = object()
 
 
@@ -30,8 +30,8 @@ def _float(value: Optional[Decimal]) -> Optional[float]:
     return float(value) if value is not None else None
 
 
-def _tag_bundle(db: Session, entity_type: str, entity_id: int) -> TagBundle:
-    return tag_service.get_tag_groups(db, entity_type=entity_type, entity_id=entity_id)
+def _tag_bundles(db: Session, entity_type: str, entity_ids: Iterable[int]) -> Dict[int, TagBundle]:
+    return tag_service.get_tag_groups_many(db, entity_type=entity_type, entity_ids=entity_ids)
 
 
 def _build_in_clause(prefix: str, ids: Iterable[int]) -> Tuple[str, Dict[str, Any]]:
@@ -113,20 +113,11 @@ def list_budgets(
     budgets = db.execute(stmt.order_by(models_finance.FundingSource.name.asc())).scalars().all()
     budget_ids = [b.id for b in budgets]
     stats_map = _budget_stats(db, budget_ids) if "stats" in include else {}
+    tags_map = _tag_bundles(db, "budget", budget_ids) if "tags" in include else {}
 
     items: List[Dict[str, Any]] = []
     for budget in budgets:
-        payload: Dict[str, Any] = {
-            "id": budget.id,
-            "name": budget.name,
-            "owner": budget.owner,
-            "is_cost_center": budget.is_cost_center,
-            "closure_date": budget.closure_date,
-            "description": budget.description,
-            "budget_amount_cache": _float(budget.budget_amount_cache),
-            "created_at": budget.created_at,
-            "updated_at": budget.updated_at,
-        }
+        payload = budget_record(budget)
         if "stats" in include:
             payload["stats"] = stats_map.get(budget.id, {
                 "category_count": 0,
@@ -135,11 +126,26 @@ def list_budgets(
                 "allocation_count": 0,
             })
         if "tags" in include:
-            payload["tags"] = _tag_bundle(db, "budget", budget.id)
+            payload["tags"] = tags_map[budget.id]
         items.append(payload)
     return items
 
 
+def budget_record(budget: models_finance.FundingSource) -> Dict[str, Any]:
+    """Base payload for a loaded budget, as get_budget returns it with no includes."""
+    return {
+        "id": budget.id,
+        "name": budget.name,
+        "owner": budget.owner,
+        "is_cost_center": budget.is_cost_center,
+        "closure_date": budget.closure_date,
+        "description": budget.description,
+        "budget_amount_cache": _float(budget.budget_amount_cache),
+        "created_at": budget.created_at,
+        "updated_at": budget.updated_at,
+    }
+
+
 def get_budget(
     db: Session,
     budget_id: int,
@@ -282,17 +288,8 @@ def list_item_projects(
 
     projects = db.execute(stmt.order_by(models.Project.name.asc())).scalars().all()
 
-    # Precompute rollups
     project_ids = [p.id for p in projects]
-    rollups: Dict[int, float] = {}
-    if project_ids:
-        rows = db.execute(
-            select(models.Category.item_project_id, func.coalesce(func.sum(models.Category.amount_leaf), 0.0))
-            .where(models.Category.item_project_id.in_(project_ids), models.Category.is_leaf.is_(True))
-            .group_by(models.Category.item_project_id)
-        )
-        for pid, amount in rows:
-            rollups[pid] = float(amount or 0)
+    rollups = _project_rollups(db, project_ids)
 
     assets_map: Dict[int, List[Dict[str, Any]]] = {}
     if "assets" in include and project_ids:
@@ -308,21 +305,13 @@ def list_item_projects(
         )
         for project_id, asset_id, name in rows:
             assets_map.setdefault(project_id, []).append({"id": asset_id, "name": name})
+    tags_map = _tag_bundles(db, "item_project", project_ids) if "tags" in include else {}
 
     items: List[Dict[str, Any]] = []
     for project in projects:
-        payload: Dict[str, Any] = {
-            "id": project.id,
-            "name": project.name,
-            "budget_id": project.budget_id,
-            "description": project.description,
-            "legacy_portfolio_id": project.legacy_portfolio_id,
-            "created_at": project.created_at,
-            "updated_at": project.updated_at,
-            "rollup_amount": rollups.get(project.id, 0.0),
-        }
+        payload = _item_project_payload(project, rollups.get(project.id, 0.0))
         if "tags" in include:
-            payload["tags"] = _tag_bundle(db, "item_project", project.id)
+            payload["tags"] = tags_map[project.id]
         if "assets" in include:
             assets = assets_map.get(project.id, [])
             payload["assets"] = {
@@ -333,6 +322,25 @@ def list_item_projects(
     return items
 
 
+def _item_project_payload(project: models.Project, rollup_amount: float) -> Dict[str, Any]:
+    return {
+        "id": project.id,
+        "name": project.name,
+        "budget_id": project.budget_id,
+        "description": project.description,
+        "legacy_portfolio_id": project.legacy_portfolio_id,
+        "created_at": project.created_at,
+        "updated_at": project.updated_at,
+        "rollup_amount": rollup_amount,
+    }
+
+
+def item_project_record(db: Session, project: models.Project) -> Dict[str, Any]:
+    """Base payload for a loaded project, as get_item_project returns it with no includes."""
+    rollup_amount = _project_rollups(db, [project.id]).get(project.id, 0.0)
+    return _item_project_payload(project, rollup_amount)
+
+
 def get_item_project(db: Session, item_project_id: int, *, include: IncludeSet) -> Dict[str, Any]:
     result = list_item_projects(db, ids=[item_project_id], include=include, budget_id=None, q=None)
     if not result:
@@ -460,29 +468,35 @@ def list_categories(
         stmt = stmt.where(func.lower(models.Category.name).like(f"%{q.lower()}%"))
 
     categories = db.execute(stmt.order_by(models.Category.path_depth.asc(), models.Category.name.asc())).scalars().all()
+    tags_map = _tag_bundles(db, "category", [c.id for c in categories]) if "tags" in include else {}
 
     items: List[Dict[str, Any]] = []
     for category in categories:
-        payload: Dict[str, Any] = {
-            "id": category.id,
-            "name": category.name,
-            "parent_id": category.parent_id,
-            "project_id": category.project_id,
-            "budget_id": category.budget_id,
-            "is_leaf": category.is_leaf,
-            "amount_leaf": _float(category.amount_leaf),
-            "rollup_amount": _float(category.rollup_amount),
-            "path_depth": category.path_depth,
-        }
+        payload = category_record(category)
         if "paths" in include:
             payload["path_ids"] = category.path_ids
             payload["path_names"] = category.path_names
         if "tags" in include:
-            payload["tags"] = _tag_bundle(db, "category", category.id)
+            payload["tags"] = tags_map[category.id]
         items.append(payload)
     return items
 
 
+def category_record(category: models.Category) -> Dict[str, Any]:
+    """Base payload for a loaded category, as get_category returns it with no includes."""
+    return {
+        "id": category.id,
+        "name": category.name,
+        "parent_id": category.parent_id,
+        "project_id": category.project_id,
+        "budget_id": category.budget_id,
+        "is_leaf": category.is_leaf,
+        "amount_leaf": _float(category.amount_leaf),
+        "rollup_amount": _float(category.rollup_amount),
+        "path_depth": category.path_depth,
+    }
+
+
 def get_category(db: Session, category_id: int, *, include: IncludeSet) -> Dict[str, Any]:
     result = list_categories(db, ids=[category_id], include=include)
     if not result:
@@ -787,10 +801,14 @@ def list_line_assets(
     for asset in assets:
         if allowed_ids is not None and asset.id not in allowed_ids:
             continue
-        results.append({"id": asset.id, "name": asset.name, "created_at": asset.created_at, "updated_at": asset.updated_at})
+        results.append(line_asset_record(asset))
     return results
 
 
+def line_asset_record(asset: models.LineAsset) -> Dict[str, Any]:
+    return {"id": asset.id, "name": asset.name, "created_at": asset.created_at, "updated_at": asset.updated_at}
+
+
 def create_line_asset(db: Session, *, name: str) -> models.LineAsset:
     asset = models.LineAsset(name=name)
     db.add(asset)
@@ -913,6 +931,11 @@ def budget_tree(
 
     rollups = _project_rollups(db, project_ids)
     asset_map = _project_asset_map(db, project_ids) if "assets" in include else {}
+    project_tags: Dict[int, TagBundle] = {}
+    category_tags: Dict[int, TagBundle] = {}
+    if "tags" in include:
+        project_tags = _tag_bundles(db, "item_project", project_ids)
+        category_tags = _tag_bundles(db, "category", [c.id for c in categories])
 
     nodes: List[Dict[str, Any]] = []
 
@@ -932,7 +955,7 @@ def budget_tree(
         budget_node["path_ids"] = [budget.id]
         budget_node["path_names"] = [budget.name]
     if "tags" in include:
-        budget_node["tags"] = _tag_bundle(db, "budget", budget.id)
+        budget_node["tags"] = _tag_bundles(db, "budget", [budget.id])[budget.id]
     nodes.append(budget_node)
 
     for project in projects:
@@ -952,7 +975,7 @@ def budget_tree(
             proj_node["path_ids"] = [budget.id, project.id]
             proj_node["path_names"] = [budget.name, project.name]
         if "tags" in include:
-            proj_node["tags"] = _tag_bundle(db, "item_project", project.id)
+            proj_node["tags"] = project_tags[project.id]
         if "assets" in include:
             assets = asset_map.get(project.id, [])
             proj_node["assets"] = {"count": len(assets), "items": assets}
@@ -976,7 +999,7 @@ def budget_tree(
             node["path_ids"] = category.path_ids
             node["path_names"] = category.path_names
         if "tags" in include:
-            node["tags"] = _tag_bundle(db, "category", category.id)
+            node["tags"] = category_tags[category.id]
         if "assets" in include and category.is_leaf:
             assets = asset_map.get(category.project_id, [])
             node["assets"] = {"count": len(assets), "items": assets}
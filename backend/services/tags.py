@@ -493,22 +493,62 @@ def _dedupe_tag_refs(rows: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
     return ordered
 
 
-def _fetch_direct_tag_refs(db: Session, entity_type: str, entity_id: int) -> List[Dict[str, Any]]:
-    stmt = (
-        select(models.Tag.id, models.Tag.name, models.Tag.color)
+def get_tag_groups(db: Session, *, entity_type: str, entity_id: int) -> Dict[str, List[Dict[str, Any]]]:
+    return get_tag_groups_many(db, entity_type=entity_type, entity_ids=[entity_id])[entity_id]
+
+
+def get_tag_groups_many(
+    db: Session,
+    *,
+    entity_type: str,
+    entity_ids: Iterable[int],
+) -> Dict[int, Dict[str, List[Dict[str, Any]]]]:
+    """Tag groups for several entities of one type, in two queries total."""
+    ids = list(dict.fromkeys(entity_ids))
+    if not ids:
+        return {}
+
+    direct_by_entity: Dict[int, List[Dict[str, Any]]] = {entity_id: [] for entity_id in ids}
+    direct_stmt = (
+        select(models.TagAssignment.entity_id, models.Tag.id, models.Tag.name, models.Tag.color)
         .join(models.TagAssignment, models.TagAssignment.tag_id == models.Tag.id)
         .where(
             models.TagAssignment.entity_type == entity_type,
-            models.TagAssignment.entity_id == entity_id,
+            models.TagAssignment.entity_id.in_(ids),
         )
         .order_by(models.Tag.name.asc())
     )
-    return [_tag_ref(row.id, row.name, row.color) for row in db.execute(stmt)]
+    for row in db.execute(direct_stmt):
+        direct_by_entity[row.entity_id].append(_tag_ref(row.id, row.name, row.color))
 
+    effective_by_entity: Dict[int, List[Dict[str, Any]]] = {entity_id: [] for entity_id in ids}
+    effective_stmt = (
+        select(
+            models.EffectiveTagIndex.entity_id,
+            models.EffectiveTagIndex.tag_id,
+            models.Tag.name,
+            models.Tag.color,
+        )
+        .join(models.Tag, models.Tag.id == models.EffectiveTagIndex.tag_id)
+        .where(
+            models.EffectiveTagIndex.entity_type == entity_type,
+            models.EffectiveTagIndex.entity_id.in_(ids),
+        )
+        .order_by(models.Tag.name.asc())
+    )
+    for row in db.execute(effective_stmt).mappings():
+        effective_by_entity[row["entity_id"]].append(row)
 
-def get_tag_groups(db: Session, *, entity_type: str, entity_id: int) -> Dict[str, List[Dict[str, Any]]]:
-    effective_rows = list_effective_tags(db, entity_type=entity_type, entity_id=entity_id)
-    direct_refs = _fetch_direct_tag_refs(db, entity_type, entity_id)
+    return {
+        entity_id: _group_tag_refs(direct_by_entity[entity_id], effective_by_entity[entity_id])
+        for entity_id in ids
+    }
+
+
+def _group_tag_refs(
+    direct_refs: List[Dict[str, Any]],
+    effective_rows: List[Any],
+) -> Dict[str, List[Dict[str, Any]]]:
     direct_ids = {ref["id"] for ref in direct_refs}
 
     inherited_refs: List[Dict[str, Any]] = []
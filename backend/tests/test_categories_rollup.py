@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import sys
 from decimal import Decimal
 
 import pytest
@@ -176,9 +177,52 @@ def test_reconciler_idempotent(session):
 
     assert Decimal(str(root.rollup_amount)) == Decimal("100")
     assert Decimal(str(fs.budget_amount_cache)) == Decimal("100")
+    assert leaf.path_ids == [root.id, leaf.id]
+    assert leaf.path_names == [root.name, leaf.name]
     assert stats_first["budgets_reconciled"] == stats_second["budgets_reconciled"]
 
 
+def test_reconciler_handles_trees_deeper_than_recursion_limit():
+    # Plain schema without the migration triggers, which would re-roll the
+    # whole chain on every insert.
+    engine = create_engine("sqlite:///:memory:", future=True, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    depth = sys.getrecursionlimit() + 50
+    with sessionmaker(bind=engine, future=True)() as session:
+        fs = models_finance.FundingSource(name="Deep", type="CAR", is_cost_center=False)
+        portfolio = models.Portfolio(name="Deep")
+        session.add_all([fs, portfolio])
+        session.flush()
+        project = models.Project(name="Deep", portfolio_id=portfolio.id, budget_id=fs.id)
+        session.add(project)
+        session.flush()
+        session.bulk_insert_mappings(
+            models.Category,
+            [
+                {
+                    "id": idx + 1,
+                    "name": f"Level {idx}",
+                    "parent_id": idx or None,
+                    "budget_id": fs.id,
+                    "item_project_id": project.id,
+                    "amount_leaf": Decimal("7") if idx == depth - 1 else None,
+                }
+                for idx in range(depth)
+            ],
+        )
+        session.commit()
+
+        reconcile_ledgers(session)
+        root = session.get(models.Category, 1)
+        deepest = session.get(models.Category, depth)
+
+        assert deepest.is_leaf is True
+        assert deepest.path_depth == depth - 1
+        assert deepest.path_ids[:2] == [1, 2]
+        assert Decimal(str(root.rollup_amount)) == Decimal("7")
+        assert Decimal(str(fs.budget_amount_cache)) == Decimal("7")
+
+
 def test_allocation_backfill_helper(session):
     fs, project, root, leaf = _seed_budget_hierarchy(session)
 
@@ -1,14 +1,21 @@
 from __future__ import annotations
 
+import asyncio
 import datetime as dt
 from decimal import Decimal
+from importlib import import_module
 from pathlib import Path
 import sys
+import time
+import uuid
 
 import pytest
-from fastapi import HTTPException
-from sqlalchemy import create_engine, select
-from sqlalchemy.orm import sessionmaker
+from fastapi import HTTPException, Response
+from pydantic import TypeAdapter, ValidationError
+from sqlalchemy import create_engine, func, select, text
+from sqlalchemy import inspect as sa_inspect
+from sqlalchemy.exc import InvalidRequestError
+from sqlalchemy.orm import selectinload, sessionmaker
 from sqlalchemy.pool import StaticPool
 
 ROOT = Path(__file__).resolve().parents[2]
@@ -16,25 +23,49 @@ if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
 from backend.db import Base
-from backend import models, models_finance  # noqa: F401 - ensure legacy tables load
+from backend import models, models_finance, query_cache  # noqa: F401 - ensure legacy tables load
 from backend.routes_finance import (
     apply_deliverable_template,
     create_fx_rate,
+    create_invoice,
+    create_purchase_order,
+    delete_fx_rate,
     get_budget_commit_actual,
+    list_deliverables,
+    list_funding_sources,
+    list_invoices,
+    list_payment_schedules,
+    list_purchase_orders,
+    patch_invoice,
     payment_schedule_generate,
+    reallocate,
     run_report_adhoc,
     update_fx_rate,
+    update_invoice,
     update_milestone,
+    update_purchase_order,
     update_payment_schedule,
 )
+from backend.scripts.backfill_transactions import backfill_transactions
 from backend.schemas_finance import (
+    DeliverableLotOut,
     DeliverableTemplateApplyRequest,
     FxRateIn,
     FxRateUpdateIn,
+    InvoiceIn,
+    InvoiceLineIn,
+    InvoiceListOut,
+    InvoiceUpdateIn,
     MilestoneUpdateIn,
     PaymentScheduleGenerateV2Request,
+    PaymentScheduleSplitIn,
+    POLineIn,
+    PurchaseOrderIn,
+    PurchaseOrderOut,
     PaymentScheduleUpdateIn,
+    ReallocateRequest,
     ReportRunIn,
+    SavedReportResult,
 )
 
 
@@ -49,6 +80,13 @@ def make_session_factory():
     return sessionmaker(bind=engine, autoflush=False, autocommit=False, future=True)
 
 
+def _read_stream(response) -> bytes:
+    async def collect() -> bytes:
+        return b"".join([chunk async for chunk in response.body_iterator])
+
+    return asyncio.run(collect())
+
+
 def test_payment_schedule_default_generates_due_date():
     SessionLocal = make_session_factory()
     session = SessionLocal()
@@ -101,6 +139,85 @@ def test_transaction_reversal_pair_creates_events():
         session.close()
 
 
+def test_reallocate_moves_replacement_to_target_funding_source():
+    SessionLocal = make_session_factory()
+    with SessionLocal() as session:
+        source = models_finance.FundingSource(name="Source", type="COST_CENTER")
+        target = models_finance.FundingSource(name="Target", type="COST_CENTER")
+        txn = models_finance.Transaction(
+            funding_source=source,
+            state="ACCRUAL",
+            source_type="INVOICE",
+            amount_txn=Decimal("100"),
+            currency="USD",
+            fx_rate_to_usd=Decimal("1.0"),
+            amount_usd=Decimal("100"),
+            txn_date=dt.date.today(),
+        )
+        session.add_all([source, target, txn])
+        session.commit()
+        txn_id, source_id, target_id = txn.id, source.id, target.id
+
+    def request(**overrides):
+        body = {"transaction_id": txn_id, "target_funding_source_id": target_id, "amount": "40", "memo": "move"}
+        return ReallocateRequest(**{**body, **overrides})
+
+    with SessionLocal() as session:
+        with pytest.raises(HTTPException) as exc:
+            reallocate(request(target_funding_source_id=target_id + 10), db=session)
+        assert exc.value.detail == "Funding source not found"
+        with pytest.raises(HTTPException) as exc:
+            reallocate(request(transaction_id=uuid.uuid4()), db=session)
+        assert exc.value.detail == "Transaction not found"
+
+    with SessionLocal() as session:
+        result = reallocate(request(), db=session)
+
+    with SessionLocal() as session:
+        reverse = session.get(models_finance.Transaction, result["reverse_id"])
+        replacement = session.get(models_finance.Transaction, result["replacement_id"])
+        assert (reverse.funding_source_id, reverse.amount_txn) == (source_id, Decimal("-100"))
+        assert (replacement.funding_source_id, replacement.amount_txn) == (target_id, Decimal("40"))
+
+
+def test_reversed_transaction_requires_eager_load():
+    SessionLocal = make_session_factory()
+    with SessionLocal() as session:
+        fs = models_finance.FundingSource(name="FS", type="COST_CENTER")
+        session.add(fs)
+        session.flush()
+        txn = models_finance.Transaction(
+            funding_source=fs,
+            state="ACCRUAL",
+            source_type="INVOICE",
+            amount_txn=Decimal("100"),
+            currency="USD",
+            fx_rate_to_usd=Decimal("1.0"),
+            amount_usd=Decimal("100"),
+            txn_date=dt.date.today(),
+        )
+        session.add(txn)
+        session.flush()
+        reverse, _ = models_finance.Transaction.create_reversal_pair(session, txn, reason="fix", by="tester")
+        session.commit()
+        original_id = txn.id
+        reverse_id = reverse.id
+
+    with SessionLocal() as session:
+        reverse = session.get(models_finance.Transaction, reverse_id)
+        assert reverse.reverses_transaction_id == original_id
+        with pytest.raises(InvalidRequestError):
+            reverse.reversed_transaction
+
+    with SessionLocal() as session:
+        reverse = session.execute(
+            select(models_finance.Transaction)
+            .options(selectinload(models_finance.Transaction.reversed_transaction))
+            .where(models_finance.Transaction.id == reverse_id)
+        ).scalar_one()
+        assert reverse.reversed_transaction.id == original_id
+
+
 def test_fx_lookup_respects_bounds():
     SessionLocal = make_session_factory()
     session = SessionLocal()
@@ -116,6 +233,10 @@ def test_fx_lookup_respects_bounds():
             session, dt.date(2024, 1, 10), "EUR", allow_stale=True
         )
         assert found.rate == Decimal("1.2")
+        assert models_finance.FxRate.rate_to_usd(session, dt.date(2024, 1, 10), "usd") == Decimal("1")
+        # Stored USD rows stay visible to lookup (backfill's ensure_fx_rate relies on it).
+        with pytest.raises(LookupError):
+            models_finance.FxRate.lookup(session, dt.date(2024, 1, 10), "USD")
     finally:
         session.close()
 
@@ -144,6 +265,37 @@ def test_analytics_budget_endpoint():
     assert data and "budget_usd" in data[0]
 
 
+def test_budget_commit_actual_aggregates_in_sql():
+    SessionLocal = make_session_factory()
+    with SessionLocal() as session:
+        fs = models_finance.FundingSource(name="FS", type="COST_CENTER")
+        session.add(fs)
+        session.flush()
+        for state, amount in [("FORECAST", "100"), ("COMMITMENT", "60"), ("CASH", "20"), ("FORECAST", "50")]:
+            session.add(
+                models_finance.Transaction(
+                    funding_source_id=fs.id,
+                    state=state,
+                    source_type="PO",
+                    source_id="PO-1",
+                    amount_txn=Decimal(amount),
+                    currency="USD",
+                    fx_rate_to_usd=Decimal("1"),
+                    amount_usd=Decimal(amount),
+                    txn_date=dt.date.today(),
+                )
+            )
+        session.commit()
+
+    with SessionLocal() as session:
+        (row,) = get_budget_commit_actual(group_by="funding_source", db=session)
+        assert row["budget_usd"] == 150.0
+        assert row["open_commitment_usd"] == 40.0
+        assert row["variance_usd"] == -130.0
+        assert row["variance_pct"] == pytest.approx(-86.6667, rel=1e-4)
+        assert get_budget_commit_actual(offset=1, db=session) == []
+
+
 def test_payment_schedule_generate_creates_default():
     SessionLocal = make_session_factory()
     with SessionLocal() as session:
@@ -178,6 +330,43 @@ def test_payment_schedule_generate_creates_default():
         assert event is not None
 
 
+def test_payment_schedule_generate_custom_splits_emit_events():
+    SessionLocal = make_session_factory()
+    with SessionLocal() as session:
+        fs = models_finance.FundingSource(name="FS", type="COST_CENTER")
+        po = models_finance.PurchaseOrder(
+            funding_source=fs,
+            po_number="PO-101",
+            currency="USD",
+            fx_rate_to_usd=Decimal("1.0"),
+            total_amount=Decimal("100"),
+        )
+        session.add(po)
+        session.commit()
+        po_id = po.id
+
+    with SessionLocal() as session:
+        result = payment_schedule_generate(
+            PaymentScheduleGenerateV2Request(
+                po_id=po_id,
+                rule="CUSTOM",
+                splits=[
+                    PaymentScheduleSplitIn(percent=Decimal("0.25")),
+                    PaymentScheduleSplitIn(amount=Decimal("75")),
+                ],
+            ),
+            db=session,
+        )
+        assert [Decimal(s.amount) for s in result] == [Decimal("25"), Decimal("75")]
+
+    with SessionLocal() as session:
+        events = session.execute(
+            select(models_finance.Event).where(models_finance.Event.entity_type == "payment_schedule")
+        ).scalars().all()
+        assert sorted(e.payload_json["split_index"] for e in events) == [0, 1]
+        assert {e.entity_id for e in events} == {str(s.id) for s in result}
+
+
 def test_payment_schedule_update_rejects_paid_changes():
     SessionLocal = make_session_factory()
     with SessionLocal() as session:
@@ -186,7 +375,7 @@ def test_payment_schedule_update_rejects_paid_changes():
             amount=Decimal("50"),
             due_date_rule="NET_N",
             status="PAID",
-            paid_transaction_id="txn",
+            paid_transaction_id=uuid.uuid4(),
         )
         session.add(schedule)
         session.commit()
@@ -223,7 +412,7 @@ def test_deliverable_template_apply_and_milestone_update():
             purchase_order=po,
             description="Widget",
             quantity=Decimal("10"),
-            amount=Decimal("10"),
+            unit_price=Decimal("1"),
         )
         session.add(line)
         session.commit()
@@ -253,6 +442,252 @@ def test_deliverable_template_apply_and_milestone_update():
         assert updated.actual_date == dt.date.today()
 
 
+def test_deliverable_template_apply_batches_lots_and_milestones():
+    SessionLocal = make_session_factory()
+    with SessionLocal() as session:
+        fs = models_finance.FundingSource(name="FS", type="COST_CENTER")
+        checkpoints = [
+            models_finance.CheckpointType(code="ship", name="Ship"),
+            models_finance.CheckpointType(code="recv", name="Receive"),
+        ]
+        po = models_finance.PurchaseOrder(
+            funding_source=fs,
+            po_number="PO-201",
+            currency="USD",
+            fx_rate_to_usd=Decimal("1.0"),
+            total_amount=Decimal("10"),
+            amount_usd=Decimal("10"),
+        )
+        line = models_finance.POLine(
+            purchase_order=po,
+            description="Widget",
+            quantity=Decimal("10"),
+            unit_price=Decimal("1"),
+        )
+        session.add_all([fs, *checkpoints, po, line])
+        session.commit()
+        po_id, line_id = po.id, line.id
+        checkpoint_ids = [cp.id for cp in checkpoints]
+
+    with SessionLocal() as session:
+        lots = apply_deliverable_template(
+            DeliverableTemplateApplyRequest(
+                purchase_order_id=po_id,
+                lot_quantities=[Decimal("4"), Decimal("6")],
+                checkpoint_type_ids=checkpoint_ids + checkpoint_ids[:1],
+            ),
+            db=session,
+        )
+        assert [Decimal(lot.lot_qty) for lot in lots] == [Decimal("4"), Decimal("6")]
+        assert all(
+            sorted(m.checkpoint_type_id for m in lot.milestones) == checkpoint_ids for lot in lots
+        )
+        first_ids = [lot.id for lot in lots]
+        counts = dict(
+            session.execute(
+                select(models_finance.Event.event_type, func.count()).group_by(models_finance.Event.event_type)
+            ).all()
+        )
+        assert counts == {"lot_created": 2, "milestone_created": 4, "deliverable_template_applied": 1}
+
+    with SessionLocal() as session:
+        lots = apply_deliverable_template(
+            DeliverableTemplateApplyRequest(
+                purchase_order_id=po_id,
+                lot_quantities=[Decimal("4"), Decimal("6")],
+                checkpoint_type_ids=checkpoint_ids,
+            ),
+            db=session,
+        )
+        assert [lot.id for lot in lots] == first_ids
+        assert [Decimal(lot.lot_qty) for lot in lots] == [Decimal("4"), Decimal("6")]
+        assert session.scalar(select(func.count()).select_from(models_finance.FulfillmentLot)) == 2
+        assert session.scalar(select(func.count()).select_from(models_finance.MilestoneInstance)) == 4
+        counts = dict(
+            session.execute(
+                select(models_finance.Event.event_type, func.count()).group_by(models_finance.Event.event_type)
+            ).all()
+        )
+        assert counts == {"lot_created": 2, "milestone_created": 4, "deliverable_template_applied": 2}
+
+    with SessionLocal() as session:
+        session.add(models_finance.FulfillmentLot(po_line_id=line_id, lot_qty=Decimal("5"), lot_identifier="Manual"))
+        session.commit()
+        lots = apply_deliverable_template(
+            DeliverableTemplateApplyRequest(
+                purchase_order_id=po_id,
+                lot_quantities=[Decimal("6"), Decimal("5")],
+                checkpoint_type_ids=checkpoint_ids,
+            ),
+            db=session,
+        )
+        # The 6 reuses the template lot; the hand-entered 5 is left alone.
+        assert lots[0].id == first_ids[1]
+        assert lots[1].id not in first_ids and lots[1].lot_identifier is None
+        assert [Decimal(lot.lot_qty) for lot in lots] == [Decimal("6"), Decimal("5")]
+        assert session.scalar(select(func.count()).select_from(models_finance.FulfillmentLot)) == 4
+
+
+def test_po_line_amount_computed_by_database():
+    SessionLocal = make_session_factory()
+    with SessionLocal() as session:
+        fs = models_finance.FundingSource(name="FS", type="COST_CENTER")
+        session.add(fs)
+        session.commit()
+        fs_id = fs.id
+
+    with SessionLocal() as session:
+        po = create_purchase_order(
+            PurchaseOrderIn(
+                funding_source_id=fs_id,
+                po_number="PO-300",
+                lines=[POLineIn(description="Widget", quantity=Decimal("4"), unit_price=Decimal("2.5"))],
+            ),
+            db=session,
+        )
+        line = po.lines[0]
+        assert Decimal(line.amount) == Decimal("10")
+
+        line.quantity = Decimal("6")
+        session.commit()
+        assert Decimal(line.amount) == Decimal("15")
+
+
+def test_line_inputs_reject_client_amount():
+    # A lump-sum line would otherwise be stored with a NULL computed amount.
+    with pytest.raises(ValidationError):
+        PurchaseOrderIn(funding_source_id=1, po_number="PO-1", lines=[{"description": "Lump", "amount": "500"}])
+    with pytest.raises(ValidationError):
+        InvoiceIn(invoice_number="INV-1", lines=[{"description": "Lump", "amount": "500"}])
+
+
+def test_update_purchase_order_replaces_lines_and_lots():
+    SessionLocal = make_session_factory()
+    with SessionLocal() as session:
+        fs = models_finance.FundingSource(name="FS", type="COST_CENTER")
+        session.add(fs)
+        session.commit()
+        payload = PurchaseOrderIn(
+            funding_source_id=fs.id,
+            po_number="PO-301",
+            lines=[POLineIn(description="Widget", quantity=Decimal("1"), unit_price=Decimal("1"))],
+        )
+        po = create_purchase_order(payload, db=session)
+        po_id = po.id
+        lot = models_finance.FulfillmentLot(po_line_id=po.lines[0].id, lot_qty=Decimal("1"))
+        session.add(lot)
+        session.commit()
+
+    with SessionLocal() as session:
+        payload.lines = [
+            POLineIn(description="A", quantity=Decimal("2"), unit_price=Decimal("3")),
+            POLineIn(description="B", quantity=Decimal("1"), unit_price=Decimal("4")),
+        ]
+        po = update_purchase_order(po_id, payload, db=session)
+        assert [line.description for line in po.lines] == ["A", "B"]
+        assert session.scalar(select(func.count()).select_from(models_finance.FulfillmentLot)) == 0
+
+
+def test_update_purchase_order_keeps_matched_lines():
+    SessionLocal = make_session_factory()
+    with SessionLocal() as session:
+        fs = models_finance.FundingSource(name="FS", type="COST_CENTER")
+        session.add(fs)
+        session.commit()
+        payload = PurchaseOrderIn(
+            funding_source_id=fs.id,
+            po_number="PO-302",
+            lines=[
+                POLineIn(description="Keep", quantity=Decimal("1"), unit_price=Decimal("2")),
+                POLineIn(description="Drop", quantity=Decimal("1"), unit_price=Decimal("1")),
+            ],
+        )
+        po = create_purchase_order(payload, db=session)
+        po_id = po.id
+        keep_id, drop_id = [line.id for line in po.lines]
+        session.add_all(
+            [
+                models_finance.FulfillmentLot(po_line_id=keep_id, lot_qty=Decimal("1")),
+                models_finance.FulfillmentLot(po_line_id=drop_id, lot_qty=Decimal("1")),
+            ]
+        )
+        session.commit()
+
+    # Finance write routes run on an expire_on_commit=False session (get_finance_db).
+    with SessionLocal(expire_on_commit=False) as session:
+        payload.lines = [
+            POLineIn(id=keep_id, description="Keep", quantity=Decimal("3"), unit_price=Decimal("2")),
+            POLineIn(description="New", quantity=Decimal("1"), unit_price=Decimal("5")),
+        ]
+        po = update_purchase_order(po_id, payload, db=session)
+        assert [(line.id == keep_id, line.description) for line in po.lines] == [(True, "Keep"), (False, "New")]
+        assert Decimal(po.lines[0].amount) == Decimal("6")
+        out = PurchaseOrderOut.model_validate(po)
+        assert [str(line.amount) for line in out.lines] == ["6.000000", "5.000000"]
+        assert str(out.fx_rate_to_usd) == "1.00000000"
+        lot_lines = session.execute(select(models_finance.FulfillmentLot.po_line_id)).scalars().all()
+        assert lot_lines == [keep_id]
+
+
+def test_purchase_order_list_pages_with_next_cursor():
+    SessionLocal = make_session_factory()
+    with SessionLocal() as session:
+        fs = models_finance.FundingSource(name="FS", type="COST_CENTER")
+        session.add_all(
+            [models_finance.PurchaseOrder(funding_source=fs, po_number=f"PO-{n}") for n in range(3)]
+        )
+        session.commit()
+
+        response = Response()
+        first = list_purchase_orders(response=response, limit=2, db=session)
+        cursor = response.headers["X-Next-Cursor"]
+        assert cursor == str(first[-1].id) and len(first) == 2
+
+        response = Response()
+        rest = list_purchase_orders(response=response, after_id=int(cursor), limit=2, db=session)
+        assert [po.po_number for po in rest] == ["PO-2"]
+        assert "X-Next-Cursor" not in response.headers
+
+        response = Response()
+        everything = list_purchase_orders(response=response, db=session)
+        assert [po.po_number for po in everything] == ["PO-0", "PO-1", "PO-2"]
+        assert "X-Next-Cursor" not in response.headers
+
+
+def test_patch_of_invoice_list_row_keeps_lines_and_details():
+    SessionLocal = make_session_factory()
+    with SessionLocal() as session:
+        invoice = create_invoice(
+            InvoiceIn(
+                invoice_number="INV-1",
+                currency="EUR",
+                fx_rate_to_usd=Decimal("1.1"),
+                memo="net 30",
+                lines=[InvoiceLineIn(description="Widget", quantity=Decimal("2"), unit_price=Decimal("5"))],
+            ),
+            db=session,
+        )
+        invoice_id = invoice.id
+
+    with SessionLocal() as session:
+        (row,) = list_invoices(db=session)
+        body = TypeAdapter(InvoiceListOut).dump_python(TypeAdapter(InvoiceListOut).validate_python(row), mode="json")
+        assert "lines" not in body and "memo" not in body
+        patch_invoice(invoice_id, InvoiceUpdateIn.model_validate({**body, "status": "PAID"}), db=session)
+
+    with SessionLocal() as session:
+        invoice = session.get(models_finance.Invoice, invoice_id)
+        assert invoice.status == "PAID"
+        assert invoice.memo == "net 30"
+        assert invoice.fx_rate_to_usd == Decimal("1.1")
+        assert [line.description for line in invoice.lines] == ["Widget"]
+
+    # PUT replaces the whole invoice, as it does for purchase orders.
+    with SessionLocal(expire_on_commit=False) as session:
+        invoice = update_invoice(invoice_id, InvoiceIn(invoice_number="INV-1"), db=session)
+        assert (invoice.status, invoice.memo, invoice.lines) == ("OPEN", None, [])
+
+
 def test_fx_rate_bounds_and_override():
     SessionLocal = make_session_factory()
     with SessionLocal() as session:
@@ -274,8 +709,46 @@ def test_fx_rate_bounds_and_override():
         )
         assert Decimal(updated.rate) == Decimal("3")
 
+    with SessionLocal() as session:
+        event_types = session.execute(
+            select(models_finance.Event.event_type)
+            .where(models_finance.Event.entity_type == "fx_rate")
+            .order_by(models_finance.Event.id)
+        ).scalars().all()
+        assert event_types == ["fx_rate_created", "fx_rate_updated"]
+
 
-def test_report_run_adhoc():
+def test_delete_fx_rate_blocked_by_referencing_transactions():
+    SessionLocal = make_session_factory()
+    with SessionLocal() as session:
+        fs = models_finance.FundingSource(name="FS", type="COST_CENTER")
+        used = models_finance.FxRate(quote_currency="EUR", valid_from=dt.date(2024, 1, 1), rate=Decimal("1.1"))
+        unused = models_finance.FxRate(quote_currency="GBP", valid_from=dt.date(2024, 1, 1), rate=Decimal("1.3"))
+        txn = models_finance.Transaction(
+            funding_source=fs,
+            state="ACTUAL",
+            source_type="INVOICE",
+            amount_txn=Decimal("10"),
+            currency="EUR",
+            fx_rate_to_usd=Decimal("1.1"),
+            amount_usd=Decimal("11"),
+            txn_date=dt.date(2024, 2, 1),
+        )
+        session.add_all([fs, used, unused, txn])
+        session.commit()
+        used_id, unused_id = used.id, unused.id
+
+    with SessionLocal() as session:
+        with pytest.raises(HTTPException) as exc:
+            delete_fx_rate(used_id, db=session)
+        assert exc.value.status_code == 400
+
+    with SessionLocal() as session:
+        assert delete_fx_rate(unused_id, db=session) == {"ok": True}
+        assert session.get(models_finance.FxRate, unused_id) is None
+
+
+def test_report_run_adhoc(monkeypatch):
     SessionLocal = make_session_factory()
     with SessionLocal() as session:
         fs = models_finance.FundingSource(name="FS", type="COST_CENTER")
@@ -295,8 +768,303 @@ def test_report_run_adhoc():
         session.commit()
 
     with SessionLocal() as session:
-        result = run_report_adhoc(
+        response = run_report_adhoc(
             ReportRunIn(json_config={"view": "v_budget_commit_actual"}),
             db=session,
         )
-        assert result.rows
+    result = SavedReportResult.model_validate_json(_read_stream(response))
+    assert result.rows
+    assert result.generated_at.tzinfo is not None
+
+    # Past the cache threshold the rows stream from a cursor that outlives the
+    # request's session.
+    monkeypatch.setattr("backend.routes_finance._REPORT_CACHE_MAX_ROWS", 0)
+    with SessionLocal() as session:
+        response = run_report_adhoc(
+            ReportRunIn(json_config={"view": "v_budget_commit_actual"}),
+            db=session,
+        )
+    assert SavedReportResult.model_validate_json(_read_stream(response)).rows == result.rows
+
+    with SessionLocal() as session:
+        with pytest.raises(HTTPException) as exc:
+            run_report_adhoc(
+                ReportRunIn(json_config={"view": "v_open_items; DROP TABLE transactions"}),
+                db=session,
+            )
+        assert exc.value.status_code == 400
+
+
+def test_cached_reads_invalidate_after_commit():
+    SessionLocal = make_session_factory()
+    query_cache.register(SessionLocal.kw["bind"])
+    with SessionLocal() as session:
+        session.add(models_finance.FundingSource(name="FS", type="COST_CENTER"))
+        session.commit()
+
+    with SessionLocal() as session:
+        first = list_funding_sources(db=session)
+        assert list_funding_sources(db=session) is first
+
+    with SessionLocal() as session:
+        session.add(models_finance.FundingSource(name="FS2", type="COST_CENTER"))
+        session.commit()
+        assert [fs.name for fs in list_funding_sources(db=session)] == ["FS", "FS2"]
+
+    with SessionLocal() as session:
+        session.execute(text("UPDATE funding_sources SET name = 'Renamed' WHERE name = 'FS'"))
+        session.commit()
+        assert [fs.name for fs in list_funding_sources(db=session)] == ["Renamed", "FS2"]
+
+
+def test_cached_reads_bypassed_with_uncommitted_writes():
+    SessionLocal = make_session_factory()
+    query_cache.register(SessionLocal.kw["bind"])
+    with SessionLocal() as session:
+        session.add(models_finance.FundingSource(name="FS", type="COST_CENTER"))
+        session.commit()
+        cached = list_funding_sources(db=session)
+
+    with SessionLocal() as session:
+        session.add(models_finance.FundingSource(name="Pending", type="COST_CENTER"))
+        session.flush()
+        assert [fs.name for fs in list_funding_sources(db=session)] == ["FS", "Pending"]
+        session.execute(text("UPDATE funding_sources SET name = 'Raw' WHERE name = 'Pending'"))
+        assert [fs.name for fs in list_funding_sources(db=session)] == ["FS", "Raw"]
+        session.rollback()
+
+    with SessionLocal() as session:
+        assert list_funding_sources(db=session) is cached
+
+
+def test_cached_reads_see_writes_from_other_processes(tmp_path):
+    import sqlite3
+
+    path = tmp_path / "cache.db"
+    engine = create_engine(f"sqlite:///{path}", future=True)
+    Base.metadata.create_all(bind=engine)
+    SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, future=True)
+    query_cache.register(engine)
+    with SessionLocal() as session:
+        session.add(models_finance.FundingSource(name="FS", type="COST_CENTER"))
+        session.commit()
+        first = list_funding_sources(db=session)
+        assert list_funding_sources(db=session) is first
+
+    # A script such as backfill_transactions writes through its own engine.
+    with sqlite3.connect(path) as outside:
+        outside.execute("UPDATE funding_sources SET name = 'Outside' WHERE name = 'FS'")
+
+    with SessionLocal() as session:
+        assert [fs.name for fs in list_funding_sources(db=session)] == ["Outside"]
+    engine.dispose()
+
+
+def test_query_cache_skips_unregistered_engines():
+    SessionLocal = make_session_factory()
+    with SessionLocal() as session:
+        assert list_funding_sources(db=session) is not list_funding_sources(db=session)
+
+
+def test_list_payment_schedules_resolves_invoice_purchase_order():
+    SessionLocal = make_session_factory()
+    with SessionLocal() as session:
+        fs = models_finance.FundingSource(name="FS", type="COST_CENTER")
+        session.add(fs)
+        session.flush()
+        po = models_finance.PurchaseOrder(
+            funding_source=fs,
+            po_number="PO-300",
+            currency="USD",
+            fx_rate_to_usd=Decimal("1.0"),
+        )
+        invoice = models_finance.Invoice(purchase_order=po, invoice_number="INV-300")
+        session.add_all([po, invoice])
+        session.flush()
+        session.add(
+            models_finance.PaymentSchedule(
+                invoice_id=invoice.id,
+                due_date=dt.date.today(),
+                amount=Decimal("5"),
+            )
+        )
+        session.commit()
+        fs_id = fs.id
+
+    with SessionLocal() as session:
+        schedules = list_payment_schedules(funding_source_id=fs_id, db=session)
+        assert len(schedules) == 1
+        loaded = sa_inspect(schedules[0].invoice)
+        assert "purchase_order" not in loaded.unloaded
+        assert schedules[0].invoice.purchase_order.po_number == "PO-300"
+        assert list_payment_schedules(funding_source_id=fs_id + 1, db=session) == []
+
+
+def _deliverables(**kwargs) -> list[DeliverableLotOut]:
+    response = list_deliverables(**kwargs)
+    return TypeAdapter(list[DeliverableLotOut]).validate_json(response.body)
+
+
+def test_list_deliverables_flags_late_lots_in_sql():
+    SessionLocal = make_session_factory()
+    with SessionLocal() as session:
+        fs = models_finance.FundingSource(name="FS", type="COST_CENTER")
+        checkpoint = models_finance.CheckpointType(code="SHIP", name="Shipped")
+        po = models_finance.PurchaseOrder(funding_source=fs, po_number="PO-400", currency="USD")
+        line = models_finance.POLine(purchase_order=po, description="Widget", quantity=Decimal("2"))
+        session.add_all([checkpoint, po, line])
+        session.flush()
+        yesterday = dt.date.today() - dt.timedelta(days=1)
+        late_lot = models_finance.FulfillmentLot(po_line=line, lot_qty=Decimal("1"))
+        done_lot = models_finance.FulfillmentLot(po_line=line, lot_qty=Decimal("1"))
+        late_lot.milestones.append(
+            models_finance.MilestoneInstance(checkpoint_type_id=checkpoint.id, planned_date=yesterday)
+        )
+        done_lot.milestones.append(
+            models_finance.MilestoneInstance(
+                checkpoint_type_id=checkpoint.id, planned_date=yesterday, actual_date=yesterday
+            )
+        )
+        session.add_all([late_lot, done_lot])
+        session.commit()
+        late_id = late_lot.id
+
+    with SessionLocal() as session:
+        lots = _deliverables(db=session)
+        assert {lot.id: lot.is_late for lot in lots} == {late_id: True, late_id + 1: False}
+        assert [lot.id for lot in _deliverables(late_only=True, db=session)] == [late_id]
+        assert [lot.id for lot in _deliverables(limit=1, offset=1, db=session)] == [late_id + 1]
+        assert [lot.id for lot in _deliverables(after_id=late_id, db=session)] == [late_id + 1]
+        assert _deliverables(status="DONE", db=session) == []
+
+
+def test_backfill_transactions_carries_entry_tags_and_skips_existing():
+    SessionLocal = make_session_factory()
+    with SessionLocal() as session:
+        portfolio = models.Portfolio(name="Legacy")
+        alpha, beta = models.Tag(name="alpha"), models.Tag(name="beta")
+        session.add_all([portfolio, alpha, beta])
+        session.flush()
+        tagged = models.Entry(kind="po", amount=10.0, portfolio_id=portfolio.id)
+        plain = models.Entry(kind="quote", amount=5.0, portfolio_id=portfolio.id)
+        session.add_all([tagged, plain])
+        session.flush()
+        session.add_all([
+            models.EntryTag(entry_id=tagged.id, tag_id=beta.id),
+            models.EntryTag(entry_id=tagged.id, tag_id=alpha.id),
+        ])
+        session.commit()
+
+        summary = backfill_transactions(session)
+        assert summary["transactions_created"] == 2
+        assert summary["events_created"] == 2
+
+        txns = {
+            txn.source_id: txn
+            for txn in session.execute(select(models_finance.Transaction)).scalars()
+        }
+        assert txns[str(tagged.id)].tags == ["alpha", "beta"]
+        assert txns[str(plain.id)].tags == []
+        event_ids = set(
+            session.execute(
+                select(models_finance.Event.entity_id).where(models_finance.Event.event_type == "backfill_created")
+            ).scalars()
+        )
+        assert event_ids == {str(txn.id) for txn in txns.values()}
+
+        again = backfill_transactions(session)
+        assert again == {"transactions_skipped": 2}
+
+
+def test_transaction_id_migration_rewrites_legacy_text_ids():
+    migration = import_module("backend.migrations.versions.20261015_01_transaction_uuid_bytes")
+    SessionLocal = make_session_factory()
+    session = SessionLocal()
+    try:
+        fs = models_finance.FundingSource(name="FS", type="COST_CENTER")
+        session.add(fs)
+        session.flush()
+        legacy_id = str(uuid.uuid4())
+        reverse_id = str(uuid.uuid4())
+        # Rows as the old String(36) columns stored them.
+        for txn_id, reverses in ((legacy_id, None), (reverse_id, legacy_id)):
+            session.execute(
+                text(
+                    "INSERT INTO transactions (id, funding_source_id, state, source_type, amount_txn, currency,"
+                    " fx_rate_to_usd, amount_usd, txn_date, created_at, reverses_transaction_id)"
+                    " VALUES (:id, :fs, 'ACCRUAL', 'INVOICE', 1, 'USD', 1, 1, '2024-01-01', '2024-01-01', :rev)"
+                ),
+                {"id": txn_id, "fs": fs.id, "rev": reverses},
+            )
+        session.execute(
+            text("INSERT INTO payment_schedules (due_date_rule, status, paid_transaction_id) VALUES ('NET_N', 'PAID', :id)"),
+            {"id": legacy_id},
+        )
+        session.commit()
+
+        migration.rewrite_ids(session.connection(), to_bytes=True)
+        session.commit()
+
+        assert session.execute(text("SELECT DISTINCT typeof(id), length(id) FROM transactions")).all() == [("blob", 16)]
+        original = session.get(models_finance.Transaction, uuid.UUID(legacy_id))
+        assert original is not None
+        reverse = session.get(models_finance.Transaction, uuid.UUID(reverse_id))
+        assert reverse.reverses_transaction_id == original.id
+        schedule = session.execute(select(models_finance.PaymentSchedule)).scalar_one()
+        assert schedule.paid_transaction is original
+    finally:
+        session.close()
+
+
+def test_event_payload_round_trips_through_orjson():
+    SessionLocal = make_session_factory()
+    with SessionLocal() as session:
+        payload = {"po_number": "PO-1", "qty": 1.5, "tags": ["a", None], 7: {"nested": True}}
+        for entity_id, value in (("1", payload), ("2", None)):
+            session.add(
+                models_finance.Event(entity_type="po", entity_id=entity_id, event_type="t", payload_json=value)
+            )
+        session.add(models_finance.Event(entity_type="po", entity_id="3", event_type="t"))
+        session.commit()
+
+        stored = session.execute(text("SELECT payload_json FROM events ORDER BY entity_id")).scalars().all()
+        assert stored == ['{"po_number":"PO-1","qty":1.5,"tags":["a",null],"7":{"nested":true}}', "null", None]
+        session.expire_all()
+        events = session.execute(select(models_finance.Event).order_by(models_finance.Event.entity_id)).scalars()
+        assert [event.payload_json for event in events] == [
+            {"po_number": "PO-1", "qty": 1.5, "tags": ["a", None], "7": {"nested": True}},
+            None,
+            None,
+        ]
+
+
+def test_lot_lateness_uses_local_date(monkeypatch):
+    # Pick a zone whose date differs from UTC right now, so a UTC "today"
+    # would flip the answer.
+    utc_now = dt.datetime.now(dt.timezone.utc)
+    monkeypatch.setenv("TZ", "Etc/GMT+12" if utc_now.hour < 12 else "Etc/GMT-14")
+    time.tzset()
+    try:
+        today = dt.date.today()
+        assert today != utc_now.date()
+        SessionLocal = make_session_factory()
+        with SessionLocal() as session:
+            fs = models_finance.FundingSource(name="FS", type="COST_CENTER")
+            checkpoint = models_finance.CheckpointType(code="SHIP", name="Shipped")
+            po = models_finance.PurchaseOrder(funding_source=fs, po_number="PO-401", currency="USD")
+            line = models_finance.POLine(purchase_order=po, description="Widget", quantity=Decimal("2"))
+            session.add_all([checkpoint, po, line])
+            session.flush()
+            due_today = models_finance.FulfillmentLot(po_line=line, lot_qty=Decimal("1"))
+            overdue = models_finance.FulfillmentLot(po_line=line, lot_qty=Decimal("1"))
+            due_today.milestones.append(models_finance.MilestoneInstance(checkpoint_type_id=checkpoint.id, planned_date=today))
+            overdue.milestones.append(
+                models_finance.MilestoneInstance(checkpoint_type_id=checkpoint.id, planned_date=today - dt.timedelta(days=1))
+            )
+            session.add_all([due_today, overdue])
+            session.commit()
+            lots = {lot.id: lot.is_late for lot in _deliverables(db=session)}
+            assert lots == {due_today.id: False, overdue.id: True}
+    finally:
+        monkeypatch.undo()
+        time.tzset()
@@ -1,16 +1,28 @@
 from __future__ import annotations
 
+import json
 from decimal import Decimal
 
 import pytest
 from fastapi import HTTPException
-from sqlalchemy import create_engine, select, func
+from pydantic import ValidationError
+from sqlalchemy import create_engine, event, select, func
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 
 from backend.db import Base
-from backend import models, models_finance, schemas
-from backend.routes_funding import api_attach_line_asset, api_detach_line_asset
+from backend import models, models_finance, query_cache, schemas
+from backend.routes_funding import (
+    _arr,
+    api_attach_line_asset,
+    api_budget_tree,
+    api_create_category,
+    api_create_item_project,
+    api_detach_line_asset,
+    api_list_budgets,
+    api_update_budget,
+    api_update_item_project,
+)
 from backend.services import funding, tags as tag_service
 
 
@@ -331,3 +343,219 @@ def test_scoped_rebuild(db_session):
 
     other_rows = tag_service.list_effective_tags(db_session, entity_type="category", entity_id=data["leaf1"].id)
     assert all(row["name"] != "scoped" for row in other_rows)
+
+
+def test_cached_budget_list_invalidated_by_writes(db_session):
+    query_cache.register(db_session.get_bind())
+    data = _seed_structure(db_session)
+    db_session.commit()
+
+    def budget_names():
+        response = api_list_budgets(q=None, is_cost_center=None, owner=None, ids=None, include=None, db=db_session)
+        return [item["name"] for item in json.loads(response.body)]
+
+    first = api_list_budgets(q=None, is_cost_center=None, owner=None, ids=None, include=None, db=db_session)
+    again = api_list_budgets(q=None, is_cost_center=None, owner=None, ids=None, include=None, db=db_session)
+    assert again.body is first.body
+
+    funding.update_budget(db_session, data["budget"].id, name="Renamed")
+    assert budget_names() == ["Renamed"]
+
+    # Bulk mappings bypass the unit of work but still invalidate on commit.
+    db_session.bulk_insert_mappings(models_finance.FundingSource, [{"name": "Bulk", "type": "COST_CENTER"}])
+    db_session.commit()
+    assert budget_names() == ["Bulk", "Renamed"]
+
+
+def test_path_arrays_decode_legacy_text():
+    assert _arr(None) is None
+    assert _arr([1, 2]) == [1, 2]
+    assert _arr("[1, 2]") == [1, 2]
+    assert _arr('"Root"') == ["Root"]
+    assert _arr("  ") == []
+    assert _arr("not json") == ["not json"]
+    assert _arr((3, 4)) == [3, 4]
+
+
+def test_batched_tag_groups_split_direct_and_inherited(db_session):
+    data = _seed_structure(db_session)
+    leaf_tag = tag_service.create_tag(db_session, name="compute_only", color=None, description=None, actor="tester")
+    tag_service.assign_tag(
+        db_session,
+        tag_id=leaf_tag.id,
+        tag_name=None,
+        entity_type="category",
+        entity_id=data["leaf1"].id,
+        scope=None,
+        actor="tester",
+    )
+    tag_service.rebuild_effective_tags(db_session, actor="tester")
+
+    category_ids = [data["root"].id, data["leaf1"].id, data["leaf2"].id]
+    groups = tag_service.get_tag_groups_many(db_session, entity_type="category", entity_ids=category_ids)
+    assert set(groups) == set(category_ids)
+
+    leaf1 = groups[data["leaf1"].id]
+    assert [ref["name"] for ref in leaf1["direct"]] == ["compute_only"]
+    assert [ref["name"] for ref in leaf1["inherited"]] == ["program_cobra"]
+    assert [ref["name"] for ref in leaf1["effective"]] == ["compute_only", "program_cobra"]
+    assert groups[data["leaf2"].id]["direct"] == []
+    assert [ref["name"] for ref in groups[data["leaf2"].id]["effective"]] == ["program_cobra"]
+    for category_id in category_ids:
+        assert groups[category_id] == tag_service.get_tag_groups(
+            db_session, entity_type="category", entity_id=category_id
+        )
+
+    nodes = funding.budget_tree(db_session, data["budget"].id, project_id=None, include={"tags"})
+    by_id = {node["id"]: node for node in nodes if node["type"] == "category"}
+    assert by_id[data["leaf1"].id]["tags"] == leaf1
+
+
+def _count_statements(session, fn):
+    statements = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engine = session.get_bind()
+    event.listen(engine, "before_cursor_execute", _record)
+    try:
+        fn()
+    finally:
+        event.remove(engine, "before_cursor_execute", _record)
+    return len(statements)
+
+
+def test_funding_reads_issue_constant_queries(db_session):
+    data = _seed_structure(db_session)
+    budget_id = data["budget"].id
+    include = {"tags", "paths", "assets", "stats"}
+
+    def read_all():
+        funding.list_budgets(db_session, q=None, is_cost_center=None, owner=None, ids=None, include=include)
+        funding.list_item_projects(db_session, budget_id=budget_id, q=None, ids=None, include=include)
+        funding.list_categories(
+            db_session, budget_id=budget_id, project_id=None, parent_id=None, q=None, ids=None, include=include
+        )
+        funding.budget_tree(db_session, budget_id, project_id=None, include=include)
+
+    before = _count_statements(db_session, read_all)
+
+    for idx in range(5):
+        db_session.add(
+            models.Category(
+                name=f"Extra {idx}",
+                project_id=data["project"].id,
+                budget_id=budget_id,
+                parent_id=data["root"].id,
+                is_leaf=True,
+                amount_leaf=Decimal("0"),
+                rollup_amount=Decimal("0"),
+                path_depth=1,
+                path_ids=[data["root"].id],
+                path_names=["Infrastructure"],
+            )
+        )
+    db_session.commit()
+    tag_service.rebuild_effective_tags(db_session, actor="tester")
+
+    assert _count_statements(db_session, read_all) == before
+
+
+def test_write_responses_match_read_records(db_session):
+    data = _seed_structure(db_session)
+    budget_id = data["budget"].id
+    project_id = data["project"].id
+
+    updated = api_update_budget(budget_id, schemas.BudgetUpdate(owner="bob", closure_date="2025-12-31"), db=db_session)
+    assert updated.owner == "bob"
+    assert updated.closure_date == "2025-12-31"
+    listed = api_list_budgets(q=None, is_cost_center=None, owner=None, ids=[budget_id], include=None, db=db_session)
+    assert updated.model_dump() == schemas.BudgetOut.model_validate(json.loads(listed.body)[0]).model_dump()
+
+    project = api_update_item_project(project_id, schemas.ItemProjectUpdate(name="PM12"), db=db_session)
+    assert project.name == "PM12"
+    assert project.rollup_amount == 300.0
+    created_project = api_create_item_project(
+        schemas.ItemProjectCreate(budget_id=budget_id, name="PM13"), db=db_session
+    )
+    assert created_project.rollup_amount == 0.0
+    assert created_project.created_at is not None
+
+    category = api_create_category(
+        schemas.CategoryCreate(
+            name="Network",
+            project_id=project_id,
+            budget_id=budget_id,
+            parent_id=data["root"].id,
+            amount_leaf=50.0,
+        ),
+        db=db_session,
+    )
+    assert category.model_dump() == schemas.CategoryOut.model_validate(
+        funding.get_category(db_session, category.id, include=set())
+    ).model_dump()
+    assert category.rollup_amount == 50.0
+
+
+def test_unknown_include_rejected_before_query(db_session):
+    with pytest.raises(HTTPException) as exc:
+        api_list_budgets(q=None, is_cost_center=None, owner=None, ids=None, include="stats,bogus", db=db_session)
+    assert exc.value.status_code == 422
+    assert exc.value.detail["code"] == "invalid_include"
+
+
+def test_cached_reads_answer_conditional_requests(db_session):
+    data = _seed_structure(db_session)
+    budget_id = data["budget"].id
+
+    first = api_budget_tree(budget_id, project_id=None, include="tags", if_none_match=None, db=db_session)
+    etag = first.headers["etag"]
+    assert first.status_code == 200
+
+    unchanged = api_budget_tree(budget_id, project_id=None, include="tags", if_none_match=etag, db=db_session)
+    assert unchanged.status_code == 304
+    assert unchanged.body == b""
+    assert unchanged.headers["etag"] == etag
+    weak = api_budget_tree(budget_id, project_id=None, include="tags", if_none_match=f'"x", W/{etag}', db=db_session)
+    assert weak.status_code == 304
+
+    data["root"].name = "Infra"
+    db_session.commit()
+    changed = api_budget_tree(budget_id, project_id=None, include="tags", if_none_match=etag, db=db_session)
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
+
+
+def test_cached_etag_changes_after_out_of_process_write(tmp_path):
+    import sqlite3
+
+    path = tmp_path / "funding.db"
+    engine = create_engine(f"sqlite:///{path}", future=True)
+    Base.metadata.create_all(bind=engine)
+    query_cache.register(engine)
+    session = sessionmaker(bind=engine, autoflush=False, autocommit=False, future=True)()
+    try:
+        budget_id = _seed_structure(session)["budget"].id
+        session.commit()
+        first = api_budget_tree(budget_id, project_id=None, include=None, if_none_match=None, db=session)
+        etag = first.headers["etag"]
+
+        with sqlite3.connect(path) as outside:
+            outside.execute("UPDATE funding_sources SET name = 'Renamed' WHERE id = ?", (budget_id,))
+
+        changed = api_budget_tree(budget_id, project_id=None, include=None, if_none_match=etag, db=session)
+        assert changed.status_code == 200
+        assert changed.headers["etag"] != etag
+        assert b"Renamed" in changed.body
+    finally:
+        session.close()
+        engine.dispose()
+
+
+def test_funding_inputs_bound_name_length():
+    with pytest.raises(ValidationError):
+        schemas.BudgetCreate(name="")
+    with pytest.raises(ValidationError):
+        schemas.CategoryCreate(name="x" * (schemas.NAME_MAX_LENGTH + 1), project_id=1, budget_id=1)
+    assert schemas.CategoryUpdate(description="d").model_dump(exclude_unset=True) == {"description": "d"}
@@ -183,3 +183,18 @@ def test_journal_endpoint_validation(db_session):
     )
     with pytest.raises(HTTPException):
         _create_journal(db_session, kind=payload.kind, note=None, created_by=None, postings=payload.postings)
+
+
+def test_journals_cli_parses_amounts_as_cents():
+    from backend.scripts import journals_cli
+
+    args = journals_cli.build_parser().parse_args(["adjust", "1", "2", "3", "0.1", "0.2", "-0.3"])
+    assert args.amount == [10, 20, -30]
+    assert sum(args.amount) == 0
+    assert [journals_cli._from_cents(c) for c in args.amount] == [Decimal("0.10"), Decimal("0.20"), Decimal("-0.30")]
+    # The CLI builds postings with model_construct; the values must already be
+    # what validation would produce.
+    posting = schemas.JournalPostingIn.model_construct(allocation_id=1, amount=journals_cli._from_cents(10), currency="USD")
+    assert schemas.JournalPostingIn.model_validate(posting.model_dump()) == posting
+    with pytest.raises(SystemExit):
+        journals_cli.build_parser().parse_args(["realloc", "1", "2", "nan"])